@@ -0,0 +1,67 @@
+'''Compare the serial and thread-pool selection fetch paths against the local mock server.
+
+Also compares time to first row for the list-returning get_football_markets and the streaming
+iter_football_markets on the concurrent client.
+
+Requires the package to be installed (pip install -e .).
+Usage: python benchmarks/bench_concurrency.py [--events 40] [--latency 0.02] [--workers 16]
+'''
+import argparse
+import time
+from unittest.mock import MagicMock
+
+from draft_kings_client.client import DraftKingsOddsClient
+from draft_kings_client.sinks.base import SinkSet
+from draft_kings_client.tests.mock_server import MockDraftKingsServer
+
+
+def time_cycle(client, selection_ids):
+    start = time.perf_counter()
+    rows = client._build_odds_rows(selection_ids, 'MAIN')
+    return time.perf_counter() - start, len(rows)
+
+
+def time_to_first_row(harvest):
+    start = time.perf_counter()
+    first = None
+    count = 0
+    for _ in harvest():
+        count += 1
+        if first is None:
+            first = time.perf_counter() - start
+    return first or 0.0, time.perf_counter() - start, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--events', type=int, default=40)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--batch-size', type=int, default=1)
+    args = parser.parse_args()
+
+    authenticator = MagicMock()
+    authenticator.headers = {'Authorization': 'Bearer benchmark'}
+
+    with MockDraftKingsServer(events=args.events, latency=args.latency) as server:
+        serial = server.point_client(DraftKingsOddsClient(authenticator=authenticator, batch_size=args.batch_size))
+        concurrent = server.point_client(DraftKingsOddsClient(authenticator=authenticator, batch_size=args.batch_size,
+                                                              max_workers=args.workers))
+        selection_ids = serial._fetch_selection_ids()
+
+        for name, client in (('serial', serial), (f'max_workers={args.workers}', concurrent)):
+            seconds, rows = time_cycle(client, selection_ids)
+            print(f'{name:>16}: {rows} rows in {seconds:.3f}s ({rows / seconds:,.0f} rows/s)')
+
+        concurrent._sinks = SinkSet(lambda filename, append: MagicMock())
+        for name, harvest in (('list', lambda: concurrent.get_football_markets()),
+                              ('stream', lambda: concurrent.iter_football_markets())):
+            first, seconds, rows = time_to_first_row(harvest)
+            print(f'{name:>16}: first row after {first:.3f}s, {rows} rows in {seconds:.3f}s')
+
+        serial.close()
+        concurrent.close()
+
+
+if __name__ == '__main__':
+    main()
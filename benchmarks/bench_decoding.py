@@ -0,0 +1,116 @@
+'''Compare the ways of decoding a large league document: stdlib json, the fast backends, and ijson streaming.
+
+Builds a synthetic slate padded with the nested fields the real league payload carries but the parsers
+never read, then decodes it with each approach. Each approach runs in its own subprocess so that
+peak RSS (resource.ru_maxrss, growth over the process's baseline) is not polluted by the others. The
+buffered decoders are handed the whole body, as requests does by default; ijson reads from an unread
+stream=True response, so its RSS excludes the body bytes.
+
+Requires the package to be installed (pip install -e .[fast-json] for the optional backends).
+Usage: python benchmarks/bench_decoding.py [--events 2000] [--repeat 5]
+'''
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import requests
+
+from draft_kings_client import decoding
+from draft_kings_client.decoding import JsonDecoder, StreamingDecoder
+from draft_kings_client.tests.mock_server import build_slate
+
+APPROACHES = {
+    'json': lambda: JsonDecoder('json').decode_league,
+    'ujson': lambda: JsonDecoder('ujson').decode_league,
+    'orjson': lambda: JsonDecoder('orjson').decode_league,
+    'ijson stream': lambda: StreamingDecoder().decode_league,
+}
+REQUIRES = {'ujson': 'ujson', 'orjson': 'orjson', 'ijson stream': 'ijson'}
+
+
+def build_payload(events):
+    league = build_slate(events=events, markets_per_event=6, selections_per_market=4)
+    for event in league['events']:
+        event.update({'participants': [{'id': f'{event["id"]}p{side}', 'name': f'Team {side}', 'venueRole': role,
+                                        'metadata': {'abbreviation': 'TM', 'logo': 'https://example.com/logo.png'}}
+                                       for side, role in enumerate(('Home', 'Away'))],
+                      'eventStatus': {'state': 'NOT_STARTED', 'period': None}, 'tags': ['SGP', 'Featured']})
+    for market in league['markets']:
+        market.update({'marketType': {'id': 12, 'name': market['betSlipLine']}, 'tags': ['Cashout', 'SGP'],
+                       'subcategoryId': 4518})
+    for selection in league['selections']:
+        selection['displayOdds'].update({'decimal': '1.91', 'fractional': '10/11'})
+        selection.update({'trueOdds': 1.9090909, 'outcomeType': 'Home', 'tags': ['MainPointLine'],
+                          'participants': [{'id': 'p', 'name': 'Team', 'type': 'Team', 'venueRole': 'Home'}]})
+    return json.dumps(league).encode('utf-8')
+
+
+def max_rss_kib():
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage // 1024 if sys.platform == 'darwin' else usage
+
+
+def run_worker(approach, path, repeat):
+    '''Decode the payload `repeat` times with one approach and print timings and RSS growth as JSON.'''
+    decode = APPROACHES[approach]()
+    baseline = max_rss_kib()
+
+    timings = []
+    for _ in range(repeat):
+        with open(path, 'rb') as payload:
+            response = requests.Response()
+            if approach == 'ijson stream':
+                response.raw = payload
+            else:
+                response._content = payload.read()
+            start = time.perf_counter()
+            decoded = decode(response)
+            timings.append(time.perf_counter() - start)
+        del decoded, response
+
+    print(json.dumps({'best': min(timings), 'mean': sum(timings) / len(timings),
+                      'rss_kib': max_rss_kib() - baseline}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--events', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--worker', choices=APPROACHES, help=argparse.SUPPRESS)
+    parser.add_argument('--payload', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.payload, args.repeat)
+        return
+
+    payload = build_payload(args.events)
+    with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as handle:
+        handle.write(payload)
+    try:
+        print(f'league document: {args.events} events, {len(payload) / 1e6:.1f} MB')
+        baseline = None
+        for approach in APPROACHES:
+            module = REQUIRES.get(approach)
+            if module and getattr(decoding, module) is None:
+                print(f'{approach:>16}: skipped ({module} is not installed)')
+                continue
+
+            output = subprocess.run([sys.executable, os.path.abspath(__file__), '--worker', approach,
+                                     '--payload', handle.name, '--repeat', str(args.repeat)],
+                                    capture_output=True, text=True, check=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            baseline = baseline or result['best']
+            print(f'{approach:>16}: best {result["best"] * 1000:8.1f} ms  mean {result["mean"] * 1000:8.1f} ms  '
+                  f'x{baseline / result["best"]:4.1f}  peak RSS +{result["rss_kib"] / 1024:6.1f} MiB')
+    finally:
+        os.unlink(handle.name)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,185 @@
+'''Run full harvest cycles against a local DraftKings stand-in and record the results per commit.
+
+Each scenario drives get_football_markets plus both alternate-line feeds for --cycles cycles, repricing a
+slice of the slate between cycles. It reports rows/s, p50/p99 cycle latency, peak traced memory and
+bytes written, appends them to --results keyed by the current git commit, and prints the change against
+the last stored run of the same scenario and parameters.
+
+Requires the package to be installed (pip install -e .).
+Usage: python benchmarks/bench_harvest.py [--events 300] [--cycles 10] [--latency 0.005] [--error-rate 0.01]
+                                          [--scenarios batched concurrent snapshot]
+'''
+import argparse
+import json
+import logging
+import os
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+from draft_kings_client.client import DraftKingsOddsClient
+from draft_kings_client.response_cache import ResponseCache
+from draft_kings_client.tests.mock_server import MockDraftKingsServer
+from draft_kings_client.transport import HttpTransport
+
+SCENARIOS = {
+    'serial': dict(batch_size=1),
+    'batched': dict(batch_size=50),
+    'concurrent': dict(batch_size=50, max_workers=8),
+    'snapshot': dict(batch_size=50, max_workers=8, use_league_snapshot=True, response_cache=ResponseCache),
+}
+DEFAULT_RESULTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results', 'harvest.jsonl')
+
+
+def git_revision():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], capture_output=True,
+                               text=True, check=True).stdout.strip()
+        return f'{commit}-dirty' if dirty else commit
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def build_client(server, scenario):
+    options = dict(SCENARIOS[scenario])
+    if options.get('response_cache'):
+        options['response_cache'] = options['response_cache']()
+
+    authenticator = MagicMock()
+    authenticator.headers = {'Authorization': 'Bearer benchmark'}
+    transport = HttpTransport(backoff_factor=0.01, backoff_jitter=0.01)
+    return server.point_client(DraftKingsOddsClient(authenticator=authenticator, transport=transport, **options))
+
+
+def run_cycle(client):
+    rows = len(client.get_football_markets(append=True))
+    rows += len(client.get_football_alternate_spreads(append=True))
+    rows += len(client.get_football_alternate_totals(append=True))
+    return rows
+
+
+def run_scenario(scenario, args):
+    server = MockDraftKingsServer(events=args.events, markets_per_event=args.markets,
+                                  selections_per_market=args.selections, latency=args.latency,
+                                  error_rate=args.error_rate, seed=args.seed)
+    cycle_seconds = []
+    total_rows = 0
+
+    with server, tempfile.TemporaryDirectory() as directory:
+        working_directory = os.getcwd()
+        os.chdir(directory)  # The client writes its CSVs relative to the working directory
+        try:
+            with build_client(server, scenario) as client:
+                run_cycle(client)  # Warm up connections and caches
+
+                for _ in range(args.cycles):
+                    server.reprice(args.reprice)
+                    started = time.perf_counter()
+                    total_rows += run_cycle(client)
+                    cycle_seconds.append(time.perf_counter() - started)
+
+                # Trace one extra cycle for memory, since tracemalloc slows everything else down
+                server.reprice(args.reprice)
+                tracemalloc.start()
+                run_cycle(client)
+                _, peak_bytes = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+        finally:
+            os.chdir(working_directory)
+
+        bytes_written = sum(os.path.getsize(os.path.join(root, name))
+                            for root, _, names in os.walk(directory) for name in names)
+        request_count = len(server.requests)
+
+    elapsed = sum(cycle_seconds)
+    return {
+        'rows_per_second': round(total_rows / elapsed, 1),
+        'rows_per_cycle': total_rows // args.cycles,
+        'p50_cycle_seconds': round(statistics.median(cycle_seconds), 4),
+        'p99_cycle_seconds': round(percentile(cycle_seconds, 0.99), 4),
+        'peak_memory_bytes': peak_bytes,
+        'bytes_written': bytes_written,
+        'requests': request_count,
+    }
+
+
+def load_previous(path, scenario, parameters):
+    previous = None
+    if not os.path.exists(path):
+        return previous
+
+    with open(path, 'r', encoding='utf-8') as results_file:
+        for line in results_file:
+            record = json.loads(line)
+            if record['scenario'] == scenario and record['parameters'] == parameters:
+                previous = record
+    return previous
+
+
+def format_change(current, previous):
+    if not previous:
+        return ''
+    changes = []
+    for key in ('rows_per_second', 'p50_cycle_seconds', 'p99_cycle_seconds', 'peak_memory_bytes'):
+        before = previous['metrics'][key]
+        if before:
+            changes.append(f'{key} {100.0 * (current[key] - before) / before:+.1f}%')
+    return f"  vs {previous['revision']}: " + ', '.join(changes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenarios', nargs='+', choices=sorted(SCENARIOS), default=['batched', 'concurrent',
+                                                                                      'snapshot'])
+    parser.add_argument('--events', type=int, default=300)
+    parser.add_argument('--markets', type=int, default=3)
+    parser.add_argument('--selections', type=int, default=2)
+    parser.add_argument('--cycles', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.005)
+    parser.add_argument('--error-rate', type=float, default=0.01)
+    parser.add_argument('--reprice', type=float, default=0.1, help='fraction of selections repriced per cycle')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--results', default=DEFAULT_RESULTS)
+    parser.add_argument('--no-save', action='store_true')
+    parser.add_argument('--verbose', action='store_true', help='keep the client\'s INFO logging')
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+
+    parameters = {key: getattr(args, key) for key in ('events', 'markets', 'selections', 'cycles', 'latency',
+                                                       'error_rate', 'reprice', 'seed')}
+    revision = git_revision()
+
+    for scenario in args.scenarios:
+        metrics = run_scenario(scenario, args)
+        previous = load_previous(args.results, scenario, parameters)
+
+        print(f"{scenario:>10}: {metrics['rows_per_second']:>10,.0f} rows/s  "
+              f"p50 {metrics['p50_cycle_seconds']:.3f}s  p99 {metrics['p99_cycle_seconds']:.3f}s  "
+              f"peak {metrics['peak_memory_bytes'] / 2 ** 20:.1f} MiB  "
+              f"written {metrics['bytes_written'] / 2 ** 20:.1f} MiB  {metrics['requests']} requests"
+              f"{format_change(metrics, previous)}")
+
+        if not args.no_save:
+            os.makedirs(os.path.dirname(args.results), exist_ok=True)
+            record = {'revision': revision, 'recorded_at': datetime.now(timezone.utc).isoformat(),
+                      'scenario': scenario, 'parameters': parameters, 'metrics': metrics}
+            with open(args.results, 'a', encoding='utf-8') as results_file:
+                results_file.write(json.dumps(record) + '\n')
+
+
+if __name__ == '__main__':
+    main()
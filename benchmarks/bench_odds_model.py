@@ -0,0 +1,81 @@
+'''Compare memory and throughput of the original dict-backed OddsModel, the slotted OddsModel and OddsBatch.
+
+Requires the package to be installed (pip install -e .).
+Usage: python benchmarks/bench_odds_model.py [--rows 100000]
+'''
+import argparse
+import time
+import tracemalloc
+
+from draft_kings_client.models.odds_batch import OddsBatch
+from draft_kings_client.models.odds_model import OddsModel
+
+
+class DictOddsModel:
+    '''The pre-slots OddsModel layout: one __dict__ per row.'''
+
+    def __init__(self, sportsbook, sport, league_info, game_date, game_time, game_participants, market,
+                 bet_selection_name, price, time_retrieved, suspended, line):
+        self._sportsbook = sportsbook
+        self._sport = sport
+        self._league_info = league_info
+        self._game_date = game_date
+        self._game_time = game_time
+        self._game_participants = game_participants
+        self._market = market
+        self._bet_selection_name = bet_selection_name
+        self._price = price
+        self._time_retrieved = time_retrieved
+        self._suspended = suspended
+        self._line = line
+
+    @property
+    def price(self):
+        return self._price
+
+
+def make_values(count):
+    # Mirror a harvest: strings are decoded fresh from JSON, so equal values are distinct objects
+    for index in range(count):
+        game = index // 60
+        yield ('DraftKings', 'Football', 'NFL', '2024-10-20', f'{17 + game % 6}:00:00',
+               f'Team {game * 2} vs Team {game * 2 + 1}', ['Spread', 'Total', 'Moneyline'][index % 3],
+               f'Selection {index % 60}', f'{-120 + index % 20:+d}', f'2024-10-20T17:30:{index // 5000:02d}.00000Z',
+               False, 'MAIN')
+
+
+def measure(name, build, iterate):
+    tracemalloc.start()
+    start = time.perf_counter()
+    container = build()
+    build_seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    total = iterate(container)
+    iterate_seconds = time.perf_counter() - start
+
+    print(f'{name:>18}: {current / 2 ** 20:8.1f} MiB retained, {peak / 2 ** 20:8.1f} MiB peak, '
+          f'build {build_seconds:.3f}s, iterate {iterate_seconds:.3f}s (checksum {total:.0f})')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100000)
+    args = parser.parse_args()
+
+    values = [tuple(str(value) if isinstance(value, str) else value for value in row) for row in make_values(args.rows)]
+
+    measure('dict OddsModel', lambda: [DictOddsModel(*row) for row in values],
+            lambda rows: sum(len(row.price) for row in rows))
+    measure('slotted OddsModel', lambda: [OddsModel(*row) for row in values],
+            lambda rows: sum(len(row.price) for row in rows))
+    slotted_rows = [OddsModel(*row) for row in values]
+    measure('OddsBatch', lambda: OddsBatch.from_rows(slotted_rows),
+            lambda batch: sum(batch.price_values))
+
+
+if __name__ == '__main__':
+    main()
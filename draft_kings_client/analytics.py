@@ -0,0 +1,172 @@
+import re
+
+import numpy as np
+
+from draft_kings_client.models.odds_batch import OddsBatch
+from draft_kings_client.pricing import parse_american_price, parse_point_line
+
+TEAM_SEPARATOR = re.compile(r'\s+(?:@|vs\.?|at)\s+')
+
+
+def american_to_decimal(american):
+    '''Convert American odds to decimal odds; NaN in, NaN out.'''
+    american = np.asarray(american, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(american > 0, 1.0 + american / 100.0, 1.0 + 100.0 / -american)
+
+
+def decimal_to_american(decimal):
+    '''Convert decimal odds back to (fractional) American odds.'''
+    decimal = np.asarray(decimal, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(decimal >= 2.0, (decimal - 1.0) * 100.0, -100.0 / (decimal - 1.0))
+
+
+def implied_probability(american):
+    return 1.0 / american_to_decimal(american)
+
+
+def parse_prices(prices):
+    '''Parse raw price strings to float American odds, decoding each distinct string only once.'''
+    prices = np.asarray(prices, dtype=object)
+    if not len(prices):
+        return np.empty(0, dtype=np.float64)
+
+    distinct, inverse = np.unique(prices.astype(str), return_inverse=True)
+    parsed = np.array([np.nan if value is None else value
+                       for value in map(parse_american_price, distinct)], dtype=np.float64)
+    return parsed[inverse.reshape(-1)]
+
+
+def point_line(game_participants, selection_name):
+    '''The point line a selection is priced at, from the first-named team's side, or None without one.
+
+    Both sides of a spread share it (A -3.5 and B +3.5 are both -3.5, A +3.5 and B -3.5 both 3.5) and
+    both sides of a total keep theirs, so each over/under or +/- pair of an alternate feed is one market.
+    '''
+    label, point = parse_point_line(selection_name)
+    if point is None:
+        return None
+
+    teams = TEAM_SEPARATOR.split(game_participants or '', maxsplit=1)
+    return -point if len(teams) == 2 and label == teams[1].strip() else point
+
+
+class HarvestPricing:
+    '''Per-selection and per-market pricing for one harvest.
+
+    Markets are keyed by (game_participants, market, line, point), where point is the selection's point
+    line (see point_line), so an alternate feed's many lines under one market name are priced pair by pair.
+    Hold is the overround of the market's priced selections and the no-vig probabilities are the implied
+    probabilities scaled to sum to 1.
+    '''
+
+    def __init__(self, market_keys, market_index, decimal_odds, implied, no_vig, hold, priced_selections):
+        self._market_keys = market_keys
+        self._market_index = market_index
+        self._decimal_odds = decimal_odds
+        self._implied = implied
+        self._no_vig = no_vig
+        self._hold = hold
+        self._priced_selections = priced_selections
+
+    @property
+    def market_keys(self):
+        return self._market_keys
+
+    @property
+    def market_index(self):
+        '''Position of each selection's market in market_keys.'''
+        return self._market_index
+
+    @property
+    def decimal_odds(self):
+        return self._decimal_odds
+
+    @property
+    def implied_probability(self):
+        return self._implied
+
+    @property
+    def no_vig_probability(self):
+        return self._no_vig
+
+    @property
+    def fair_decimal_odds(self):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return 1.0 / self._no_vig
+
+    @property
+    def fair_american_odds(self):
+        return decimal_to_american(self.fair_decimal_odds)
+
+    @property
+    def hold(self):
+        '''Bookmaker hold per market, e.g. 0.0476 for a -110/-110 market.'''
+        return self._hold
+
+    @property
+    def priced_selections(self):
+        return self._priced_selections
+
+    def markets(self):
+        '''Yield one summary dict per market.'''
+        for index, (game_participants, market, line, point) in enumerate(self._market_keys):
+            yield {
+                'game_participants': game_participants,
+                'market': market,
+                'line': line,
+                'point': point,
+                'hold': float(self._hold[index]),
+                'priced_selections': int(self._priced_selections[index]),
+            }
+
+
+def _columns(harvest):
+    if isinstance(harvest, OddsBatch):
+        numeric = harvest.numeric_arrays()
+        return (harvest.column('game_participants'), harvest.column('market'), harvest.column('line'),
+                harvest.column('bet_selection_name'), numeric['price_value'], numeric['suspended'])
+
+    rows = list(harvest)
+    return ([row.game_participants for row in rows], [row.market for row in rows], [row.line for row in rows],
+            [row.bet_selection_name for row in rows], parse_prices([row.price for row in rows]),
+            np.array([row.suspended is True or str(row.suspended).lower() == 'true' for row in rows], dtype=bool))
+
+
+def price_harvest(harvest, include_suspended=False):
+    '''Compute decimal odds, implied probability, hold and no-vig prices for a list of rows or an OddsBatch.
+
+    Malformed prices (and suspended selections, unless include_suspended) are left out of the market
+    totals and get NaN no-vig values.
+    '''
+    games, markets, lines, selections, american, suspended = _columns(harvest)
+
+    # Selection names repeat across cycles and feeds, so each distinct one is only parsed once
+    point_lookup = {}
+    points = (point_lookup[key] if key in point_lookup else point_lookup.setdefault(key, point_line(*key))
+              for key in zip(games, selections))
+
+    market_lookup = {}
+    market_index = np.fromiter(
+        (market_lookup.setdefault(key, len(market_lookup)) for key in zip(games, markets, lines, points)),
+        dtype=np.int64, count=len(american)
+    )
+    market_keys = list(market_lookup)
+
+    decimal_odds = american_to_decimal(american)
+    implied = 1.0 / decimal_odds
+
+    usable = ~np.isnan(implied)
+    if not include_suspended:
+        usable &= ~suspended
+
+    market_count = len(market_keys)
+    totals = np.bincount(market_index, weights=np.where(usable, implied, 0.0), minlength=market_count)
+    priced_selections = np.bincount(market_index, weights=usable, minlength=market_count).astype(np.int64)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        hold = np.where(priced_selections >= 2, totals - 1.0, np.nan)
+        no_vig = np.where(usable & (priced_selections[market_index] >= 2), implied / totals[market_index], np.nan)
+
+    return HarvestPricing(market_keys, market_index, decimal_odds, implied, no_vig, hold, priced_selections)
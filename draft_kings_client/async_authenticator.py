@@ -0,0 +1,115 @@
+import asyncio
+import logging
+
+import aiohttp
+
+from draft_kings_client.authenticator import DEFAULT_AUTH_ENDPOINT, Authenticator
+
+logging.basicConfig(level=logging.INFO)
+
+
+class AsyncAuthenticator:
+    '''asyncio counterpart of Authenticator; concurrent callers share a single token request.'''
+
+    def __init__(self, auth_endpoint=DEFAULT_AUTH_ENDPOINT, headers=None, session=None):
+        self._auth_endpoint = auth_endpoint
+        self._headers = headers
+        self._jwt_token = None
+        self._session = session
+        self._lock = None
+
+    @property
+    def auth_endpoint(self):
+        return self._auth_endpoint
+
+    async def get_headers(self):
+        if not self._headers:
+            await self._generate_headers()
+        return self._headers
+
+    async def get_jwt_token(self):
+        if not self._jwt_token:
+            if self._lock is None:
+                self._lock = asyncio.Lock()
+            async with self._lock:
+                if not self._jwt_token:
+                    await self._generate_jwt_token()
+        return self._jwt_token
+
+    async def _generate_jwt_token(self):
+        jwt_token = None
+        retries = 3
+        retry_delay = 2
+        timeout = aiohttp.ClientTimeout(total=10)
+
+        for attempt in range(retries):
+            try:
+                logging.info(f'Attempt {attempt + 1}: Requesting JWT token from {self._auth_endpoint}')
+                async with self._request(timeout) as response:
+                    response_text = await response.text()
+
+                    if response.status == 200:
+                        token = Authenticator._parse_token(response_text)
+
+                        if token:
+                            jwt_token = token
+                            self._jwt_token = jwt_token
+                            logging.info('JWT Token successfully retrieved.')
+                            return jwt_token
+                        else:
+                            logging.error('Token not found in response')
+                    else:
+                        logging.error(f'Failed to retrieve token, status code: {response.status}')
+                        logging.error(f'Response content: {response_text}')
+
+            except asyncio.TimeoutError:
+                logging.error('The request timed out while trying to reach the authentication endpoint.')
+
+            except aiohttp.ClientError as e:
+                logging.error(f'An error occurred while making the request: {e}')
+
+            if attempt < retries - 1:
+                logging.info(f'Retrying in {retry_delay} seconds...')
+                await asyncio.sleep(retry_delay)
+                retry_delay *= 2  # double delay after each retry
+
+        logging.error(f'Failed to retrieve JWT token after {retries} attempts.')
+        return jwt_token
+
+    def _request(self, timeout):
+        if self._session:
+            return self._session.get(self._auth_endpoint, timeout=timeout)
+        return _OwnedSessionRequest(self._auth_endpoint, timeout)
+
+    async def _generate_headers(self):
+        jwt_token = await self.get_jwt_token()
+        if not jwt_token:
+            logging.error('Cannot generate headers without a valid JWT token.')
+            return None
+
+        self._headers = Authenticator._build_headers(jwt_token)
+        logging.info('Headers successfully generated.')
+        return self._headers
+
+
+class _OwnedSessionRequest:
+    '''Runs a single GET in a short-lived session when no shared session was supplied.'''
+
+    def __init__(self, url, timeout):
+        self._url = url
+        self._timeout = timeout
+        self._session = None
+        self._response = None
+
+    async def __aenter__(self):
+        self._session = aiohttp.ClientSession()
+        try:
+            self._response = await self._session.get(self._url, timeout=self._timeout)
+        except BaseException:
+            await self._session.close()
+            raise
+        return self._response
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self._response.release()
+        await self._session.close()
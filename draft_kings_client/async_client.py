@@ -0,0 +1,276 @@
+import asyncio
+import logging
+
+import aiohttp
+
+from draft_kings_client.async_authenticator import AsyncAuthenticator
+from draft_kings_client.authenticator import auth_endpoint_for_site
+from draft_kings_client.client import DraftKingsOddsClient
+from draft_kings_client.feeds import (DEFAULT_BASE_URL, DEFAULT_SITE, NFL_ALTERNATE_SPREADS, NFL_ALTERNATE_TOTALS,
+                                      NFL_MAIN, default_feeds, selection_info_url)
+from draft_kings_client.parser import SelectionInfoParser
+from draft_kings_client.sinks.base import SinkSet
+from draft_kings_client.sinks.csv_sink import BufferedCsvSink
+
+logging.basicConfig(level=logging.INFO)
+
+
+class AsyncDraftKingsOddsClient:
+    '''asyncio version of DraftKingsOddsClient with the same get_football_* surface.
+
+    Selection lookups run as coroutines on one event loop; max_connections caps both the
+    aiohttp connection pool and the number of requests in flight. Feeds and site work as in
+    DraftKingsOddsClient, and requests are built from BASE_URL the same way.
+    '''
+    BASE_URL = DEFAULT_BASE_URL
+
+    DEFAULT_BATCH_SIZE = DraftKingsOddsClient.DEFAULT_BATCH_SIZE
+    DEFAULT_MAX_CONNECTIONS = 32
+    DEFAULT_MICRO_BATCH = DraftKingsOddsClient.DEFAULT_MICRO_BATCH
+
+    def __init__(self, authenticator=None, batch_size=DEFAULT_BATCH_SIZE, max_connections=DEFAULT_MAX_CONNECTIONS,
+                 sink_factory=None, feeds=None, site=DEFAULT_SITE):
+        if batch_size < 1:
+            raise ValueError('batch_size must be at least 1')
+        if max_connections < 1:
+            raise ValueError('max_connections must be at least 1')
+
+        self._feeds = feeds if feeds is not None else default_feeds()
+        self._site = site
+        self._authenticator = authenticator or AsyncAuthenticator(auth_endpoint_for_site(site))
+        self._batch_size = batch_size
+        self._max_connections = max_connections
+        self._parser = SelectionInfoParser()
+        self._session = None
+        self._semaphore = None
+        self._sinks = SinkSet(sink_factory or BufferedCsvSink)
+
+    @property
+    def authenticator(self):
+        return self._authenticator
+
+    @property
+    def batch_size(self):
+        return self._batch_size
+
+    @property
+    def max_connections(self):
+        return self._max_connections
+
+    @property
+    def feeds(self):
+        return self._feeds
+
+    @property
+    def site(self):
+        return self._site
+
+    @property
+    def SELECTION_INFO_URL(self):
+        return selection_info_url(self.BASE_URL, self._site)
+
+    @property
+    def SELECTIONS_URL(self):
+        return self._feed_url(NFL_MAIN)
+
+    @property
+    def ALTERNATE_SPREAD_SELECTION_URL(self):
+        return self._feed_url(NFL_ALTERNATE_SPREADS)
+
+    @property
+    def ALTERNATE_TOTAL_SELECTION_URL(self):
+        return self._feed_url(NFL_ALTERNATE_TOTALS)
+
+    def _feed_url(self, feed):
+        return feed.league_url(self.BASE_URL, self._site)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    @property
+    def sinks(self):
+        return self._sinks
+
+    async def close(self):
+        await asyncio.to_thread(self._sinks.close)
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self):
+        # aiohttp sessions must be created inside a running loop, so build them on first use
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self._max_connections)
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._semaphore = asyncio.Semaphore(self._max_connections)
+        return self._session
+
+    async def _get_headers(self):
+        return await self._authenticator.get_headers()
+
+    async def _get_json(self, url):
+        session = self._get_session()
+        headers = await self._get_headers()
+        async with self._semaphore:
+            async with session.get(url, headers=headers) as response:
+                response.raise_for_status()
+                return await response.json(content_type=None)
+
+    async def _fetch_selection_ids(self, selections_url=None):
+        '''Fetch selection IDs for football markets.'''
+        try:
+            selections_json = await self._get_json(selections_url or self.SELECTIONS_URL)
+            return [selection['id'] for selection in selections_json.get('selections', [])]
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logging.error(f'Failed to retrieve selections: {e}')
+            return []
+
+    async def _fetch_odds_for_selection(self, selection_id):
+        '''Fetch odds for a given selection ID.'''
+        try:
+            return await self._get_json(f'{self.SELECTION_INFO_URL}?siteName={self._site}&selectionIds={selection_id}')
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logging.error(f'Failed to retrieve odds for selection {selection_id}: {e}')
+            return None
+
+    async def _fetch_odds_for_selections(self, selection_ids):
+        '''Fetch odds for several selection IDs in a single request.'''
+        joined_ids = ','.join(str(selection_id) for selection_id in selection_ids)
+        try:
+            return await self._get_json(f'{self.SELECTION_INFO_URL}?siteName={self._site}&selectionIds={joined_ids}')
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logging.error(f'Failed to retrieve odds for selections {joined_ids}: {e}')
+            return None
+
+    async def _fetch_odds_for_chunk(self, chunk):
+        try:
+            if len(chunk) == 1:
+                return await self._fetch_odds_for_selection(chunk[0])
+            return await self._fetch_odds_for_selections(chunk)
+        except Exception as e:
+            logging.error(f'Unexpected error retrieving odds for selection {", ".join(map(str, chunk))}: {e}')
+            return None
+
+    async def _fetch_chunk(self, chunk):
+        return chunk, await self._fetch_odds_for_chunk(chunk)
+
+    async def _iter_odds_rows(self, selection_ids, line, ordered=True):
+        '''Fetch every chunk concurrently and yield its rows as soon as it is parsed.
+
+        With ordered, chunks are yielded in selection order; otherwise in completion order.
+        '''
+        chunks = [selection_ids[i:i + self._batch_size] for i in range(0, len(selection_ids), self._batch_size)]
+        tasks = [asyncio.ensure_future(self._fetch_chunk(chunk)) for chunk in chunks]
+        try:
+            for next_chunk in (tasks if ordered else asyncio.as_completed(tasks)):
+                chunk, odds_json = await next_chunk
+                if not self._parser.is_complete(odds_json):
+                    logging.warning(f'Skipping selection {", ".join(map(str, chunk))} due to incomplete data.')
+                    continue
+
+                for row in self._parser.parse(odds_json, line):
+                    yield row
+        finally:
+            # A consumer that stops early shouldn't leave the rest of the requests running
+            for task in tasks:
+                task.cancel()
+
+    async def _build_odds_rows(self, selection_ids, line):
+        '''Fetch every chunk concurrently and split the responses into rows in selection order.'''
+        return [row async for row in self._iter_odds_rows(selection_ids, line)]
+
+    async def iter_feed(self, name, append=False, ordered=False, micro_batch=DEFAULT_MICRO_BATCH):
+        '''Yield a registered feed's rows as they are parsed, writing every micro_batch of them (or the whole
+        cycle when None) to the feed's output; see DraftKingsOddsClient.iter_feed.
+        '''
+        feed = self._feeds.get(name)
+        filename = feed.filename
+        selection_ids = await self._fetch_selection_ids(self._feed_url(feed))
+        if not selection_ids:
+            logging.info(f'No selection IDs retrieved for {feed.name}.')
+            return
+
+        pending = []
+        written = 0
+        try:
+            async for row in self._iter_odds_rows(selection_ids, feed.line, ordered):
+                row = DraftKingsOddsClient._tag_row(row, feed)
+                pending.append(row)
+                yield row
+
+                if micro_batch and len(pending) >= micro_batch:
+                    # File I/O is blocking, so keep it off the event loop
+                    await asyncio.to_thread(self._write_rows, pending, filename, append or written > 0)
+                    written += len(pending)
+                    pending = []
+        finally:
+            # Rows already handed to the consumer are written even if it stops early (aclose or cancellation)
+            if pending:
+                await asyncio.to_thread(self._write_rows, pending, filename, append or written > 0)
+                written += len(pending)
+            if written:
+                # Sinks only buffer within a cycle, so nothing is lost if the process exits between cycles
+                await asyncio.to_thread(self._sinks.flush, filename)
+
+    async def harvest_feed(self, name, append=False):
+        '''Harvest a single registered feed and return its rows in selection order.'''
+        return [row async for row in self.iter_feed(name, append, ordered=True, micro_batch=None)]
+
+    def _write_rows(self, rows, filename, append):
+        self._sinks.write(filename, rows, append=append)
+
+    @staticmethod
+    async def continuous_harvest(func, seconds=10):
+        '''Await func(append=True) on a fixed-rate schedule, dropping ticks missed while a harvest overran.
+
+        When func is a client method, that client (its sinks and session) is closed once the loop is cancelled
+        or fails.
+        '''
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+
+        try:
+            while True:
+                logging.info(f'Running continuous harvest for method: {func}')
+                await func(append=True)
+
+                next_tick += seconds
+                now = loop.time()
+                if now > next_tick:
+                    missed = int((now - next_tick) // seconds) + 1
+                    logging.warning(f'Harvest overran its interval, skipping {missed} tick(s).')
+                    next_tick += missed * seconds
+
+                logging.info(f'Sleeping for {next_tick - now:.2f} seconds.')
+                await asyncio.sleep(next_tick - now)
+        finally:
+            owner = getattr(func, '__self__', None)
+            if isinstance(owner, AsyncDraftKingsOddsClient):
+                await owner.close()
+
+    def iter_football_markets(self, append=False, ordered=False, micro_batch=DEFAULT_MICRO_BATCH):
+        '''Async iterator over football market rows as they are parsed; see DraftKingsOddsClient.iter_feed.'''
+        return self.iter_feed(NFL_MAIN.name, append, ordered, micro_batch)
+
+    def iter_football_alternate_spreads(self, append=False, ordered=False, micro_batch=DEFAULT_MICRO_BATCH):
+        '''Async iterator over football alternate spread rows as they are parsed.'''
+        return self.iter_feed(NFL_ALTERNATE_SPREADS.name, append, ordered, micro_batch)
+
+    def iter_football_alternate_totals(self, append=False, ordered=False, micro_batch=DEFAULT_MICRO_BATCH):
+        '''Async iterator over football alternate total rows as they are parsed.'''
+        return self.iter_feed(NFL_ALTERNATE_TOTALS.name, append, ordered, micro_batch)
+
+    async def get_football_markets(self, append=False):
+        '''Main method to retrieve football markets and save them to a CSV.'''
+        return await self.harvest_feed(NFL_MAIN.name, append)
+
+    async def get_football_alternate_spreads(self, append=False):
+        '''Method to retrieve football alternate spreads and save them to a CSV.'''
+        return await self.harvest_feed(NFL_ALTERNATE_SPREADS.name, append)
+
+    async def get_football_alternate_totals(self, append=False):
+        '''Method to retrieve football alternate totals and save them to a CSV.'''
+        return await self.harvest_feed(NFL_ALTERNATE_TOTALS.name, append)
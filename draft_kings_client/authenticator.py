@@ -1,36 +1,193 @@
 import requests
 import re
+import base64
+import json
 import logging
+import os
+import threading
 import time
 from requests.exceptions import RequestException, Timeout
+from draft_kings_client.feeds import site_state
+from draft_kings_client.metrics import NullMetrics
 
 logging.basicConfig(level=logging.INFO)
 
 
+AUTH_ENDPOINT_TEMPLATE = 'https://gaming-us-{state}.draftkings.com/api/wager/v1/generateAnonymousEnterpriseJWT'
+DEFAULT_AUTH_ENDPOINT = AUTH_ENDPOINT_TEMPLATE.format(state='nj')
+
+
+def auth_endpoint_for_site(site, template=AUTH_ENDPOINT_TEMPLATE):
+    '''The anonymous token endpoint serving a site; each state's book issues its own tokens.'''
+    return template.format(state=site_state(site))
+
+
 class Authenticator:
-    def __init__(self, auth_endpoint='https://gaming-us-nj.draftkings.com/api/wager/v1/generateAnonymousEnterpriseJWT',
-                 headers=None):
+    '''Fetches and caches the anonymous JWT the sportsbook APIs expect.
+
+    The token's exp claim is decoded so it can be renewed before it lapses: once inside refresh_margin
+    seconds of expiry the current token is still handed out while one background thread fetches the next,
+    and an expired token is replaced synchronously. Only one token request is ever in flight. Tokens
+    without a readable exp claim are kept until refresh() is called, e.g. after a 401.
+    '''
+    DEFAULT_REFRESH_MARGIN = 120
+
+    def __init__(self, auth_endpoint=DEFAULT_AUTH_ENDPOINT, headers=None, refresh_margin=DEFAULT_REFRESH_MARGIN,
+                 token_cache_path=None, clock=time.time, metrics=None):
         self._auth_endpoint = auth_endpoint
         self._headers = headers
+        self._fixed_headers = headers is not None
         self._jwt_token = None
+        self._expires_at = None
+        self._retrieved_at = None
+        self._refresh_margin = refresh_margin
+        self._token_cache_path = token_cache_path
+        self._clock = clock
+        self._metrics = metrics or NullMetrics()
+        self._lock = threading.Lock()
+        self._refresh_thread = None
+
+        if token_cache_path and not self._fixed_headers:
+            self._load_cached_token()
 
     @property
     def auth_endpoint(self):
         return self._auth_endpoint
 
+    @property
+    def expires_at(self):
+        '''Unix time the current token expires, or None if unknown.'''
+        return self._expires_at
+
     @property
     def headers(self):
+        if self._fixed_headers:
+            return self._headers
+
+        self._ensure_fresh()
         if not self._headers:
             self._generate_headers()
         return self._headers
 
     @property
     def jwt_token(self):
+        self._ensure_fresh()
         if not self._jwt_token:
-            self._generate_jwt_token()
+            with self._lock:
+                if not self._jwt_token:
+                    self._generate_jwt_token()
         return self._jwt_token
 
+    def refresh(self, stale_headers=None):
+        '''Fetch a new token and return fresh headers, e.g. after a request was rejected with 401/403.
+
+        When stale_headers is given and another caller has already replaced that token, the newer headers
+        are returned without another round trip. Returns None when the headers can't be renewed.
+        '''
+        if self._fixed_headers:
+            return None
+
+        with self._lock:
+            if stale_headers is None or stale_headers.get('Authorization') == self._authorization():
+                logging.info('Re-authenticating for a new JWT token.')
+                if not self._generate_jwt_token():
+                    return None
+        return self.headers
+
+    def _authorization(self):
+        return f'Bearer {self._jwt_token}' if self._jwt_token else None
+
+    def _ensure_fresh(self):
+        expires_at, retrieved_at = self._expires_at, self._retrieved_at
+        if self._fixed_headers or not self._jwt_token or expires_at is None or retrieved_at is None:
+            return
+
+        now = self._clock()
+        remaining = expires_at - now
+        # Never refresh earlier than halfway through a token's life, or short-lived tokens would churn
+        margin = min(self._refresh_margin, (expires_at - retrieved_at) / 2)
+        if remaining <= 0:
+            token = self._jwt_token
+            with self._lock:
+                if self._jwt_token == token:  # Nobody else has replaced it while we waited for the lock
+                    logging.info('JWT token expired, requesting a new one.')
+                    self._generate_jwt_token()
+        elif remaining <= margin:
+            self._refresh_in_background()
+
+    def _refresh_in_background(self):
+        if not self._lock.acquire(blocking=False):
+            return  # A refresh is already in flight
+        try:
+            if self._refresh_thread and self._refresh_thread.is_alive():
+                return
+            self._refresh_thread = threading.Thread(target=self._background_refresh, args=(self._jwt_token,),
+                                                    name='dk-auth-refresh', daemon=True)
+            self._refresh_thread.start()
+        finally:
+            self._lock.release()
+
+    def _background_refresh(self, token):
+        with self._lock:
+            if self._jwt_token == token:
+                logging.info('JWT token close to expiry, refreshing in the background.')
+                self._generate_jwt_token()
+
+    @staticmethod
+    def _decode_expiry(jwt_token):
+        '''Return the exp claim of a JWT, or None if the token isn't a decodable JWT.'''
+        try:
+            payload = jwt_token.split('.')[1]
+            claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+            return float(claims['exp'])
+        except (IndexError, KeyError, TypeError, ValueError):
+            return None
+
+    def _set_token(self, jwt_token):
+        # _ensure_fresh reads these without the lock, so the token is only published once its expiry is in place
+        self._expires_at = self._decode_expiry(jwt_token)
+        self._retrieved_at = self._clock()
+        self._headers = self._build_headers(jwt_token)
+        self._jwt_token = jwt_token
+
+    def _load_cached_token(self):
+        try:
+            with open(self._token_cache_path, 'r', encoding='utf-8') as cache_file:
+                cached = json.load(cache_file)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logging.warning(f'Ignoring unreadable token cache {self._token_cache_path}: {e}')
+            return
+
+        token = cached.get('token') if isinstance(cached, dict) else None
+        if not token or cached.get('auth_endpoint') != self._auth_endpoint:
+            return
+
+        expires_at = self._decode_expiry(token)
+        if expires_at is not None and expires_at - self._clock() <= self._refresh_margin:
+            logging.info('Cached JWT token is expired or about to expire, ignoring it.')
+            return
+
+        self._set_token(token)
+        logging.info(f'Loaded JWT token from {self._token_cache_path}')
+
+    def _save_cached_token(self, jwt_token):
+        temporary_path = f'{self._token_cache_path}.tmp'
+        try:
+            # Write then rename so a crash never leaves a half-written cache behind; the token is a credential
+            file_descriptor = os.open(temporary_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(file_descriptor, 'w', encoding='utf-8') as cache_file:
+                json.dump({'auth_endpoint': self._auth_endpoint, 'token': jwt_token}, cache_file)
+            os.replace(temporary_path, self._token_cache_path)
+        except OSError as e:
+            logging.warning(f'Could not write token cache {self._token_cache_path}: {e}')
+
     def _generate_jwt_token(self):
+        with self._metrics.timer('auth'):
+            return self._request_jwt_token()
+
+    def _request_jwt_token(self):
         jwt_token = None
         retries = 3
         retry_delay = 2
@@ -38,15 +195,23 @@ class Authenticator:
         for attempt in range(retries):
             try:
                 logging.info(f'Attempt {attempt + 1}: Requesting JWT token from {self._auth_endpoint}')
-                response = requests.get(self._auth_endpoint, timeout=10)
+                started = time.perf_counter()
+                try:
+                    response = requests.get(self._auth_endpoint, timeout=10)
+                except RequestException:
+                    self._metrics.observe_request('auth', time.perf_counter() - started, None)
+                    raise
+                self._metrics.observe_request('auth', time.perf_counter() - started, response.status_code)
 
                 if response.status_code == 200:
-                    token_match = re.search(r'"token":"(.*?)"', response.text)
+                    token = self._parse_token(response.text)
 
-                    if token_match:
-                        jwt_token = token_match.group(1)
-                        self._jwt_token = jwt_token
-                        logging.info(f'JWT Token successfully retrieved: {jwt_token}')
+                    if token:
+                        jwt_token = token
+                        self._set_token(jwt_token)
+                        if self._token_cache_path:
+                            self._save_cached_token(jwt_token)
+                        logging.info(f'JWT Token successfully retrieved: {self.mask_token(jwt_token)}')
                         return jwt_token
                     else:
                         logging.error('Token not found in response')
@@ -71,13 +236,22 @@ class Authenticator:
         logging.error(f'Failed to retrieve JWT token after {retries} attempts.')
         return jwt_token
 
-    def _generate_headers(self):
-        if not self.jwt_token:
-            logging.error('Cannot generate headers without a valid JWT token.')
-            return None
+    @staticmethod
+    def mask_token(jwt_token):
+        '''Render a token for logs without exposing enough of it to be replayed.'''
+        if not jwt_token:
+            return '<none>'
+        return f'{jwt_token[:6]}...({len(jwt_token)} chars)'
+
+    @staticmethod
+    def _parse_token(response_text):
+        token_match = re.search(r'"token":"(.*?)"', response_text)
+        return token_match.group(1) if token_match else None
 
-        headers = {
-            'Authorization': f'Bearer {self.jwt_token}',
+    @staticmethod
+    def _build_headers(jwt_token):
+        return {
+            'Authorization': f'Bearer {jwt_token}',
             'Accept': '*/*',
             'Accept-Encoding': 'gzip, deflate, br, zstd',
             'Accept-Language': 'en-GB,en-US;q=0.9,en;q=0.8',
@@ -87,6 +261,13 @@ class Authenticator:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36'
         }
 
+    def _generate_headers(self):
+        jwt_token = self.jwt_token
+        if not jwt_token:
+            logging.error('Cannot generate headers without a valid JWT token.')
+            return None
+
+        headers = self._build_headers(jwt_token)
         self._headers = headers
         logging.info('Headers successfully generated.')
 
@@ -0,0 +1,291 @@
+import gzip
+import json
+import logging
+import queue
+import struct
+import threading
+import time
+import zlib
+from collections import defaultdict, deque
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+logging.basicConfig(level=logging.INFO)
+
+# Each record is a big-endian (header length, body length) pair, a JSON header and the raw body
+RECORD_PREFIX = struct.Struct('>II')
+CAPTURED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Retry-After')
+
+
+class CapturedResponse:
+    __slots__ = ('_url', '_timestamp', '_status', '_headers', '_body')
+
+    def __init__(self, url, timestamp, status, headers, body):
+        self._url = url
+        self._timestamp = timestamp
+        self._status = status
+        self._headers = headers
+        self._body = body
+
+    @property
+    def url(self):
+        return self._url
+
+    @property
+    def timestamp(self):
+        '''Unix time the response arrived.'''
+        return self._timestamp
+
+    @property
+    def status(self):
+        return self._status
+
+    @property
+    def headers(self):
+        return self._headers
+
+    @property
+    def body(self):
+        return self._body
+
+    def encode(self):
+        header = json.dumps({'url': self._url, 'timestamp': self._timestamp, 'status': self._status,
+                             'headers': self._headers}, separators=(',', ':')).encode('utf-8')
+        return RECORD_PREFIX.pack(len(header), len(self._body)) + header + self._body
+
+
+def iter_archive(path):
+    '''Yield CapturedResponse records from an archive in the order they were captured.
+
+    A record cut short by a crash mid-write ends the iteration instead of raising.
+    '''
+    with gzip.open(path, 'rb') as archive:
+        while True:
+            try:
+                prefix = archive.read(RECORD_PREFIX.size)
+                if not prefix:
+                    return
+                if len(prefix) < RECORD_PREFIX.size:
+                    raise EOFError('truncated record prefix')
+
+                header_length, body_length = RECORD_PREFIX.unpack(prefix)
+                header = archive.read(header_length)
+                body = archive.read(body_length)
+                if len(header) < header_length or len(body) < body_length:
+                    raise EOFError('truncated record')
+            except (EOFError, zlib.error) as e:
+                logging.warning(f'Archive {path} ends with an incomplete record: {e}')
+                return
+
+            fields = json.loads(header)
+            yield CapturedResponse(fields['url'], fields['timestamp'], fields['status'], fields['headers'], body)
+
+
+class ResponseRecorder:
+    '''Streams every response a session receives into a gzip, length-prefixed, append-only archive.
+
+    Attach it with recorder.attach(session) or DraftKingsOddsClient(recorder=...). The response hook only
+    queues the record; a background thread compresses and writes it. Should the writer fall behind by
+    more than max_pending records, new ones are dropped and counted rather than slowing the harvest.
+    Request headers are never captured, so the archive holds no credentials.
+    '''
+    DEFAULT_MAX_PENDING = 10000
+
+    def __init__(self, path, max_pending=DEFAULT_MAX_PENDING, compresslevel=6, clock=time.time):
+        self._path = path
+        self._clock = clock
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._recorded = 0
+        self._dropped = 0
+        # Every session appends a new gzip member, which readers see as one continuous stream
+        self._file = gzip.open(path, 'ab', compresslevel=compresslevel)
+        self._closed = False
+        self._thread = threading.Thread(target=self._write_records, name='dk-capture', daemon=True)
+        self._thread.start()
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def recorded(self):
+        return self._recorded
+
+    @property
+    def dropped(self):
+        return self._dropped
+
+    def attach(self, session):
+        session.hooks['response'].append(self.hook)
+        return session
+
+    def hook(self, response, *args, **kwargs):
+        if self._closed:
+            return None
+
+        headers = {name: response.headers[name] for name in CAPTURED_HEADERS if name in response.headers}
+        record = CapturedResponse(response.url, self._clock(), response.status_code, headers, response.content or b'')
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self._dropped += 1
+        return None
+
+    def _write_records(self):
+        while True:
+            record = self._queue.get()
+            if record is None:
+                break
+
+            try:
+                self._file.write(record.encode())
+                self._recorded += 1
+            except Exception as e:
+                logging.error(f'Failed to capture response from {record.url}: {e}')
+
+    def close(self):
+        '''Write out everything queued so far and close the archive.'''
+        if self._closed:
+            return
+
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+        if self._dropped:
+            logging.warning(f'Capture to {self._path} dropped {self._dropped} responses.')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    '''Answers requests from a capture archive instead of the network.
+
+    Responses for a URL are handed out in the order they were recorded, so a client configured as it was
+    during capture (same batch size and feeds) replays cycle by cycle. pacing='recorded' reproduces the
+    gaps between the original responses, divided by speed; pacing='fast' replays as quickly as possible.
+    A URL with no captured responses left gets a 404. The archive is read lazily, in order, as requests
+    come in rather than loaded up front.
+    '''
+    FAST = 'fast'
+    RECORDED = 'recorded'
+
+    def __init__(self, records, pacing=FAST, speed=1.0, clock=time.monotonic, sleep=time.sleep):
+        if pacing not in (self.FAST, self.RECORDED):
+            raise ValueError(f'Unknown pacing: {pacing}')
+        if speed <= 0:
+            raise ValueError('speed must be positive')
+
+        super().__init__()
+        # Records are read from the archive only as requests reach them; the ones skipped over on the way are
+        # held per URL until asked for, so a replay in capture order keeps about one body in memory
+        self._records = iter(records)
+        self._responses = defaultdict(deque)
+        first = next(self._records, None)
+        self._first_timestamp = first.timestamp if first is not None else None
+        if first is not None:
+            self._responses[first.url].append(first)
+
+        self._pacing = pacing
+        self._speed = speed
+        self._clock = clock
+        self._sleep = sleep
+        self._started = None
+        self._lock = threading.Lock()
+        self._replayed = 0
+        self._missing = 0
+
+    @classmethod
+    def from_archive(cls, path, **kwargs):
+        return cls(iter_archive(path), **kwargs)
+
+    @property
+    def replayed(self):
+        return self._replayed
+
+    @property
+    def missing(self):
+        return self._missing
+
+    def remaining(self):
+        '''Responses not yet replayed. This reads the rest of the archive, so call it once the replay is done.'''
+        with self._lock:
+            for record in self._records:
+                self._responses[record.url].append(record)
+            return sum(len(responses) for responses in self._responses.values())
+
+    def _next_record(self, url):
+        '''Pop the next response for url, reading ahead through the archive if none is held yet.'''
+        responses = self._responses.get(url)
+        if responses:
+            return responses.popleft()
+
+        for record in self._records:
+            if record.url == url:
+                return record
+            self._responses[record.url].append(record)
+        return None
+
+    def send(self, request, **kwargs):
+        with self._lock:
+            record = self._next_record(request.url)
+            if record is None:
+                self._missing += 1
+            else:
+                self._replayed += 1
+            if self._started is None:
+                self._started = self._clock()
+
+        if record is None:
+            logging.warning(f'No captured response left for {request.url}')
+            return self._build_response(request, 404, {}, b'')
+
+        if self._pacing == self.RECORDED:
+            delay = (record.timestamp - self._first_timestamp) / self._speed - (self._clock() - self._started)
+            if delay > 0:
+                self._sleep(delay)
+
+        return self._build_response(request, record.status, record.headers, record.body)
+
+    @staticmethod
+    def _build_response(request, status, headers, body):
+        response = requests.Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(headers)
+        response._content = body
+        response.url = request.url
+        response.request = request
+        response.reason = 'Replayed' if status != 404 else 'Not Captured'
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        return response
+
+    def close(self):
+        # Releases the archive file when reading from iter_archive
+        close = getattr(self._records, 'close', None)
+        if close:
+            close()
+
+
+class ReplayTransport:
+    '''Drop-in for HttpTransport that serves a DraftKingsOddsClient entirely from a capture archive.'''
+
+    def __init__(self, path, pacing=ReplayAdapter.FAST, speed=1.0):
+        self._adapter = ReplayAdapter.from_archive(path, pacing=pacing, speed=speed)
+
+    @property
+    def adapter(self):
+        return self._adapter
+
+    def mount(self, session, pool_size=None):
+        session.mount('https://', self._adapter)
+        session.mount('http://', self._adapter)
+        return session
+
+    def session(self, pool_size=None):
+        return self.mount(requests.Session(), pool_size)
@@ -1,217 +1,646 @@
-import csv
 import logging
 import os
-from datetime import datetime, timezone
-from time import sleep
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import requests
-from draft_kings_client.authenticator import Authenticator
-from draft_kings_client.models.odds_model import OddsModel
+from draft_kings_client.authenticator import Authenticator, auth_endpoint_for_site
+from draft_kings_client.delta import DeltaTracker
+from draft_kings_client.feeds import (DEFAULT_BASE_URL, DEFAULT_SITE, NFL_ALTERNATE_SPREADS, NFL_ALTERNATE_TOTALS,
+                                      NFL_MAIN, default_feeds, selection_info_url)
+from draft_kings_client.metrics import NullMetrics
+from draft_kings_client.parser import LeagueSnapshotParser, SelectionInfoParser
+from draft_kings_client.response_cache import ResponseCache
+from draft_kings_client.scheduler import HarvestScheduler
+from draft_kings_client.sinks.base import SinkSet
+from draft_kings_client.sinks.csv_sink import BufferedCsvSink
+from draft_kings_client.transport import HttpTransport
 
 logging.basicConfig(level=logging.INFO)
 
 
 class DraftKingsOddsClient:
-    BASE_URL = 'https://sportsbook-nash.draftkings.com'
-    SELECTIONS_URL = f'{BASE_URL}/api/sportscontent/dkusnj/v1/leagues/88808'
-    SELECTION_INFO_URL = f'{BASE_URL}/api/sdinfo/dkusnj/v1/selectioninfo'
-    ALTERNATE_SPREAD_SELECTION_URL = f'{BASE_URL}/api/sportscontent/dkusnj/v1/leagues/88808/categories/492/subcategories/13195'
-    ALTERNATE_TOTAL_SELECTION_URL = f'{BASE_URL}/api/sportscontent/dkusnj/v1/leagues/88808/categories/492/subcategories/13196'
-
-    def __init__(self, authenticator=None):
-        self._authenticator = authenticator or Authenticator()
-        self._session = requests.Session()
+    # Point one client (or every client, on the class) at another host; all request URLs derive from it
+    BASE_URL = DEFAULT_BASE_URL
+
+    # One selection per request keeps the original behaviour; raise it to batch selectioninfo lookups.
+    DEFAULT_BATCH_SIZE = 1
+    # Rows per sink write when streaming a feed with the iter_* methods
+    DEFAULT_MICRO_BATCH = 500
+
+    def __init__(self, authenticator=None, batch_size=DEFAULT_BATCH_SIZE, max_workers=None, use_league_snapshot=False,
+                 delta_tracking=False, snapshot_every=DeltaTracker.DEFAULT_SNAPSHOT_EVERY, response_cache=None,
+                 sink_factory=None, transport=None, metrics=None, recorder=None, feeds=None, site=DEFAULT_SITE,
+                 decoder=None, odds_book=None):
+        if batch_size < 1:
+            raise ValueError('batch_size must be at least 1')
+        if max_workers is not None and max_workers < 1:
+            raise ValueError('max_workers must be at least 1')
+
+        self._metrics = metrics or NullMetrics()
+        self._feeds = feeds if feeds is not None else default_feeds()
+        self._site = site
+        self._authenticator = authenticator or Authenticator(auth_endpoint_for_site(site), metrics=self._metrics)
+        self._transport = transport or HttpTransport()
+        # Size the connection pool to the worker count so concurrent fetches never wait on a socket
+        self._session = self._transport.session(pool_size=max_workers)
+        self._recorder = recorder
+        self._decoder = decoder
+        self._odds_book = odds_book
+        if recorder is not None:
+            recorder.attach(self._session)
+        self._batch_size = batch_size
+        self._max_workers = max_workers
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._parser = SelectionInfoParser()
+        self._use_league_snapshot = use_league_snapshot
+        self._snapshot_parser = LeagueSnapshotParser()
+        self._delta_tracking = delta_tracking
+        self._snapshot_every = snapshot_every
+        self._delta_trackers = {}
+        self._delta_lock = threading.Lock()
+        self._response_cache = response_cache
+        self._sinks = SinkSet(sink_factory or BufferedCsvSink)
 
     @property
     def authenticator(self):
         return self._authenticator
 
+    @property
+    def batch_size(self):
+        return self._batch_size
+
+    @property
+    def max_workers(self):
+        return self._max_workers
+
+    @property
+    def use_league_snapshot(self):
+        return self._use_league_snapshot
+
+    @property
+    def delta_tracking(self):
+        return self._delta_tracking
+
+    @property
+    def response_cache(self):
+        return self._response_cache
+
+    @property
+    def sinks(self):
+        return self._sinks
+
+    @property
+    def transport(self):
+        return self._transport
+
+    @property
+    def metrics(self):
+        return self._metrics
+
+    @property
+    def recorder(self):
+        return self._recorder
+
+    @property
+    def site(self):
+        return self._site
+
+    @property
+    def SELECTION_INFO_URL(self):
+        return selection_info_url(self.BASE_URL, self._site)
+
+    # Feeds now come from the registry in feeds.py; these remain for callers that used the old constants
+    @property
+    def SELECTIONS_URL(self):
+        return self._feed_url(NFL_MAIN)
+
+    @property
+    def ALTERNATE_SPREAD_SELECTION_URL(self):
+        return self._feed_url(NFL_ALTERNATE_SPREADS)
+
+    @property
+    def ALTERNATE_TOTAL_SELECTION_URL(self):
+        return self._feed_url(NFL_ALTERNATE_TOTALS)
+
+    @property
+    def decoder(self):
+        return self._decoder
+
+    @property
+    def odds_book(self):
+        return self._odds_book
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        '''Flush and close the sinks, shut down the worker pool and release pooled connections.'''
+        self._sinks.close()
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=True)
+        self._session.close()
+
     def _get_headers(self):
-        '''Retrieve the headers once and reuse them.'''
+        '''Retrieve the current headers; the authenticator renews its token as it nears expiry.'''
         return self._authenticator.headers
 
-    def _fetch_selection_ids(self, selections_url=None):
-        '''Fetch selection IDs for football markets.'''
+    def _send(self, url, headers, endpoint, stream=False):
+        started = time.perf_counter()
+        try:
+            response = self._session.get(url, headers=headers, **({'stream': True} if stream else {}))
+        except requests.RequestException:
+            self._metrics.observe_request(endpoint, time.perf_counter() - started, None)
+            raise
+        self._metrics.observe_request(endpoint, time.perf_counter() - started, response.status_code)
+        return response
+
+    def _get(self, url, extra_headers=None, endpoint='selectioninfo', stream=False):
+        '''GET a URL with the auth headers, re-authenticating and retrying once if the token is rejected.'''
+        headers = self._get_headers()
+        if extra_headers:
+            headers = {**headers, **extra_headers}
+
+        response = self._send(url, headers, endpoint, stream)
+        if response.status_code in (401, 403):
+            refresh = getattr(self._authenticator, 'refresh', None)
+            fresh_headers = refresh(headers) if refresh else None
+            if fresh_headers:
+                logging.info(f'Request to {url} was rejected with {response.status_code}, retrying with a new token.')
+                if extra_headers:
+                    fresh_headers = {**fresh_headers, **extra_headers}
+                response.close()
+                response = self._send(url, fresh_headers, endpoint, stream)
+        return response
+
+    def _decode(self, response):
+        '''Decode a JSON body with the configured decoder, or requests' own when none was given.'''
+        if self._decoder is None:
+            return response.json()
+        return self._decoder.decode(response)
+
+    def _fetch_league(self, selections_url, cache_key, build, reuse=None, decode=None):
+        '''Fetch the league document and return build(decode(response)).
+
+        With a response cache, the request is conditional and an unchanged body returns the previous
+        result (passed through reuse, if given) without decoding the JSON again. Otherwise a streaming
+        decoder reads the body straight off the connection rather than from a buffered copy.
+        '''
+        # The cache hashes the whole body, so streaming would only buffer it later anyway
+        stream = getattr(self._decoder, 'streaming', False) and self._response_cache is None
+        response = None
         try:
             if not selections_url:
                 selections_url = self.SELECTIONS_URL
 
-            response = self._session.get(selections_url, headers=self._get_headers())
-            response.raise_for_status()  # Raise an error for bad responses
-            selections_json = response.json()
-            return [selection['id'] for selection in selections_json.get('selections', [])]
-        except requests.RequestException as e:
+            key = (selections_url, cache_key)
+            conditional_headers = None
+            if self._response_cache is not None:
+                conditional_headers = self._response_cache.conditional_headers(key)
+
+            with self._metrics.timer('league'):
+                response = self._get(selections_url, conditional_headers, endpoint='league', stream=stream)
+
+                if self._response_cache is not None:
+                    cached = self._response_cache.lookup(key, response)
+                    if cached is not ResponseCache.MISS:
+                        logging.info(f'League payload unchanged for {selections_url}, reusing previous result.')
+                        return reuse(cached) if reuse else cached
+
+                response.raise_for_status()  # Raise an error for bad responses
+                league_json = (decode or self._decode)(response)
+
+            value = build(league_json)
+
+            if self._response_cache is not None and response.status_code == 200:
+                self._response_cache.store(key, response, value)
+            return value
+        except (requests.RequestException, ValueError) as e:
             logging.error(f'Failed to retrieve selections: {e}')
-            return []
+            return None
+        finally:
+            if stream and response is not None:
+                response.close()
+
+    def _fetch_selection_ids(self, selections_url=None):
+        '''Fetch selection IDs for football markets.'''
+        if self._decoder is not None:
+            # Let the decoder pull out just the IDs, which a streaming decoder can do without the full tree
+            selection_ids = self._fetch_league(selections_url, 'selection_ids', list,
+                                               decode=self._decoder.selection_ids)
+        else:
+            selection_ids = self._fetch_league(
+                selections_url, 'selection_ids',
+                lambda selections_json: [selection['id'] for selection in selections_json.get('selections', [])]
+            )
+        return selection_ids or []
 
     def _fetch_odds_for_selection(self, selection_id):
         '''Fetch odds for a given selection ID.'''
         try:
-            response = self._session.get(
-                f'{self.SELECTION_INFO_URL}?siteName=dkusnj&selectionIds={selection_id}',
-                headers=self._get_headers()
-            )
+            response = self._get(f'{self.SELECTION_INFO_URL}?siteName={self._site}&selectionIds={selection_id}')
             response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
+            return self._decode(response)
+        except (requests.RequestException, ValueError) as e:
             logging.error(f'Failed to retrieve odds for selection {selection_id}: {e}')
             return None
 
-    @staticmethod
-    def _write_to_file(rows, filename='odds_dump.csv', append=False):
-        '''Generic writer for rows, appending to the file if append is True.'''
-        if not rows:
-            logging.info('No data to write to file.')
+    def _fetch_odds_for_selections(self, selection_ids):
+        '''Fetch odds for several selection IDs in a single request.'''
+        joined_ids = ','.join(str(selection_id) for selection_id in selection_ids)
+        try:
+            response = self._get(f'{self.SELECTION_INFO_URL}?siteName={self._site}&selectionIds={joined_ids}')
+            response.raise_for_status()
+            return self._decode(response)
+        except (requests.RequestException, ValueError) as e:
+            logging.error(f'Failed to retrieve odds for selections {joined_ids}: {e}')
+            return None
+
+    def _chunk_selection_ids(self, selection_ids):
+        return [selection_ids[i:i + self._batch_size] for i in range(0, len(selection_ids), self._batch_size)]
+
+    def _fetch_odds_for_chunk(self, chunk):
+        try:
+            if len(chunk) == 1:
+                return self._fetch_odds_for_selection(chunk[0])
+            return self._fetch_odds_for_selections(chunk)
+        except Exception as e:
+            # Keep one bad selection from taking the rest of the cycle down with it
+            logging.error(f'Unexpected error retrieving odds for selection {", ".join(map(str, chunk))}: {e}')
+            return None
+
+    def _get_executor(self):
+        '''The shared worker pool, created on first use; scheduler feeds may ask for it from several threads at once.'''
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix='dk-odds')
+            return self._executor
+
+    def _iter_odds_for_chunks(self, chunks, ordered=True):
+        '''Yield (chunk, response) as each chunk is fetched, over the worker pool when concurrency is enabled.
+
+        With ordered, responses come back in chunk order (each one as soon as it and those before it are in);
+        otherwise in completion order, so one slow request holds up nothing but itself.
+        '''
+        if not self._max_workers or len(chunks) < 2:
+            for chunk in chunks:
+                yield chunk, self._fetch_odds_for_chunk(chunk)
             return
 
-        fieldnames = type(rows[0]).get_fieldnames()
+        self._get_headers()  # Resolve the token once up front rather than racing for it in every worker
+        executor = self._get_executor()
 
+        futures = {executor.submit(self._fetch_odds_for_chunk, chunk): chunk for chunk in chunks}
         try:
-            mode = 'a' if append else 'w'
-            file_exists = os.path.isfile(filename)
-
-            with open(filename, mode=mode, newline='', encoding='utf-8-sig') as file:
-                writer = csv.DictWriter(file, fieldnames=fieldnames)
-
-                if not append or (append and (not file_exists or os.path.getsize(filename) == 0)):
-                    writer.writeheader()
-                for row in rows:
-                    writer.writerow(row.to_dict())
-            if append:
-                logging.info(f'Data successfully appended to {filename}')
-            else:
-                logging.info(f'Data successfully written to {filename}')
-        except IOError as e:
-            logging.error(f'Failed to write data to file: {e}')
+            for future in (futures if ordered else as_completed(futures)):
+                yield futures[future], future.result()
+        finally:
+            # A consumer that stops early shouldn't leave the rest of the cycle queued on the pool
+            for future in futures:
+                future.cancel()
+
+    def _write_rows(self, rows, filename, append):
+        '''Hand rows to the long-lived sink for this output.'''
+        with self._metrics.timer('write'):
+            self._sinks.write(filename, rows, append=append)
+        self._metrics.increment('rows_written', len(rows))
 
     @staticmethod
-    def continuous_harvest(func, seconds=10):
-        while True:
-            logging.info(f'Running continuous harvest for method: {func}')
-            func(append=True)
+    def _delta_filename(filename):
+        root, extension = os.path.splitext(filename)
+        return f'{root}_delta{extension}'
+
+    def _persist(self, odds_rows, filename, append):
+        '''Write a cycle's rows, or only what changed since the last cycle when delta tracking is on.'''
+        if not self._delta_tracking:
+            self._write_rows(odds_rows, filename, append)
+            return
 
-            logging.info(f'Sleeping for {seconds} seconds.')
-            sleep(seconds)
+        # Each feed gets its own tracker so one feed's selections never look removed from another's
+        with self._delta_lock:
+            tracker = self._delta_trackers.get(filename)
+            if tracker is None:
+                tracker = self._delta_trackers[filename] = DeltaTracker(self._snapshot_every)
 
-    def get_football_markets(self, append=False):
-        '''Main method to retrieve football markets and save them to a CSV.'''
-        football_odds_rows = []
-        selection_ids = self._fetch_selection_ids()
+        changes = tracker.update(odds_rows)
+        self._write_rows(changes, self._delta_filename(filename), append)
 
-        if not selection_ids:
-            logging.info('No selection IDs retrieved.')
-            return football_odds_rows
+    def _end_cycle(self, filenames):
+        '''Flush a cycle's outputs so sinks only buffer within a cycle and nothing is lost if the process exits.'''
+        if self._delta_tracking:
+            filenames = [self._delta_filename(filename) for filename in filenames]
+        self._sinks.flush(*filenames)
 
-        for selection_id in selection_ids:
-            odds_json = self._fetch_odds_for_selection(selection_id)
+    @staticmethod
+    def continuous_harvest(func, seconds=10):
+        '''Run func(append=True) every `seconds` on a fixed-rate schedule until interrupted.
+
+        Use HarvestScheduler directly to run several feeds side by side or with adaptive intervals.
+        When func is a client method, that client's sinks are closed once the schedule stops.
+        '''
+        logging.info(f'Running continuous harvest for method: {func} every {seconds} seconds.')
+        scheduler = HarvestScheduler()
+        scheduler.add_feed(getattr(func, '__name__', 'harvest'), func, seconds)
+        try:
+            scheduler.run()
+        finally:
+            owner = getattr(func, '__self__', None)
+            if isinstance(owner, DraftKingsOddsClient):
+                owner.sinks.close()
+
+    def _skip_incomplete(self, chunk, odds_json):
+        '''True (after logging and counting it) when a selectioninfo response can't be turned into rows.'''
+        if self._parser.is_complete(odds_json):
+            return False
+
+        logging.warning(f'Skipping selection {", ".join(map(str, chunk))} due to incomplete data.')
+        self._metrics.increment('skipped_selections', len(chunk))
+        return True
+
+    def _iter_rows_by_id(self, selection_ids, line, ordered=True):
+        '''Fetch odds for the selection IDs in batches and yield (selection_id, row) as each batch is parsed.
+
+        Rows within a batch follow the batch's ID order; batches follow selection order when ordered is set.
+        '''
+        responses = self._iter_odds_for_chunks(self._chunk_selection_ids(selection_ids), ordered)
+        fetch_seconds = 0.0
+        parse_seconds = 0.0
+
+        # Only time spent here counts towards the stages, not time the consumer holds a yielded row
+        try:
+            while True:
+                started = time.perf_counter()
+                chunk, odds_json = next(responses, (None, None))
+                fetch_seconds += time.perf_counter() - started
+                if chunk is None:
+                    break
+                if self._skip_incomplete(chunk, odds_json):
+                    continue
+
+                started = time.perf_counter()
+                rows_by_id = {}
+                for selection_id, row in self._parser.iter_rows(odds_json, line):
+                    if selection_id is None and len(chunk) == 1:
+                        selection_id = chunk[0]  # A lone selection needs no ID to tell whose it is
+                    rows_by_id[selection_id] = row
+                parsed = [(selection_id, rows_by_id[selection_id]) for selection_id in chunk
+                          if selection_id in rows_by_id]
+                parse_seconds += time.perf_counter() - started
+                yield from parsed
+        finally:
+            responses.close()
+            self._metrics.observe_stage('selections', fetch_seconds)
+            self._metrics.observe_stage('parse', parse_seconds)
+
+    def _fetch_rows_by_id(self, selection_ids, line):
+        '''Fetch odds for the selection IDs in batches and return {selection_id: row}.'''
+        return dict(self._iter_rows_by_id(selection_ids, line))
+
+    def _build_odds_rows(self, selection_ids, line):
+        '''Fetch odds for the selection IDs in batches and return their rows in selection order.'''
+        rows_by_id = self._fetch_rows_by_id(selection_ids, line)
+        return [rows_by_id[selection_id] for selection_id in selection_ids if selection_id in rows_by_id]
+
+    def _resolve_snapshot(self, snapshot, line, fetched=None):
+        '''Fill in the selections the league payload couldn't describe, in place.
+
+        fetched maps selection IDs already looked up this cycle to their rows; it is shared across a cycle's
+        feeds so each ID is fetched once, and gains the rows fetched here.
+        '''
+        fetched = {} if fetched is None else fetched
+        fallback_ids = list(dict.fromkeys(selection_id for selection_id, row in snapshot if row is None))
+        if not fallback_ids:
+            return snapshot
+
+        missing_ids = [selection_id for selection_id in fallback_ids if selection_id not in fetched]
+        logging.info(f'Falling back to selectioninfo for {len(fallback_ids)} of {len(snapshot)} selections '
+                     f'({len(fallback_ids) - len(missing_ids)} already fetched this cycle).')
+        if missing_ids:
+            fetched.update(self._fetch_rows_by_id(missing_ids, line))
+
+        for index, (selection_id, row) in enumerate(snapshot):
+            if row is None and selection_id in fetched:
+                snapshot[index] = (selection_id, fetched[selection_id])
+        return snapshot
+
+    def _build_snapshot(self, league_json, line):
+        with self._metrics.timer('parse'):
+            return list(self._snapshot_parser.iter_snapshot(league_json, line))
+
+    def _restamp_snapshot(self, snapshot):
+        '''Carry a snapshot from an unchanged league payload forward with this cycle's retrieval time.
+
+        Snapshots are resolved before they are cached, so a selection still unresolved is one whose lookup
+        failed; it is left out rather than looked up again every cycle the payload stays unchanged.
+        '''
+        time_retrieved = self._parser.timestamp()
+        return [(selection_id, row.replace(time_retrieved=time_retrieved))
+                for selection_id, row in snapshot if row is not None]
 
-            if not odds_json or 'events' not in odds_json or 'markets' not in odds_json or 'selections' not in odds_json:
-                logging.warning(f'Skipping selection {selection_id} due to incomplete data.')
-                continue
+    @staticmethod
+    def _tag_row(row, feed):
+        '''Label a row parsed once for several feeds with this feed's line and league.'''
+        if row.line == feed.line and row.sport == feed.sport and row.league_info == feed.league_info:
+            return row
+        return row.replace(line=feed.line, sport=feed.sport, league_info=feed.league_info)
+
+    def _feed_url(self, feed):
+        return feed.league_url(self.BASE_URL, self._site)
+
+    def _fetch_feed_snapshot(self, feed, resolve=True, fetched=None):
+        '''Fetch a feed's snapshot, resolved once before the response cache stores it.
+
+        An unchanged payload's snapshot is only restamped. With resolve False a new snapshot is returned with
+        its fallbacks unresolved, for the caller to fill in place.
+        '''
+        def build(league_json):
+            snapshot = self._build_snapshot(league_json, feed.line)
+            return self._resolve_snapshot(snapshot, feed.line, fetched) if resolve else snapshot
+
+        return self._fetch_league(
+            self._feed_url(feed), f'snapshot:{feed.line}', build,
+            reuse=self._restamp_snapshot,
+            decode=self._decoder.decode_league if self._decoder is not None else None
+        )
+
+    def _collect_snapshot_rows(self, feeds):
+        snapshots = {}
+        fetched = {}  # Fallback rows looked up for earlier feeds this cycle
+        for feed in feeds:
+            snapshot = self._fetch_feed_snapshot(feed, fetched=fetched)
+            if snapshot:
+                snapshots[feed.name] = snapshot
+
+        return {feed.name: [self._tag_row(row, feed) for _, row in snapshots.get(feed.name, ()) if row is not None]
+                for feed in feeds}
+
+    def _collect_selection_rows(self, feeds):
+        selection_ids = {feed.name: self._fetch_selection_ids(self._feed_url(feed)) for feed in feeds}
+
+        # Feeds often list the same selections; fetch and parse each one once per cycle
+        unique_ids = list(dict.fromkeys(selection_id for ids in selection_ids.values() for selection_id in ids))
+        if len(feeds) > 1:
+            shared = sum(map(len, selection_ids.values())) - len(unique_ids)
+            logging.info(f'Fetching {len(unique_ids)} selections for {len(feeds)} feeds ({shared} shared).')
+
+        rows_by_id = self._fetch_rows_by_id(unique_ids, feeds[0].line) if unique_ids else {}
+        return {feed.name: [self._tag_row(rows_by_id[selection_id], feed)
+                            for selection_id in selection_ids[feed.name] if selection_id in rows_by_id]
+                for feed in feeds}
+
+    def _iter_snapshot_rows(self, feed, ordered):
+        '''Yield a feed's rows from its league payload, then the fallback selections as they are fetched.
+
+        With ordered, fallbacks are resolved before the snapshot is cached so rows keep the payload's order.
+        Otherwise a new snapshot is resolved in place as the fallbacks stream in; it is the object the response
+        cache holds, so the next unchanged cycle reuses the resolved rows.
+        '''
+        snapshot = self._fetch_feed_snapshot(feed, resolve=ordered)
+        if not snapshot:
+            return
+        if ordered:
+            for _, row in snapshot:
+                if row is not None:
+                    yield self._tag_row(row, feed)
+            return
 
-            try:
-                sportsbook = 'DraftKings'  # Consider making these top 3 strings enums when expanding
-                sport = 'Football'
-                league_info = 'NFL'
-                game_date, game_time_with_zone = odds_json['events'][0]['startDate'].split('T')
-                game_time = game_time_with_zone.split('.')[0]
-                game_participants = odds_json['events'][0].get('betSlipLine', 'Unknown Participants')
-                market = odds_json['markets'][0].get('betSlipLine', 'Unknown Market')
-                bet_selection_name = odds_json['selections'][0].get('betSlipLine', 'Unknown Selection')
-                price = odds_json['selections'][0]['displayOdds'].get('american', 'N/A')
-                time_retrieved = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-1] + 'Z'
-                suspended = odds_json['markets'][0].get('isSuspended', False)
-                line = 'MAIN'
-
-                football_odds_rows.append(
-                    OddsModel(sportsbook, sport, league_info, game_date, game_time, game_participants, market,
-                              bet_selection_name, price, time_retrieved, suspended, line)
-                )
-            except KeyError as e:
-                logging.error(f'Missing data for selection {selection_id}: {e}')
-                continue
-
-        self._write_to_file(football_odds_rows, append=append)
-        return football_odds_rows
+        pending = {}
+        for index, (selection_id, row) in enumerate(snapshot):
+            if row is None:
+                pending.setdefault(selection_id, []).append(index)
+            else:
+                yield self._tag_row(row, feed)
+
+        if pending:
+            logging.info(f'Falling back to selectioninfo for {len(pending)} of {len(snapshot)} selections.')
+            for selection_id, row in self._iter_rows_by_id(list(pending), feed.line, ordered=False):
+                for index in pending[selection_id]:
+                    snapshot[index] = (selection_id, row)
+                yield self._tag_row(row, feed)
+
+    def _iter_feed_rows(self, feed, ordered):
+        if self._use_league_snapshot:
+            yield from self._iter_snapshot_rows(feed, ordered)
+            return
 
-    def get_football_alternate_spreads(self, append=False):
-        '''Method to retrieve football alternate spreads and save them to a CSV.'''
-        alternate_spread_rows = []
-        selection_ids = self._fetch_selection_ids(self.ALTERNATE_SPREAD_SELECTION_URL)
+        selection_ids = self._fetch_selection_ids(self._feed_url(feed))
+        for _, row in self._iter_rows_by_id(selection_ids, feed.line, ordered):
+            yield self._tag_row(row, feed)
 
-        if not selection_ids:
-            logging.info('No selection IDs retrieved.')
-            return alternate_spread_rows
+    def _consume_micro_batch(self, rows, feed, append):
+        if self._odds_book is not None:
+            self._odds_book.update(rows)
+        if not self._delta_tracking:
+            self._write_rows(rows, feed.filename, append)
 
-        for selection_id in selection_ids:
-            odds_json = self._fetch_odds_for_selection(selection_id)
+    @property
+    def feeds(self):
+        return self._feeds
+
+    def _select_feeds(self, feed_names):
+        feeds = [self._feeds.get(name) for name in feed_names] if feed_names else list(self._feeds)
+        if not feeds:
+            raise ValueError('No feeds to harvest')
+        return feeds
+
+    def _collect(self, feeds):
+        if self._use_league_snapshot:
+            return self._collect_snapshot_rows(feeds)
+        return self._collect_selection_rows(feeds)
+
+    def harvest(self, feed_names=None, append=False):
+        '''Harvest several feeds in one pass and write each feed's rows to its own output.
+
+        Selections listed by more than one feed are fetched and parsed once. Returns {feed name: rows}.
+        '''
+        feeds = self._select_feeds(feed_names)
+        with self._metrics.cycle('+'.join(feed.name for feed in feeds)):
+            results = self._collect(feeds)
+            for feed in feeds:
+                if results[feed.name]:
+                    if self._odds_book is not None:
+                        self._odds_book.update(results[feed.name])
+                    self._persist(results[feed.name], feed.filename, append)
+                else:
+                    logging.info(f'No selection IDs retrieved for {feed.name}.')
+            self._end_cycle([feed.filename for feed in feeds if results[feed.name]])
+        return results
+
+    def collect(self, feed_names=None):
+        '''Fetch and parse feeds like harvest() but return the rows without writing them: {feed name: rows}.'''
+        return self._collect(self._select_feeds(feed_names))
+
+    def iter_feed(self, name, append=False, ordered=False, micro_batch=DEFAULT_MICRO_BATCH):
+        '''Yield a registered feed's rows as soon as each one is parsed, writing them out as the stream is consumed.
+
+        Rows come in completion order unless ordered is set. Every micro_batch rows are handed to the feed's
+        sink (and odds book) as they are yielded; micro_batch=None writes the whole cycle once it ends. With
+        delta tracking the changes are only known once every row has been seen, so they are written at the end.
+        append applies to the first write of the cycle; later micro-batches always append.
+        '''
+        feed = self._feeds.get(name)
+        pending = []
+        cycle_rows = [] if self._delta_tracking else None
+        yielded = 0
+        finished = False
+
+        with self._metrics.cycle(feed.name):
+            try:
+                for row in self._iter_feed_rows(feed, ordered):
+                    pending.append(row)
+                    if cycle_rows is not None:
+                        cycle_rows.append(row)
+                    yielded += 1
+                    yield row
+
+                    if micro_batch and len(pending) >= micro_batch:
+                        self._consume_micro_batch(pending, feed, append or yielded > len(pending))
+                        pending = []
+                finished = True
+            finally:
+                # Rows already handed to the consumer are written and flushed even if it stops early
+                if pending:
+                    self._consume_micro_batch(pending, feed, append or yielded > len(pending))
+                if yielded:
+                    # A partial cycle would report every unseen row as removed, so only a full one is diffed
+                    if finished and cycle_rows is not None:
+                        self._persist(cycle_rows, feed.filename, append)
+                    self._end_cycle([feed.filename])
+
+            if not yielded:
+                logging.info(f'No selection IDs retrieved for {feed.name}.')
+
+    def harvest_feed(self, name, append=False):
+        '''Harvest a single registered feed and return its rows in selection order.'''
+        return list(self.iter_feed(name, append, ordered=True, micro_batch=None))
+
+    def iter_football_markets(self, append=False, ordered=False, micro_batch=DEFAULT_MICRO_BATCH):
+        '''Stream football markets row by row; see iter_feed.'''
+        return self.iter_feed(NFL_MAIN.name, append, ordered, micro_batch)
+
+    def iter_football_alternate_spreads(self, append=False, ordered=False, micro_batch=DEFAULT_MICRO_BATCH):
+        '''Stream football alternate spreads row by row; see iter_feed.'''
+        return self.iter_feed(NFL_ALTERNATE_SPREADS.name, append, ordered, micro_batch)
+
+    def iter_football_alternate_totals(self, append=False, ordered=False, micro_batch=DEFAULT_MICRO_BATCH):
+        '''Stream football alternate totals row by row; see iter_feed.'''
+        return self.iter_feed(NFL_ALTERNATE_TOTALS.name, append, ordered, micro_batch)
 
-            if not odds_json or 'events' not in odds_json or 'markets' not in odds_json or 'selections' not in odds_json:
-                logging.warning(f'Skipping selection {selection_id} due to incomplete data.')
-                continue
+    def get_football_markets(self, append=False):
+        '''Main method to retrieve football markets and save them to a CSV.'''
+        return self.harvest_feed(NFL_MAIN.name, append)
 
-            try:
-                sportsbook = 'DraftKings'  # Consider making these top 3 strings enums when expanding
-                sport = 'Football'
-                league_info = 'NFL'
-                game_date, game_time_with_zone = odds_json['events'][0]['startDate'].split('T')
-                game_time = game_time_with_zone.split('.')[0]
-                game_participants = odds_json['events'][0].get('betSlipLine', 'Unknown Participants')
-                market = odds_json['markets'][0].get('betSlipLine', 'Unknown Market')
-                bet_selection_name = odds_json['selections'][0].get('betSlipLine', 'Unknown Selection')
-                price = odds_json['selections'][0]['displayOdds'].get('american', 'N/A')
-                time_retrieved = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-1] + 'Z'
-                suspended = odds_json['markets'][0].get('isSuspended', False)
-                line = 'ALTERNATE'
-
-                alternate_spread_rows.append(
-                    OddsModel(sportsbook, sport, league_info, game_date, game_time, game_participants, market,
-                              bet_selection_name, price, time_retrieved, suspended, line)
-                )
-            except KeyError as e:
-                logging.error(f'Missing data for selection {selection_id}: {e}')
-                continue
-
-        self._write_to_file(alternate_spread_rows, filename='odds_alternate_spreads_dump.csv', append=append)
-        return alternate_spread_rows
+    def get_football_alternate_spreads(self, append=False):
+        '''Method to retrieve football alternate spreads and save them to a CSV.'''
+        return self.harvest_feed(NFL_ALTERNATE_SPREADS.name, append)
 
     def get_football_alternate_totals(self, append=False):
         '''Method to retrieve football alternate totals and save them to a CSV.'''
-        alternate_totals_rows = []
-        selection_ids = self._fetch_selection_ids(self.ALTERNATE_TOTAL_SELECTION_URL)
-
-        if not selection_ids:
-            logging.info('No selection IDs retrieved.')
-            return alternate_totals_rows
-
-        for selection_id in selection_ids:
-            odds_json = self._fetch_odds_for_selection(selection_id)
-
-            if not odds_json or 'events' not in odds_json or 'markets' not in odds_json or 'selections' not in odds_json:
-                logging.warning(f'Skipping selection {selection_id} due to incomplete data.')
-                continue
-
-            try:
-                sportsbook = 'DraftKings'  # Consider making these top 3 strings enums when expanding
-                sport = 'Football'
-                league_info = 'NFL'
-                game_date, game_time_with_zone = odds_json['events'][0]['startDate'].split('T')
-                game_time = game_time_with_zone.split('.')[0]
-                game_participants = odds_json['events'][0].get('betSlipLine', 'Unknown Participants')
-                market = odds_json['markets'][0].get('betSlipLine', 'Unknown Market')
-                bet_selection_name = odds_json['selections'][0].get('betSlipLine', 'Unknown Selection')
-                price = odds_json['selections'][0]['displayOdds'].get('american', 'N/A')
-                time_retrieved = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-1] + 'Z'
-                suspended = odds_json['markets'][0].get('isSuspended', False)
-                line = 'ALTERNATE'
-
-                alternate_totals_rows.append(
-                    OddsModel(sportsbook, sport, league_info, game_date, game_time, game_participants, market,
-                              bet_selection_name, price, time_retrieved, suspended, line)
-                )
-            except KeyError as e:
-                logging.error(f'Missing data for selection {selection_id}: {e}')
-                continue
-
-        self._write_to_file(alternate_totals_rows, filename='odds_alternate_totals_dump.csv', append=append)
-        return alternate_totals_rows
+        return self.harvest_feed(NFL_ALTERNATE_TOTALS.name, append)
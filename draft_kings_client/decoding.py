@@ -0,0 +1,146 @@
+import io
+import json
+import logging
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+logging.basicConfig(level=logging.INFO)
+
+# The only league fields the parsers read; projecting onto these drops everything else in the payload
+LEAGUE_FIELDS = {
+    'events': ('id', 'startDate', 'startEventDate', 'betSlipLine', 'name'),
+    'markets': ('id', 'eventId', 'betSlipLine', 'name', 'isSuspended'),
+    'selections': ('id', 'marketId', 'betSlipLine', 'label', 'points', 'displayOdds'),
+}
+
+
+def _project(item, fields):
+    projected = {field: item[field] for field in fields if field in item}
+    display_odds = projected.get('displayOdds')
+    if isinstance(display_odds, dict) and 'american' in display_odds:
+        projected['displayOdds'] = {'american': display_odds['american']}
+    return projected
+
+
+def project_league(league_json):
+    '''Keep only the events, markets and selections fields the row builders need.'''
+    return {section: [_project(item, fields) for item in league_json.get(section, ())]
+            for section, fields in LEAGUE_FIELDS.items()}
+
+
+def _body(response):
+    '''The body as a file: the unread stream of a stream=True response, otherwise the buffered bytes.'''
+    raw = getattr(response, 'raw', None)
+    # requests leaves _content as False until something reads the body
+    if getattr(response, '_content', None) is False and raw is not None:
+        raw.decode_content = True  # Undo any gzip/deflate transfer encoding while reading
+        return raw
+    return io.BytesIO(response.content)
+
+
+class JsonDecoder:
+    '''Decodes response bodies with the fastest JSON library available, falling back to the stdlib.
+
+    backend is 'orjson', 'ujson' or 'json'; the default picks the first one that is installed.
+    '''
+    BACKENDS = ('orjson', 'ujson', 'json')
+
+    def __init__(self, backend=None):
+        if backend is None:
+            backend = next(name for name in self.BACKENDS if self.available(name))
+        elif not self.available(backend):
+            raise ImportError(f'JSON backend {backend} is not installed')
+
+        self._backend = backend
+        if backend == 'orjson':
+            self._loads = orjson.loads
+        elif backend == 'ujson':
+            self._loads = ujson.loads
+        else:
+            self._loads = json.loads
+
+    @staticmethod
+    def available(backend):
+        return {'orjson': orjson, 'ujson': ujson, 'json': json}.get(backend) is not None
+
+    @property
+    def backend(self):
+        return self._backend
+
+    def loads(self, content):
+        return self._loads(content)
+
+    def decode(self, response):
+        return self._loads(response.content)
+
+    def decode_league(self, response):
+        return self.decode(response)
+
+    def selection_ids(self, response):
+        return [selection['id'] for selection in self.decode(response).get('selections', [])]
+
+
+class StreamingDecoder(JsonDecoder):
+    '''Pulls just the needed fields out of league documents incrementally with ijson, never building the full tree.
+
+    The document is read in a single ijson.parse pass straight off the socket when the response was requested
+    with stream=True (the client does this for league requests), so neither the body nor the full tree is
+    ever held; each event, market and selection is materialised one at a time and projected before the next
+    is read. A body that has already been read (e.g. by a response cache or recorder) is parsed from memory.
+    This trades CPU for memory: ijson is several times slower than orjson on the same document. Without
+    ijson installed league documents are decoded in full. Other responses use the fast decoder.
+    '''
+    ITEM_PREFIXES = {f'{section}.item': (section, fields) for section, fields in LEAGUE_FIELDS.items()}
+
+    def __init__(self, backend=None):
+        super().__init__(backend)
+        if ijson is None:
+            logging.warning('ijson is not installed; league documents will be decoded in full.')
+
+    @property
+    def streaming(self):
+        return ijson is not None
+
+    def decode_league(self, response):
+        if ijson is None:
+            return super().decode_league(response)
+
+        league = {section: [] for section in LEAGUE_FIELDS}
+        item_prefix = builder = None
+        try:
+            for prefix, event, value in ijson.parse(_body(response), use_float=True):
+                if builder is None:
+                    if event == 'start_map' and prefix in self.ITEM_PREFIXES:
+                        item_prefix, builder = prefix, ijson.ObjectBuilder()
+                        builder.event(event, value)
+                    continue
+
+                builder.event(event, value)
+                if event == 'end_map' and prefix == item_prefix:
+                    section, fields = self.ITEM_PREFIXES[item_prefix]
+                    league[section].append(_project(builder.value, fields))
+                    item_prefix = builder = None
+        except ijson.JSONError as e:
+            raise ValueError(f'Malformed league document: {e}') from e
+        return league
+
+    def selection_ids(self, response):
+        if ijson is None:
+            return super().selection_ids(response)
+        try:
+            return list(ijson.items(_body(response), 'selections.item.id'))
+        except ijson.JSONError as e:
+            raise ValueError(f'Malformed league document: {e}') from e
@@ -0,0 +1,59 @@
+import logging
+
+from draft_kings_client.models.odds_change import OddsChange
+
+logging.basicConfig(level=logging.INFO)
+
+
+class DeltaTracker:
+    '''Remembers the last-seen price and suspension state per selection and reports what moved.
+
+    Every snapshot_every cycles (including the first) the full set of rows is emitted as SNAPSHOT,
+    so the current state can be rebuilt from the latest snapshot plus the deltas that follow it.
+    '''
+    DEFAULT_SNAPSHOT_EVERY = 360  # One hour of 10 second cycles
+
+    def __init__(self, snapshot_every=DEFAULT_SNAPSHOT_EVERY):
+        if snapshot_every < 1:
+            raise ValueError('snapshot_every must be at least 1')
+
+        self._snapshot_every = snapshot_every
+        self._last_seen = {}
+        self._cycle = 0
+
+    @property
+    def snapshot_every(self):
+        return self._snapshot_every
+
+    @property
+    def cycle(self):
+        return self._cycle
+
+    @staticmethod
+    def selection_key(row):
+        return row.game_participants, row.market, row.bet_selection_name, row.line
+
+    def update(self, rows):
+        '''Record a harvest cycle and return the OddsChange rows worth persisting.'''
+        current = {self.selection_key(row): row for row in rows}
+        snapshot_due = self._cycle % self._snapshot_every == 0
+        self._cycle += 1
+
+        if snapshot_due:
+            changes = [OddsChange(OddsChange.SNAPSHOT, row) for row in current.values()]
+        else:
+            changes = []
+            for key, row in current.items():
+                previous = self._last_seen.get(key)
+                if previous is None:
+                    changes.append(OddsChange(OddsChange.NEW, row))
+                elif previous.price != row.price or previous.suspended != row.suspended:
+                    changes.append(OddsChange(OddsChange.CHANGED, row))
+
+            for key, previous in self._last_seen.items():
+                if key not in current:
+                    changes.append(OddsChange(OddsChange.REMOVED, previous))
+
+        self._last_seen = current
+        logging.info(f'Delta cycle {self._cycle}: {len(changes)} of {len(current)} selections to persist.')
+        return changes
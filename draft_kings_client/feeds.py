@@ -0,0 +1,130 @@
+DEFAULT_BASE_URL = 'https://sportsbook-nash.draftkings.com'
+DEFAULT_SITE = 'dkusnj'
+
+
+class FeedConfig:
+    '''One league / category / subcategory listing to harvest, and where its rows go.
+
+    line tags every row from the feed (e.g. 'MAIN' or 'ALTERNATE'); sport and league_info describe
+    the league for consumers of the rows. The state site a feed is read from belongs to the client
+    harvesting it, which also holds that site's token.
+    '''
+
+    def __init__(self, name, league_id, filename, line='MAIN', category_id=None, subcategory_id=None,
+                 sport='Football', league_info='NFL'):
+        if subcategory_id is not None and category_id is None:
+            raise ValueError('subcategory_id needs a category_id')
+
+        self._name = name
+        self._league_id = league_id
+        self._filename = filename
+        self._line = line
+        self._category_id = category_id
+        self._subcategory_id = subcategory_id
+        self._sport = sport
+        self._league_info = league_info
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def league_id(self):
+        return self._league_id
+
+    @property
+    def filename(self):
+        return self._filename
+
+    @property
+    def line(self):
+        return self._line
+
+    @property
+    def category_id(self):
+        return self._category_id
+
+    @property
+    def subcategory_id(self):
+        return self._subcategory_id
+
+    @property
+    def sport(self):
+        return self._sport
+
+    @property
+    def league_info(self):
+        return self._league_info
+
+    def league_path(self, site=DEFAULT_SITE):
+        '''Path of the feed's league listing on a state's site.'''
+        path = f'/api/sportscontent/{site}/v1/leagues/{self._league_id}'
+        if self._category_id is not None:
+            path += f'/categories/{self._category_id}'
+        if self._subcategory_id is not None:
+            path += f'/subcategories/{self._subcategory_id}'
+        return path
+
+    def league_url(self, base_url=DEFAULT_BASE_URL, site=DEFAULT_SITE):
+        return f'{base_url}{self.league_path(site)}'
+
+    def __repr__(self):
+        return f'FeedConfig({self._name!r}, {self.league_path()!r}, {self._filename!r}, line={self._line!r})'
+
+
+def site_state(site):
+    '''The state code of a DraftKings US site name, e.g. 'dkusnj' -> 'nj'.'''
+    if len(site) != 6 or not site.startswith('dkus'):
+        raise ValueError(f'Not a DraftKings US site name: {site}')
+    return site[4:]
+
+
+def selection_info_url(base_url=DEFAULT_BASE_URL, site=DEFAULT_SITE):
+    return f'{base_url}/api/sdinfo/{site}/v1/selectioninfo'
+
+
+class FeedRegistry:
+    '''An ordered set of feeds, looked up by name.'''
+
+    def __init__(self, feeds=()):
+        self._feeds = {}
+        for feed in feeds:
+            self.register(feed)
+
+    def register(self, feed):
+        if feed.name in self._feeds:
+            raise ValueError(f'Feed {feed.name} is already registered')
+        self._feeds[feed.name] = feed
+        return feed
+
+    def get(self, name):
+        try:
+            return self._feeds[name]
+        except KeyError:
+            raise KeyError(f'Unknown feed: {name}') from None
+
+    @property
+    def names(self):
+        return list(self._feeds)
+
+    def __iter__(self):
+        return iter(self._feeds.values())
+
+    def __len__(self):
+        return len(self._feeds)
+
+    def __contains__(self, name):
+        return name in self._feeds
+
+
+NFL_LEAGUE_ID = 88808
+NFL_MAIN = FeedConfig('football_markets', NFL_LEAGUE_ID, 'odds_dump.csv')
+NFL_ALTERNATE_SPREADS = FeedConfig('football_alternate_spreads', NFL_LEAGUE_ID, 'odds_alternate_spreads_dump.csv',
+                                   line='ALTERNATE', category_id=492, subcategory_id=13195)
+NFL_ALTERNATE_TOTALS = FeedConfig('football_alternate_totals', NFL_LEAGUE_ID, 'odds_alternate_totals_dump.csv',
+                                  line='ALTERNATE', category_id=492, subcategory_id=13196)
+
+
+def default_feeds():
+    '''A fresh registry holding the NFL main, alternate spread and alternate total feeds.'''
+    return FeedRegistry([NFL_MAIN, NFL_ALTERNATE_SPREADS, NFL_ALTERNATE_TOTALS])
@@ -1,8 +1,17 @@
 from draft_kings_client.client import DraftKingsOddsClient
+from draft_kings_client.response_cache import ResponseCache
+from draft_kings_client.scheduler import HarvestScheduler, kickoff_interval
 
 
-client = DraftKingsOddsClient()
-football_odds = client.get_football_markets()
-alternate_spreads = client.get_football_alternate_spreads()
-alternate_totals = client.get_football_alternate_totals()
-client.continuous_harvest(client.get_football_markets)
+client = DraftKingsOddsClient(batch_size=50, max_workers=8, use_league_snapshot=True,
+                              response_cache=ResponseCache())
+# One pass over every registered feed; selections they share are fetched once
+odds_by_feed = client.harvest()
+
+scheduler = HarvestScheduler()
+scheduler.add_feed('main', client.get_football_markets, 10, jitter=1, interval_fn=kickoff_interval())
+scheduler.add_feed('alternate_spreads', client.get_football_alternate_spreads, 30, jitter=3)
+scheduler.add_feed('alternate_totals', client.get_football_alternate_totals, 30, jitter=3)
+
+with client:
+    scheduler.run()
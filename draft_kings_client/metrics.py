@@ -0,0 +1,314 @@
+import bisect
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logging.basicConfig(level=logging.INFO)
+
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class NullMetrics:
+    '''Default instrumentation: every hook is a no-op, so an uninstrumented client pays only a method call.'''
+    enabled = False
+
+    def timer(self, stage):
+        return _NULL_TIMER
+
+    def cycle(self, feed):
+        return _NULL_TIMER
+
+    def observe_stage(self, stage, seconds):
+        pass
+
+    def observe_request(self, endpoint, seconds, status):
+        pass
+
+    def increment(self, name, amount=1):
+        pass
+
+
+class Histogram:
+    '''Cumulative-bucket latency histogram in the Prometheus style.'''
+
+    def __init__(self, buckets):
+        self._buckets = tuple(buckets)
+        self._counts = [0] * (len(self._buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+
+    @property
+    def buckets(self):
+        return self._buckets
+
+    @property
+    def count(self):
+        return self._count
+
+    @property
+    def sum(self):
+        return self._sum
+
+    def observe(self, value):
+        self._counts[bisect.bisect_left(self._buckets, value)] += 1
+        self._sum += value
+        self._count += 1
+
+    def cumulative(self):
+        '''Yield (upper bound, observations <= bound) pairs, ending with +Inf.'''
+        running = 0
+        for bound, count in zip(self._buckets + (float('inf'),), self._counts):
+            running += count
+            yield bound, running
+
+    def quantile(self, q):
+        '''Estimate a quantile from the buckets, interpolating linearly inside the bucket it falls in.'''
+        if not self._count:
+            return None
+
+        target = q * self._count
+        lower, previous = 0.0, 0
+        for bound, running in self.cumulative():
+            if running >= target:
+                if bound == float('inf'):
+                    return lower
+                in_bucket = running - previous
+                return lower + (bound - lower) * ((target - previous) / in_bucket if in_bucket else 0.0)
+            lower, previous = bound, running
+        return lower
+
+
+class _Timer:
+    __slots__ = ('_metrics', '_stage', '_started')
+
+    def __init__(self, metrics, stage):
+        self._metrics = metrics
+        self._stage = stage
+        self._started = None
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._metrics.observe_stage(self._stage, time.perf_counter() - self._started)
+        return False
+
+
+class _Cycle:
+    def __init__(self, metrics, feed):
+        self._metrics = metrics
+        self._feed = feed
+        self._started = None
+        self._before = None
+
+    def __enter__(self):
+        self._before = self._metrics.totals()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._metrics.finish_cycle(self._feed, time.perf_counter() - self._started, self._before)
+        return False
+
+
+class HarvestMetrics:
+    '''Thread-safe counters and latency histograms for a harvester.
+
+    Stages are 'auth', 'league', 'selections' (selectioninfo fetches), 'parse' and 'write'; request
+    latencies are kept per endpoint. Counters are process-wide, so when feeds overlap a cycle summary
+    also includes whatever the other feeds did during its window.
+    '''
+    enabled = True
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+    COUNTERS = ('requests', 'errors', 'skipped_selections', 'rows_written')
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, log_cycles=True):
+        self._buckets = tuple(sorted(buckets))
+        self._log_cycles = log_cycles
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._requests = {}
+        self._cycles = {}
+        self._endpoint_counts = {}
+        self._counters = dict.fromkeys(self.COUNTERS, 0)
+        self._last_cycles = {}
+
+    def timer(self, stage):
+        return _Timer(self, stage)
+
+    def cycle(self, feed):
+        '''Context manager that times one harvest cycle and records a summary of what it did.'''
+        return _Cycle(self, feed)
+
+    def _histogram(self, histograms, key):
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = Histogram(self._buckets)
+        return histogram
+
+    def observe_stage(self, stage, seconds):
+        with self._lock:
+            self._histogram(self._stages, stage).observe(seconds)
+
+    def observe_request(self, endpoint, seconds, status):
+        '''Record one HTTP request; a status of None means it failed before any response arrived.'''
+        failed = status is None or status >= 400
+        with self._lock:
+            self._histogram(self._requests, endpoint).observe(seconds)
+            requests, errors = self._endpoint_counts.get(endpoint, (0, 0))
+            self._endpoint_counts[endpoint] = (requests + 1, errors + failed)
+            self._counters['requests'] += 1
+            self._counters['errors'] += failed
+
+    def increment(self, name, amount=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def totals(self):
+        with self._lock:
+            totals = dict(self._counters)
+            totals.update((f'{stage}_seconds', histogram.sum) for stage, histogram in self._stages.items())
+            return totals
+
+    def finish_cycle(self, feed, seconds, before):
+        after = self.totals()
+        summary = {'feed': feed, 'seconds': round(seconds, 6)}
+        for name, value in after.items():
+            delta = value - before.get(name, 0)
+            summary[name] = round(delta, 6) if isinstance(delta, float) else delta
+
+        with self._lock:
+            self._histogram(self._cycles, feed).observe(seconds)
+            self._last_cycles[feed] = summary
+
+        if self._log_cycles:
+            logging.info(f'Harvest cycle summary: {summary}')
+        return summary
+
+    def last_cycle(self, feed):
+        with self._lock:
+            return self._last_cycles.get(feed)
+
+    def counter(self, name):
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def stage(self, stage):
+        with self._lock:
+            return self._stages.get(stage)
+
+    def endpoint(self, endpoint):
+        with self._lock:
+            return self._requests.get(endpoint)
+
+    def render_prometheus(self):
+        '''Render every metric in the Prometheus text exposition format.'''
+        with self._lock:
+            lines = []
+            self._render_histograms(lines, 'draft_kings_stage_seconds', 'Time spent in each harvest stage.',
+                                    'stage', self._stages)
+            self._render_histograms(lines, 'draft_kings_request_seconds', 'HTTP request latency by endpoint.',
+                                    'endpoint', self._requests)
+            self._render_histograms(lines, 'draft_kings_cycle_seconds', 'Harvest cycle duration by feed.',
+                                    'feed', self._cycles)
+
+            lines.append('# HELP draft_kings_requests_total HTTP requests sent, by endpoint.')
+            lines.append('# TYPE draft_kings_requests_total counter')
+            for endpoint, (requests, _) in sorted(self._endpoint_counts.items()):
+                lines.append(f'draft_kings_requests_total{{endpoint="{_escape(endpoint)}"}} {requests}')
+
+            lines.append('# HELP draft_kings_request_errors_total Failed HTTP requests, by endpoint.')
+            lines.append('# TYPE draft_kings_request_errors_total counter')
+            for endpoint, (_, errors) in sorted(self._endpoint_counts.items()):
+                lines.append(f'draft_kings_request_errors_total{{endpoint="{_escape(endpoint)}"}} {errors}')
+
+            for name, value in sorted(self._counters.items()):
+                if name in ('requests', 'errors'):
+                    continue
+                lines.append(f'# TYPE draft_kings_{name}_total counter')
+                lines.append(f'draft_kings_{name}_total {value}')
+
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _render_histograms(lines, metric, help_text, label, histograms):
+        lines.append(f'# HELP {metric} {help_text}')
+        lines.append(f'# TYPE {metric} histogram')
+        for key, histogram in sorted(histograms.items()):
+            label_value = _escape(key)
+            for bound, running in histogram.cumulative():
+                upper = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{metric}_bucket{{{label}="{label_value}",le="{upper}"}} {running}')
+            lines.append(f'{metric}_sum{{{label}="{label_value}"}} {histogram.sum}')
+            lines.append(f'{metric}_count{{{label}="{label_value}"}} {histogram.count}')
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        body = self.server.metrics.render_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MetricsServer:
+    '''Serves HarvestMetrics at http://host:port/metrics on a background thread.'''
+
+    def __init__(self, metrics, port=9108, host='127.0.0.1'):
+        self._metrics = metrics
+        self._port = port
+        self._host = host
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}/metrics'
+
+    def start(self):
+        self._server = ThreadingHTTPServer((self._host, self._port), _MetricsHandler)
+        self._server.daemon_threads = True
+        self._server.metrics = self._metrics
+        self._thread = threading.Thread(target=self._server.serve_forever, name='dk-metrics', daemon=True)
+        self._thread.start()
+        logging.info(f'Serving metrics at {self.url}')
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
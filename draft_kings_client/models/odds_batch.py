@@ -0,0 +1,226 @@
+import math
+import sys
+from array import array
+from datetime import datetime
+
+from draft_kings_client.models.odds_model import OddsModel
+from draft_kings_client.pricing import parse_american_price
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+
+def _column_property(name):
+    return property(lambda self: self._batch.value(name, self._index))
+
+
+class OddsRowView:
+    '''Read-only view of one row inside an OddsBatch; nothing is copied until to_model() is called.'''
+    __slots__ = ('_batch', '_index')
+
+    def __init__(self, batch, index):
+        self._batch = batch
+        self._index = index
+
+    sportsbook = _column_property('sportsbook')
+    sport = _column_property('sport')
+    league_info = _column_property('league_info')
+    game_date = _column_property('game_date')
+    game_time = _column_property('game_time')
+    game_participants = _column_property('game_participants')
+    market = _column_property('market')
+    bet_selection_name = _column_property('bet_selection_name')
+    price = _column_property('price')
+    time_retrieved = _column_property('time_retrieved')
+    line = _column_property('line')
+
+    @property
+    def suspended(self):
+        return bool(self._batch.suspended_flags[self._index])
+
+    @property
+    def price_value(self):
+        '''Price as a float of American odds; NaN when the raw price is malformed.'''
+        return self._batch.price_values[self._index]
+
+    @property
+    def timestamp(self):
+        '''time_retrieved as seconds since the epoch; NaN when it can't be parsed.'''
+        return self._batch.timestamps[self._index]
+
+    def to_tuple(self):
+        return tuple(getattr(self, name) for name in OddsModel.get_fieldnames())
+
+    def to_dict(self):
+        return dict(zip(OddsModel.get_fieldnames(), self.to_tuple()))
+
+    def to_model(self):
+        return OddsModel(*self.to_tuple())
+
+    @staticmethod
+    def get_fieldnames():
+        return OddsModel.get_fieldnames()
+
+
+class OddsBatch:
+    '''One harvest cycle stored as parallel columns rather than one object per row.
+
+    String columns are dictionary-encoded: each distinct (interned) string is stored once and rows hold
+    4-byte codes into it. Price and timestamp are also kept as float64 arrays for numeric work, and
+    slices are views over the same columns.
+    '''
+    STRING_FIELDS = ('sportsbook', 'sport', 'league_info', 'game_date', 'game_time', 'game_participants', 'market',
+                     'bet_selection_name', 'price', 'time_retrieved', 'line')
+
+    def __init__(self, codes, categories, price_values, timestamps, suspended_flags, start=0, stop=None):
+        self._codes = codes
+        self._categories = categories
+        self._price_values = price_values
+        self._timestamps = timestamps
+        self._suspended_flags = suspended_flags
+        self._start = start
+        self._stop = len(suspended_flags) if stop is None else stop
+
+    @classmethod
+    def from_rows(cls, rows):
+        codes = {name: array('I') for name in cls.STRING_FIELDS}
+        categories = {name: [] for name in cls.STRING_FIELDS}
+        lookups = {name: {} for name in cls.STRING_FIELDS}
+        price_values = array('d')
+        timestamps = array('d')
+        suspended_flags = array('b')
+        parsed_prices = {}
+        parsed_timestamps = {}
+
+        for row in rows:
+            for name in cls.STRING_FIELDS:
+                value = getattr(row, name)
+                lookup = lookups[name]
+                code = lookup.get(value)
+                if code is None:
+                    code = lookup[value] = len(categories[name])
+                    categories[name].append(sys.intern(str(value)))
+                codes[name].append(code)
+
+            # Prices and retrieval times repeat heavily within a cycle, so each distinct value is parsed once
+            price = row.price
+            if price not in parsed_prices:
+                value = parse_american_price(price)
+                parsed_prices[price] = math.nan if value is None else float(value)
+            price_values.append(parsed_prices[price])
+
+            time_retrieved = row.time_retrieved
+            if time_retrieved not in parsed_timestamps:
+                parsed_timestamps[time_retrieved] = cls._parse_timestamp(time_retrieved)
+            timestamps.append(parsed_timestamps[time_retrieved])
+
+            suspended_flags.append(1 if row.suspended is True or str(row.suspended).lower() == 'true' else 0)
+
+        return cls(codes, categories, price_values, timestamps, suspended_flags)
+
+    @staticmethod
+    def _parse_timestamp(value):
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except (TypeError, ValueError):
+            return math.nan
+
+    def value(self, name, index):
+        '''The string stored for a column at an absolute row position.'''
+        return self._categories[name][self._codes[name][index]]
+
+    def codes(self, name):
+        '''The full underlying code array for a column; row view indexes are absolute positions in it.'''
+        return self._codes[name]
+
+    def categories(self, name):
+        '''The distinct strings a column's codes refer to.'''
+        return self._categories[name]
+
+    def column(self, name):
+        '''The decoded strings for this batch's rows.'''
+        categories = self._categories[name]
+        return [categories[code] for code in self._codes[name][self._start:self._stop]]
+
+    @property
+    def price_values(self):
+        return self._price_values
+
+    @property
+    def timestamps(self):
+        return self._timestamps
+
+    @property
+    def suspended_flags(self):
+        return self._suspended_flags
+
+    def __len__(self):
+        return self._stop - self._start
+
+    def __iter__(self):
+        for index in range(self._start, self._stop):
+            yield OddsRowView(self, index)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            start, stop, step = item.indices(len(self))
+            if step != 1:
+                raise ValueError('OddsBatch slices must be contiguous')
+            return OddsBatch(self._codes, self._categories, self._price_values, self._timestamps, self._suspended_flags,
+                             self._start + start, self._start + max(start, stop))
+
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError('OddsBatch index out of range')
+        return OddsRowView(self, self._start + item)
+
+    def to_rows(self):
+        return [view.to_model() for view in self]
+
+    def _code_array(self, name):
+        return np.frombuffer(self._codes[name], dtype=np.uint32)[self._start:self._stop]
+
+    def numeric_arrays(self):
+        '''price_value, timestamp and suspended as NumPy arrays for this batch's rows.'''
+        if np is None:
+            raise ImportError('OddsBatch.numeric_arrays requires numpy')
+
+        return {
+            'price_value': np.frombuffer(self._price_values, dtype=np.float64)[self._start:self._stop],
+            'timestamp': np.frombuffer(self._timestamps, dtype=np.float64)[self._start:self._stop],
+            'suspended': np.frombuffer(self._suspended_flags, dtype=np.int8)[self._start:self._stop].astype(bool),
+        }
+
+    def to_numpy(self):
+        '''Columns as NumPy arrays; price_value and timestamp share memory with the batch.'''
+        if np is None:
+            raise ImportError('OddsBatch.to_numpy requires numpy')
+
+        arrays = {name: np.array(self._categories[name], dtype=object)[self._code_array(name)]
+                  for name in self.STRING_FIELDS}
+        arrays.update(self.numeric_arrays())
+        return arrays
+
+    def to_pandas(self):
+        '''A DataFrame with categorical string columns, numeric price_value and a UTC timestamp column.'''
+        if pd is None:
+            raise ImportError('OddsBatch.to_pandas requires pandas')
+
+        frame = pd.DataFrame({
+            name: pd.Categorical.from_codes(self._code_array(name).astype(np.int32),
+                                            categories=pd.Index(self._categories[name], dtype=object))
+            for name in self.STRING_FIELDS
+        })
+        numeric = self.numeric_arrays()
+        frame['price_value'] = numeric['price_value']
+        frame['timestamp'] = pd.to_datetime(numeric['timestamp'], unit='s', utc=True)
+        frame['suspended'] = numeric['suspended']
+        return frame
@@ -0,0 +1,35 @@
+from draft_kings_client.models.odds_model import OddsModel
+
+
+class OddsChange:
+    '''An OddsModel row tagged with how it differs from the previous harvest cycle.'''
+    NEW = 'NEW'
+    CHANGED = 'CHANGED'
+    REMOVED = 'REMOVED'
+    SNAPSHOT = 'SNAPSHOT'
+
+    __slots__ = ('_change', '_odds')
+
+    def __init__(self, change, odds):
+        self._change = change
+        self._odds = odds
+
+    @property
+    def change(self):
+        return self._change
+
+    @property
+    def odds(self):
+        return self._odds
+
+    def to_dict(self):
+        row = self.odds.to_dict()
+        row['change'] = self.change
+        return row
+
+    def to_tuple(self):
+        return self.odds.to_tuple() + (self.change,)
+
+    @staticmethod
+    def get_fieldnames():
+        return OddsModel.get_fieldnames() + ['change']
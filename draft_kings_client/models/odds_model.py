@@ -1,4 +1,8 @@
 class OddsModel:
+    # Slots keep a day of rows in memory without a per-instance __dict__
+    __slots__ = ('_sportsbook', '_sport', '_league_info', '_game_date', '_game_time', '_game_participants', '_market',
+                 '_bet_selection_name', '_price', '_time_retrieved', '_suspended', '_line')
+
     def __init__(self, sportsbook, sport, league_info, game_date, game_time, game_participants, market, bet_selection_name, price, time_retrieved, suspended, line):
         self._sportsbook = sportsbook
         self._sport = sport
@@ -77,6 +81,17 @@ class OddsModel:
             'line': self.line
         }
 
+    def to_tuple(self):
+        return (self._sportsbook, self._sport, self._league_info, self._game_date, self._game_time,
+                self._game_participants, self._market, self._bet_selection_name, self._price, self._time_retrieved,
+                self._suspended, self._line)
+
+    def replace(self, **changes):
+        '''Return a copy of this row with the given fields replaced.'''
+        values = self.to_dict()
+        values.update(changes)
+        return OddsModel(**values)
+
     @staticmethod
     def get_fieldnames():
         return [
@@ -0,0 +1,180 @@
+import math
+import threading
+import time
+from collections import deque, namedtuple
+from datetime import datetime
+
+from draft_kings_client.delta import DeltaTracker
+from draft_kings_client.pricing import american_implied_probability, parse_american_price
+
+# One observed price for a selection; price is parsed American odds (None when malformed)
+PricePoint = namedtuple('PricePoint', ('timestamp', 'price', 'suspended'))
+
+# A selection's change over a window; move is the change in implied probability, positive when the price shortened
+LineMove = namedtuple('LineMove', ('game', 'market', 'selection', 'line', 'start_price', 'current_price', 'move',
+                                   'odds'))
+
+
+def _parse_timestamp(value):
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _is_suspended(value):
+    return value is True or str(value).lower() == 'true'
+
+
+class OddsBook:
+    '''Live view of the latest row per game -> market -> (selection, line), updated in place every harvest cycle.
+
+    Selections are keyed like DeltaTracker's, so a main and an alternate line with the same label stay apart.
+    Each selection also keeps a ring buffer of its last `history` price points, oldest evicted first.
+    A point is only recorded when the price or suspension changes, so the buffer spans as much time as
+    possible. Updates and queries take one lock, so the book can be read from other threads while the
+    harvester writes.
+    '''
+    DEFAULT_HISTORY = 64
+
+    def __init__(self, history=DEFAULT_HISTORY, clock=time.time):
+        if history < 1:
+            raise ValueError('history must be at least 1')
+
+        self._history_size = history
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._games = {}
+        self._history = {}
+        self._last_seen = {}
+        self._updated_at = None
+
+    @property
+    def history_size(self):
+        return self._history_size
+
+    @property
+    def updated_at(self):
+        return self._updated_at
+
+    selection_key = staticmethod(DeltaTracker.selection_key)
+
+    def update(self, rows):
+        '''Apply a harvest cycle's rows (OddsModel or OddsBatch) and return how many selections are new or moved.'''
+        timestamps = {}
+        prices = {}
+        moved = 0
+
+        with self._lock:
+            for row in rows:
+                # Retrieval times and prices repeat heavily within a cycle, so each distinct string is parsed once
+                time_retrieved = row.time_retrieved
+                timestamp = timestamps.get(time_retrieved)
+                if timestamp is None:
+                    timestamp = timestamps[time_retrieved] = _parse_timestamp(time_retrieved)
+                price = row.price
+                if price not in prices:
+                    prices[price] = parse_american_price(price)
+
+                point = PricePoint(timestamp, prices[price], _is_suspended(row.suspended))
+                key = self.selection_key(row)
+                self._games.setdefault(key[0], {}).setdefault(key[1], {})[key[2:]] = row
+                self._last_seen[key] = timestamp
+
+                points = self._history.get(key)
+                if points is None:
+                    points = self._history[key] = deque(maxlen=self._history_size)
+                elif points[-1].price == point.price and points[-1].suspended == point.suspended:
+                    continue
+                points.append(point)
+                moved += 1
+
+            self._updated_at = self._clock()
+        return moved
+
+    def latest(self, game, market, selection, line='MAIN'):
+        '''The latest row for one selection, or None.'''
+        with self._lock:
+            return self._games.get(game, {}).get(market, {}).get((selection, line))
+
+    def games(self):
+        with self._lock:
+            return list(self._games)
+
+    def markets(self, game):
+        '''{market: {(selection, line): row}} for a game, copied so it can be read without the lock.'''
+        with self._lock:
+            return {market: dict(selections) for market, selections in self._games.get(game, {}).items()}
+
+    def selections(self, game, market):
+        '''{(selection, line): row} for one market.'''
+        with self._lock:
+            return dict(self._games.get(game, {}).get(market, {}))
+
+    def history(self, game, market, selection, line='MAIN'):
+        '''The selection's recorded price points, oldest first.'''
+        with self._lock:
+            return list(self._history.get((game, market, selection, line), ()))
+
+    def biggest_moves(self, minutes=5, limit=10, now=None):
+        '''The selections whose implied probability moved most in the last `minutes`, largest move first.
+
+        A selection's move runs from its price as of the start of the window (or its first point if it
+        appeared since) to its current price. `now` defaults to the book's clock; suspended and
+        unpriced points are skipped.
+        '''
+        cutoff = (self._clock() if now is None else now) - minutes * 60
+        moves = []
+
+        with self._lock:
+            for key, points in self._history.items():
+                if points[-1].timestamp < cutoff:
+                    continue
+
+                priced = [point for point in points if point.price is not None and not point.suspended]
+                if len(priced) < 2 or priced[-1].timestamp < cutoff:
+                    continue
+
+                start = priced[0]
+                for point in priced:
+                    if point.timestamp > cutoff:
+                        break
+                    start = point
+
+                current = priced[-1]
+                if start is current:
+                    continue
+                move = american_implied_probability(current.price) - american_implied_probability(start.price)
+                if move:
+                    game, market, selection, line = key
+                    moves.append(LineMove(game, market, selection, line, start.price, current.price, move,
+                                          self._games[game][market][(selection, line)]))
+
+        moves.sort(key=lambda line_move: abs(line_move.move), reverse=True)
+        return moves[:limit]
+
+    def prune(self, max_age, now=None):
+        '''Drop selections not seen for max_age seconds (e.g. finished games) and return how many were removed.'''
+        cutoff = (self._clock() if now is None else now) - max_age
+        with self._lock:
+            stale = [key for key, timestamp in self._last_seen.items() if not timestamp >= cutoff]
+            for key in stale:
+                del self._history[key]
+                del self._last_seen[key]
+                game, market, selection, line = key
+                markets = self._games[game]
+                del markets[market][(selection, line)]
+                if not markets[market]:
+                    del markets[market]
+                if not markets:
+                    del self._games[game]
+        return len(stale)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._history)
+
+    def __contains__(self, key):
+        '''Whether a (game, market, selection, line) key is in the book.'''
+        with self._lock:
+            return key in self._history
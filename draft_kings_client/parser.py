@@ -0,0 +1,129 @@
+import logging
+from datetime import datetime, timezone
+
+from draft_kings_client.models.odds_model import OddsModel
+
+
+class SelectionInfoParser:
+    '''Splits a selectioninfo payload into one OddsModel row per selection.'''
+
+    def __init__(self, sportsbook='DraftKings', sport='Football', league_info='NFL'):
+        self._sportsbook = sportsbook  # Consider making these top 3 strings enums when expanding
+        self._sport = sport
+        self._league_info = league_info
+
+    @property
+    def sportsbook(self):
+        return self._sportsbook
+
+    @property
+    def sport(self):
+        return self._sport
+
+    @property
+    def league_info(self):
+        return self._league_info
+
+    @staticmethod
+    def is_complete(odds_json):
+        '''True if the payload carries the events, markets and selections needed to build rows.'''
+        return bool(odds_json) and 'events' in odds_json and 'markets' in odds_json and 'selections' in odds_json
+
+    @staticmethod
+    def timestamp():
+        return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-1] + 'Z'
+
+    @staticmethod
+    def _index_by_id(items):
+        return {item['id']: item for item in items if 'id' in item}
+
+    @staticmethod
+    def _resolve(index, items, key):
+        '''Look up a parent record by ID, falling back to the only record when the payload has no IDs.'''
+        item = index.get(key)
+        if item is None:
+            if len(items) == 1:
+                return items[0]
+            raise KeyError(key)
+        return item
+
+    def iter_rows(self, odds_json, line):
+        '''Yield (selection_id, OddsModel) pairs, joining each selection to its market and event.'''
+        events = odds_json['events']
+        markets = odds_json['markets']
+        events_by_id = self._index_by_id(events)
+        markets_by_id = self._index_by_id(markets)
+        time_retrieved = self.timestamp()
+
+        for selection in odds_json['selections']:
+            selection_id = selection.get('id')
+            try:
+                market = self._resolve(markets_by_id, markets, selection.get('marketId'))
+                event = self._resolve(events_by_id, events, market.get('eventId'))
+                row = self._build_row(event, market, selection, line, time_retrieved)
+            except KeyError as e:
+                logging.error(f'Missing data for selection {selection_id}: {e}')
+                continue
+            yield selection_id, row
+
+    def parse(self, odds_json, line):
+        '''Return the OddsModel rows contained in a selectioninfo payload.'''
+        return [row for _, row in self.iter_rows(odds_json, line)]
+
+    def _build_row(self, event, market, selection, line, time_retrieved):
+        game_date, game_time_with_zone = event['startDate'].split('T')
+        game_time = game_time_with_zone.split('.')[0]
+        game_participants = event.get('betSlipLine', 'Unknown Participants')
+        market_name = market.get('betSlipLine', 'Unknown Market')
+        bet_selection_name = selection.get('betSlipLine', 'Unknown Selection')
+        price = selection['displayOdds'].get('american', 'N/A')
+        suspended = market.get('isSuspended', False)
+
+        return OddsModel(self._sportsbook, self._sport, self._league_info, game_date, game_time, game_participants,
+                         market_name, bet_selection_name, price, time_retrieved, suspended, line)
+
+
+class LeagueSnapshotParser(SelectionInfoParser):
+    '''Builds rows straight from a league (sportscontent) payload without per-selection lookups.
+
+    The league payload names fields differently from selectioninfo (name/startEventDate/label instead of
+    betSlipLine/startDate), and its selection labels omit the line for spreads and totals. Selections that
+    can't be rendered faithfully are reported back so the caller can fetch them from selectioninfo.
+    '''
+
+    def iter_snapshot(self, league_json, line):
+        '''Yield (selection_id, OddsModel or None) pairs in payload order; None marks a selection needing a fallback.'''
+        events = league_json.get('events', [])
+        markets = league_json.get('markets', [])
+        events_by_id = self._index_by_id(events)
+        markets_by_id = self._index_by_id(markets)
+        time_retrieved = self.timestamp()
+
+        for selection in league_json.get('selections', []):
+            selection_id = selection.get('id')
+            market = markets_by_id.get(selection.get('marketId'))
+            event = events_by_id.get(market.get('eventId')) if market else None
+
+            row = None
+            if event is not None:
+                row = self._build_snapshot_row(event, market, selection, line, time_retrieved)
+            yield selection_id, row
+
+    def _build_snapshot_row(self, event, market, selection, line, time_retrieved):
+        start_date = event.get('startDate') or event.get('startEventDate')
+        price = selection.get('displayOdds', {}).get('american')
+        bet_selection_name = selection.get('betSlipLine')
+        if bet_selection_name is None and 'points' not in selection:
+            bet_selection_name = selection.get('label')
+
+        if not start_date or price is None or bet_selection_name is None:
+            return None
+
+        game_date, game_time_with_zone = start_date.split('T')
+        game_time = game_time_with_zone.split('.')[0].rstrip('Z')
+        game_participants = event.get('betSlipLine') or event.get('name', 'Unknown Participants')
+        market_name = market.get('betSlipLine') or market.get('name', 'Unknown Market')
+        suspended = market.get('isSuspended', False)
+
+        return OddsModel(self._sportsbook, self._sport, self._league_info, game_date, game_time, game_participants,
+                         market_name, bet_selection_name, price, time_retrieved, suspended, line)
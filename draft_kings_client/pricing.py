@@ -0,0 +1,52 @@
+import math
+
+AMERICAN_EVEN = 100
+MINUS_SIGNS = {'−': '-', '–': '-'}  # DraftKings renders negative odds with a Unicode minus sign
+
+
+def normalize_american_price(price):
+    '''Return the price text with Unicode minus signs replaced by ASCII hyphens.'''
+    text = str(price).strip()
+    for sign, replacement in MINUS_SIGNS.items():
+        text = text.replace(sign, replacement)
+    return text
+
+
+def parse_american_price(price):
+    '''Convert an American odds string such as '-110', '+150' or '−110' to an int, or None if malformed.'''
+    if price is None or isinstance(price, bool):
+        return None
+    if isinstance(price, int):
+        return price if abs(price) >= AMERICAN_EVEN else None
+
+    text = normalize_american_price(price)
+    if text.upper() in ('EVEN', 'EV'):
+        return AMERICAN_EVEN
+
+    try:
+        value = int(text)
+    except ValueError:
+        return None
+
+    # Valid American odds are never inside (-100, +100)
+    return value if abs(value) >= AMERICAN_EVEN else None
+
+
+def american_implied_probability(american):
+    '''The break-even win probability of an American price, e.g. -110 -> 0.5238.'''
+    if american > 0:
+        return AMERICAN_EVEN / (american + AMERICAN_EVEN)
+    return -american / (-american + AMERICAN_EVEN)
+
+
+def parse_point_line(selection_name):
+    '''Split the point line off a selection name: 'Team A -3.5' -> ('Team A', -3.5), 'Team A' -> ('Team A', None).'''
+    label, _, point = normalize_american_price(selection_name).rpartition(' ')
+    try:
+        value = float(point)
+    except ValueError:
+        value = None
+
+    if not label or value is None or not math.isfinite(value):
+        return str(selection_name).strip(), None
+    return label, value
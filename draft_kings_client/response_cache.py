@@ -0,0 +1,98 @@
+import hashlib
+import threading
+
+
+class CacheEntry:
+    def __init__(self, etag, last_modified, body_hash, value):
+        self._etag = etag
+        self._last_modified = last_modified
+        self._body_hash = body_hash
+        self._value = value
+
+    @property
+    def etag(self):
+        return self._etag
+
+    @property
+    def last_modified(self):
+        return self._last_modified
+
+    @property
+    def body_hash(self):
+        return self._body_hash
+
+    @property
+    def value(self):
+        return self._value
+
+
+class ResponseCache:
+    '''Remembers validators and the derived result of the last response per key.
+
+    A 304 or a byte-identical body counts as a hit, letting the caller skip JSON decoding and
+    everything built from it.
+    '''
+    MISS = object()
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._not_modified = 0
+
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def misses(self):
+        return self._misses
+
+    @property
+    def not_modified(self):
+        '''Hits served from a 304 rather than from a matching body hash.'''
+        return self._not_modified
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self._hits, 'misses': self._misses, 'not_modified': self._not_modified}
+
+    @staticmethod
+    def hash_body(content):
+        return hashlib.blake2b(content, digest_size=16).digest()
+
+    def conditional_headers(self, key):
+        '''Request headers that let the server answer 304 if nothing changed since the cached response.'''
+        entry = self._entries.get(key)
+        headers = {}
+        if entry:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def lookup(self, key, response):
+        '''Return the cached value if the response shows nothing changed, otherwise MISS.'''
+        entry = self._entries.get(key)
+        with self._lock:
+            if entry and response.status_code == 304:
+                self._hits += 1
+                self._not_modified += 1
+                return entry.value
+            if entry and response.status_code == 200 and entry.body_hash == self.hash_body(response.content):
+                self._hits += 1
+                return entry.value
+            self._misses += 1
+            return self.MISS
+
+    def store(self, key, response, value):
+        entry = CacheEntry(response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                           self.hash_body(response.content), value)
+        with self._lock:
+            self._entries[key] = entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
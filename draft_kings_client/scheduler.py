@@ -0,0 +1,238 @@
+import logging
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+
+logging.basicConfig(level=logging.INFO)
+
+
+class SystemClock:
+    '''Wall and monotonic time for the scheduler; tests substitute a fake with the same methods.'''
+
+    @staticmethod
+    def monotonic():
+        return time.monotonic()
+
+    @staticmethod
+    def now():
+        return datetime.now(timezone.utc)
+
+    @staticmethod
+    def wait(event, timeout):
+        return event.wait(timeout)
+
+
+class InlineExecutor:
+    '''Runs each feed on the scheduler thread; useful for a single feed or deterministic tests.'''
+
+    @staticmethod
+    def submit(fn, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def shutdown(self, wait=True):
+        pass
+
+
+class ScheduledFeed:
+    def __init__(self, name, func, interval, jitter, overlap, interval_fn):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.jitter = jitter
+        self.overlap = overlap
+        self.interval_fn = interval_fn
+        self.anchor = None
+        self.next_due = None
+        self.last_tick = None
+        self.running = False
+        self.pending = False
+        self.runs = 0
+        self.skipped = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.last_duration = None
+
+    def stats(self):
+        return {'interval': self.interval, 'runs': self.runs, 'skipped': self.skipped, 'coalesced': self.coalesced,
+                'errors': self.errors, 'last_duration': self.last_duration}
+
+
+class HarvestScheduler:
+    '''Runs several harvest feeds side by side on fixed-rate ticks.
+
+    Ticks are anchored to the schedule rather than to when the last run finished, so the period does
+    not drift by the harvest's own duration. If a feed is still running when its tick comes round the
+    tick is skipped, or with overlap=COALESCE folded into a single run as soon as the current one ends.
+    Each feed is called as func(append=True), like continuous_harvest, and may have an interval_fn
+    that picks the next interval from the rows it returned.
+    '''
+    SKIP = 'skip'
+    COALESCE = 'coalesce'
+
+    def __init__(self, clock=None, executor=None, rng=None):
+        self._clock = clock or SystemClock()
+        self._executor = executor
+        self._owns_executor = False
+        self._rng = rng or random.Random()
+        self._feeds = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+
+    @property
+    def feeds(self):
+        return dict(self._feeds)
+
+    def add_feed(self, name, func, interval, jitter=0.0, overlap=SKIP, interval_fn=None):
+        if interval <= 0:
+            raise ValueError('interval must be positive')
+        if overlap not in (self.SKIP, self.COALESCE):
+            raise ValueError(f'Unknown overlap policy: {overlap}')
+
+        self._feeds[name] = ScheduledFeed(name, func, interval, jitter, overlap, interval_fn)
+
+    def stats(self):
+        with self._lock:
+            return {name: feed.stats() for name, feed in self._feeds.items()}
+
+    def stop(self):
+        '''Ask run() to return; runs already in progress are allowed to finish.'''
+        self._stopping = True
+        self._wake.set()
+
+    def run(self):
+        '''Run until stop() is called (or Ctrl+C), then wait for in-flight harvests to finish.'''
+        if not self._feeds:
+            raise ValueError('No feeds registered')
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=len(self._feeds), thread_name_prefix='dk-harvest')
+            self._owns_executor = True
+
+        start = self._clock.monotonic()
+        for feed in self._feeds.values():
+            feed.anchor = start
+            feed.next_due = start
+
+        try:
+            while not self._stopping:
+                self._wake.clear()
+                now = self._clock.monotonic()
+
+                for feed in list(self._feeds.values()):
+                    if not self._stopping and now >= feed.next_due:
+                        self._tick(feed, now)
+
+                if self._stopping:
+                    break
+
+                next_due = min(feed.next_due for feed in self._feeds.values())
+                self._clock.wait(self._wake, max(0.0, next_due - self._clock.monotonic()))
+        except KeyboardInterrupt:
+            logging.info('Harvest interrupted, shutting down.')
+        finally:
+            self._stopping = True
+            if self._owns_executor:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+                self._owns_executor = False
+            logging.info(f'Harvest scheduler stopped: {self.stats()}')
+
+    def _tick(self, feed, now):
+        with self._lock:
+            tick = feed.anchor
+            if now >= feed.anchor:
+                # Advance on the fixed-rate grid, counting any whole intervals that went by unserved
+                missed = int((now - feed.anchor) // feed.interval)
+                feed.anchor += (missed + 1) * feed.interval
+            else:
+                missed = 0  # A coalesced run brought forward; the grid stays where it is
+            feed.next_due = feed.anchor + (self._rng.uniform(0, feed.jitter) if feed.jitter else 0.0)
+
+            if feed.running:
+                if feed.overlap == self.COALESCE:
+                    feed.pending = True
+                    feed.coalesced += missed + 1
+                else:
+                    feed.skipped += missed + 1
+                    logging.warning(f'Skipping tick for {feed.name}: previous harvest still running.')
+                return
+
+            if feed.overlap == self.COALESCE:
+                feed.coalesced += missed
+            else:
+                feed.skipped += missed
+            feed.running = True
+            feed.last_tick = tick
+
+        started = self._clock.monotonic()
+        future = self._executor.submit(feed.func, append=True)
+        future.add_done_callback(lambda done: self._finish(feed, done, started))
+
+    def _finish(self, feed, future, started):
+        rows = None
+        with self._lock:
+            feed.running = False
+            feed.runs += 1
+            feed.last_duration = self._clock.monotonic() - started
+
+            try:
+                rows = future.result()
+            except Exception as e:
+                feed.errors += 1
+                logging.error(f'Harvest for {feed.name} failed: {e}')
+
+            if feed.interval_fn and rows is not None:
+                try:
+                    interval = feed.interval_fn(rows, self._clock.now())
+                except Exception as e:
+                    logging.error(f'Could not compute the next interval for {feed.name}: {e}')
+                else:
+                    if interval != feed.interval:
+                        logging.info(f'Polling {feed.name} every {interval} seconds (was {feed.interval}).')
+                        feed.interval = interval
+                        feed.anchor = feed.last_tick + interval
+                        feed.next_due = feed.anchor
+
+            if feed.pending:
+                feed.pending = False
+                feed.next_due = self._clock.monotonic()
+
+        self._wake.set()
+
+
+def kickoff_interval(tiers=((3600, 5), (6 * 3600, 15), (24 * 3600, 60)), default=300, in_play_window=4 * 3600):
+    '''Build an interval_fn that polls faster as the nearest kickoff in the harvested rows approaches.
+
+    tiers is a sequence of (seconds until kickoff, polling interval) pairs in ascending order. Games
+    that kicked off within in_play_window seconds count as imminent.
+    '''
+    def interval_fn(rows, now):
+        seconds_to_kickoff = None
+        for game_date, game_time in {(row.game_date, row.game_time) for row in rows}:
+            try:
+                kickoff = datetime.fromisoformat(f'{game_date}T{game_time}').replace(tzinfo=timezone.utc)
+            except (TypeError, ValueError):
+                continue
+
+            remaining = (kickoff - now).total_seconds()
+            if remaining < -in_play_window:
+                continue
+            remaining = max(remaining, 0.0)
+            if seconds_to_kickoff is None or remaining < seconds_to_kickoff:
+                seconds_to_kickoff = remaining
+
+        if seconds_to_kickoff is not None:
+            for horizon, interval in tiers:
+                if seconds_to_kickoff <= horizon:
+                    return interval
+        return default
+
+    return interval_fn
@@ -0,0 +1,309 @@
+import logging
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from draft_kings_client.authenticator import AUTH_ENDPOINT_TEMPLATE, Authenticator
+from draft_kings_client.client import DraftKingsOddsClient
+from draft_kings_client.feeds import FeedRegistry, default_feeds, site_state
+from draft_kings_client.models.odds_batch import OddsBatch
+from draft_kings_client.sinks.base import SinkSet
+from draft_kings_client.sinks.csv_sink import BufferedCsvSink
+
+logging.basicConfig(level=logging.INFO)
+
+# Set in each worker process by _init_worker: the shard settings and one client per site
+_worker_config = None
+_worker_clients = {}
+
+
+class ShardResult:
+    '''What a worker sends back for one site's shard: {feed name: OddsBatch} for every feed.
+
+    Rows travel as OddsBatches, whose dictionary-encoded columns pickle to a fraction of the size of
+    the equivalent OddsModel objects. error is set, and batches is empty, when the shard failed.
+    '''
+    __slots__ = ('site', 'batches', 'seconds', 'error')
+
+    def __init__(self, site, batches, seconds, error=None):
+        self.site = site
+        self.batches = batches
+        self.seconds = seconds
+        self.error = error
+
+
+class ShardHealth:
+    '''Running health and throughput of one site's feed.
+
+    A cycle that raised or returned no rows counts as a failure; the shard is unhealthy once
+    max_failures cycles in a row have failed.
+    '''
+
+    def __init__(self, site, feed, max_failures=3):
+        self._site = site
+        self._feed = feed
+        self._max_failures = max_failures
+        self._cycles = 0
+        self._failures = 0
+        self._consecutive_failures = 0
+        self._rows = 0
+        self._seconds = 0.0
+        self._last_rows = 0
+        self._last_seconds = None
+        self._last_error = None
+        self._last_success = None
+
+    @property
+    def site(self):
+        return self._site
+
+    @property
+    def feed(self):
+        return self._feed
+
+    @property
+    def cycles(self):
+        return self._cycles
+
+    @property
+    def failures(self):
+        return self._failures
+
+    @property
+    def consecutive_failures(self):
+        return self._consecutive_failures
+
+    @property
+    def rows(self):
+        return self._rows
+
+    @property
+    def last_rows(self):
+        return self._last_rows
+
+    @property
+    def last_seconds(self):
+        return self._last_seconds
+
+    @property
+    def last_error(self):
+        return self._last_error
+
+    @property
+    def last_success(self):
+        '''Wall-clock time of the last cycle that returned rows, or None.'''
+        return self._last_success
+
+    @property
+    def healthy(self):
+        return self._consecutive_failures < self._max_failures
+
+    @property
+    def rows_per_second(self):
+        '''Rows per second of worker time over every cycle so far.'''
+        return self._rows / self._seconds if self._seconds else 0.0
+
+    def record(self, rows, seconds, error=None):
+        self._cycles += 1
+        self._seconds += seconds
+        self._last_seconds = seconds
+        self._last_rows = rows
+
+        if error is None and not rows:
+            error = 'no rows returned'
+        if error is None:
+            self._rows += rows
+            self._consecutive_failures = 0
+            self._last_error = None
+            self._last_success = time.time()
+        else:
+            self._failures += 1
+            self._consecutive_failures += 1
+            self._last_error = error
+
+    def to_dict(self):
+        return {'site': self._site, 'feed': self._feed, 'healthy': self.healthy, 'cycles': self._cycles,
+                'failures': self._failures, 'consecutive_failures': self._consecutive_failures, 'rows': self._rows,
+                'last_rows': self._last_rows, 'last_seconds': self._last_seconds,
+                'rows_per_second': self.rows_per_second, 'last_error': self._last_error}
+
+
+def _init_worker(config):
+    global _worker_config
+    _worker_config = config
+    _worker_clients.clear()
+
+
+def _worker_client(site):
+    '''The worker's client for a site, built on first use with its own authenticator and session.'''
+    client = _worker_clients.get(site)
+    if client is None:
+        config = _worker_config
+        authenticator = Authenticator(config['auth_endpoint'].format(state=site_state(site)),
+                                      headers=config['auth_headers'])
+        feeds = FeedRegistry(config['feeds'])
+        client = DraftKingsOddsClient(authenticator=authenticator, feeds=feeds, site=site, **config['client_options'])
+        if config['base_url']:
+            client.BASE_URL = config['base_url']
+        _worker_clients[site] = client
+    return client
+
+
+def _harvest_shard(site):
+    start = time.perf_counter()
+    try:
+        # One collect over every feed, so selections the feeds share are fetched once per site
+        results = _worker_client(site).collect()
+        # Every state writes into the same outputs, so each row names the state book it came from
+        sportsbook = f'DraftKings {site_state(site).upper()}'
+        batches = {feed_name: OddsBatch.from_rows(row.replace(sportsbook=sportsbook) for row in rows)
+                   for feed_name, rows in results.items()}
+        return ShardResult(site, batches, time.perf_counter() - start)
+    except Exception as e:
+        logging.error(f'Shard {site} failed: {e}')
+        return ShardResult(site, {}, time.perf_counter() - start, f'{type(e).__name__}: {e}')
+
+
+class ShardedHarvester:
+    '''Harvests every site across a pool of worker processes and writes the rows through one SinkSet.
+
+    Each site is one shard: its feeds are collected together, so selections listed by several feeds are
+    fetched once per site as in DraftKingsOddsClient.harvest. Each worker process keeps one
+    DraftKingsOddsClient per site, with its own Authenticator (fetching tokens from that state's
+    gaming-us-<state> endpoint) and HTTP session. client_options are passed to those clients and must be
+    picklable. Rows from every site go to the feed's output, with sportsbook set to e.g. 'DraftKings PA'.
+    Health is tracked per (site, feed).
+
+    auth_endpoint is a template with a {state} placeholder; auth_headers skips token requests entirely.
+    base_url points the workers at another host, e.g. a local stand-in server.
+    '''
+
+    def __init__(self, sites, feeds=None, processes=None, client_options=None, sink_factory=None,
+                 auth_endpoint=AUTH_ENDPOINT_TEMPLATE, auth_headers=None, base_url=None, max_failures=3,
+                 mp_context=None):
+        if not sites:
+            raise ValueError('At least one site is required')
+
+        self._sites = list(dict.fromkeys(sites))
+        for site in self._sites:
+            site_state(site)
+        self._feeds = feeds if feeds is not None else default_feeds()
+        self._processes = processes
+        self._config = {'feeds': list(self._feeds), 'client_options': dict(client_options or {}),
+                        'auth_endpoint': auth_endpoint, 'auth_headers': auth_headers, 'base_url': base_url}
+        self._sinks = SinkSet(sink_factory or BufferedCsvSink)
+        self._mp_context = mp_context
+        self._executor = None
+        self._health = {(site, feed.name): ShardHealth(site, feed.name, max_failures)
+                        for site in self._sites for feed in self._feeds}
+        self._stop = threading.Event()
+
+    @property
+    def sites(self):
+        return list(self._sites)
+
+    @property
+    def shards(self):
+        '''Every (site, feed name) pair reported on, in site order.'''
+        return list(self._health)
+
+    @property
+    def sinks(self):
+        return self._sinks
+
+    def health(self):
+        '''{(site, feed name): ShardHealth}.'''
+        return dict(self._health)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        '''Shut down the worker processes and flush and close the sinks.'''
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._sinks.close()
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._processes, mp_context=self._mp_context,
+                                                 initializer=_init_worker, initargs=(self._config,))
+        return self._executor
+
+    def harvest(self):
+        '''Run one cycle over every shard, writing the rows as they arrive. Returns {(site, feed name): rows}.
+
+        The sinks are flushed at the end of the cycle.
+        '''
+        start = time.perf_counter()
+        executor = self._get_executor()
+        futures = {executor.submit(_harvest_shard, site): site for site in self._sites}
+        filenames = {feed.name: feed.filename for feed in self._feeds}
+        results = {}
+        broken = False
+
+        for future in as_completed(futures):
+            site = futures[future]
+            try:
+                result = future.result()
+            except BrokenProcessPool as e:
+                broken = True
+                result = ShardResult(site, {}, 0.0, f'{type(e).__name__}: {e}')
+
+            for feed in filenames:
+                rows = result.batches.get(feed, [])
+                # The feeds were harvested together, so each is charged the site's whole cycle time
+                self._health[(site, feed)].record(len(rows), result.seconds, result.error)
+                results[(site, feed)] = rows
+                if rows:
+                    self._sinks.write(filenames[feed], rows, append=True)
+        self._sinks.flush()
+
+        if broken:
+            # A worker died; start a fresh pool next cycle rather than failing every shard from now on
+            logging.error('A harvest worker process died; restarting the pool.')
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+        elapsed = time.perf_counter() - start
+        total = sum(len(rows) for rows in results.values())
+        unhealthy = [f'{site}/{feed}' for (site, feed), health in self._health.items() if not health.healthy]
+        logging.info(f'Sharded cycle: {total} rows from {len(self._sites)} sites in {elapsed:.2f}s '
+                     f'({total / elapsed if elapsed else 0:,.0f} rows/s)'
+                     + (f'; unhealthy: {", ".join(unhealthy)}' if unhealthy else ''))
+        return results
+
+    def run(self, seconds=10, cycles=None):
+        '''Harvest every `seconds` at a fixed rate until stop() is called or `cycles` cycles have run.'''
+        self._stop.clear()
+        next_run = time.monotonic()
+        completed = 0
+
+        while not self._stop.is_set() and (cycles is None or completed < cycles):
+            self.harvest()
+            completed += 1
+
+            next_run += seconds
+            delay = next_run - time.monotonic()
+            if delay < 0:
+                # Overran the interval; start again immediately rather than bursting to catch up
+                next_run = time.monotonic()
+                delay = 0
+            if cycles is None or completed < cycles:
+                self._stop.wait(delay)
+
+    def stop(self):
+        self._stop.set()
+
+    def report(self):
+        '''Log one line per shard with its health and throughput.'''
+        for health in self._health.values():
+            status = 'ok' if health.healthy else 'UNHEALTHY'
+            logging.info(f'{health.site}/{health.feed}: {status}, {health.cycles} cycles, {health.failures} failed, '
+                         f'{health.rows} rows at {health.rows_per_second:,.0f} rows/s'
+                         + (f', last error: {health.last_error}' if health.last_error else ''))
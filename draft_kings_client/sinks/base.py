@@ -0,0 +1,80 @@
+import logging
+import threading
+
+logging.basicConfig(level=logging.INFO)
+
+
+class OddsSink:
+    '''Destination for harvested rows. Subclasses implement write and may buffer until flush.'''
+
+    def write(self, rows):
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class SinkSet:
+    '''Keeps one long-lived sink per output name, built on first use by sink_factory(name, append).
+
+    The set itself is safe to share between the threads a scheduler runs feeds on; each sink is only
+    written by the feed that owns its output.
+    '''
+
+    def __init__(self, sink_factory):
+        self._sink_factory = sink_factory
+        self._sinks = {}
+        self._lock = threading.Lock()
+
+    @property
+    def sink_factory(self):
+        return self._sink_factory
+
+    def get(self, name):
+        with self._lock:
+            return self._sinks.get(name)
+
+    def write(self, name, rows, append=True):
+        '''Write rows to the named sink.
+
+        append=False keeps the one-shot semantics of the original CSV writer: the output is started
+        afresh and flushed before returning. Appending writes are left to the sink's own buffering.
+        '''
+        if not rows:
+            logging.info('No data to write to file.')
+            return
+
+        with self._lock:
+            sink = self._sinks.get(name)
+            if sink is None or not append:
+                if sink is not None:
+                    # Finished before the replacement opens, so its buffered rows never land after the restart
+                    sink.close()
+                sink = self._sinks[name] = self._sink_factory(name, append)
+
+        sink.write(rows)
+        if not append:
+            sink.flush()
+
+    def flush(self, *names):
+        '''Flush the named sinks, or every sink when no names are given.'''
+        with self._lock:
+            sinks = [sink for name, sink in self._sinks.items() if not names or name in names]
+        for sink in sinks:
+            sink.flush()
+
+    def close(self):
+        with self._lock:
+            sinks = list(self._sinks.values())
+            self._sinks.clear()
+        for sink in sinks:
+            sink.close()
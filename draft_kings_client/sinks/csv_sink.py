@@ -0,0 +1,138 @@
+import csv
+import gzip
+import logging
+import os
+import time
+from datetime import datetime, timezone
+
+from draft_kings_client.sinks.base import OddsSink
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logging.basicConfig(level=logging.INFO)
+
+
+class BufferedCsvSink(OddsSink):
+    '''Long-lived CSV writer that buffers row tuples and flushes on size or age.
+
+    The clients also flush their sinks at the end of every harvest cycle, so rows are only held in
+    memory within a cycle.
+
+    The file is opened once and kept open between flushes. Rotation moves the active file aside
+    (name.<UTC timestamp>.csv) once it passes rotate_bytes or the UTC date changes. Compression
+    may be 'gzip' or 'zstd'; each reopen appends a new compressed member/frame.
+    '''
+    DEFAULT_FLUSH_ROWS = 5000
+    DEFAULT_FLUSH_INTERVAL = 30.0
+    COMPRESSION_SUFFIXES = {None: '', 'gzip': '.gz', 'zstd': '.zst'}
+
+    def __init__(self, filename, append=True, flush_rows=DEFAULT_FLUSH_ROWS, flush_interval=DEFAULT_FLUSH_INTERVAL,
+                 rotate_bytes=None, rotate_daily=False, compression=None, clock=time.monotonic):
+        if compression not in self.COMPRESSION_SUFFIXES:
+            raise ValueError(f'Unsupported compression: {compression}')
+        if compression == 'zstd' and zstandard is None:
+            raise ImportError('zstd compression requires the zstandard package')
+
+        self._filename = filename
+        self._append = append
+        self._flush_rows = flush_rows
+        self._flush_interval = flush_interval
+        self._rotate_bytes = rotate_bytes
+        self._rotate_daily = rotate_daily
+        self._compression = compression
+        self._clock = clock
+
+        self._fieldnames = None
+        self._buffer = []
+        self._file = None
+        self._writer = None
+        self._opened_on = None
+        self._last_flush = clock()
+        self._rows_written = 0
+
+    @property
+    def path(self):
+        return self._filename + self.COMPRESSION_SUFFIXES[self._compression]
+
+    @property
+    def rows_written(self):
+        return self._rows_written
+
+    @property
+    def buffered_rows(self):
+        return len(self._buffer)
+
+    def write(self, rows):
+        if not rows:
+            return
+        if self._fieldnames is None:
+            self._fieldnames = type(rows[0]).get_fieldnames()
+
+        self._buffer.extend(row.to_tuple() for row in rows)
+
+        if len(self._buffer) >= self._flush_rows or self._clock() - self._last_flush >= self._flush_interval:
+            self.flush()
+
+    def flush(self):
+        self._last_flush = self._clock()
+        if not self._buffer:
+            return
+
+        try:
+            if self._file is not None and self._rotation_due():
+                self._rotate()
+            if self._file is None:
+                self._open()
+
+            self._writer.writerows(self._buffer)
+            self._file.flush()
+            self._rows_written += len(self._buffer)
+            logging.info(f'Flushed {len(self._buffer)} rows to {self.path}')
+            self._buffer.clear()
+        except IOError as e:
+            logging.error(f'Failed to write data to file: {e}')
+
+    def close(self):
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._writer = None
+
+    def _open(self):
+        path = self.path
+        mode = 'a' if self._append else 'w'
+        needs_header = mode == 'w' or not os.path.isfile(path) or os.path.getsize(path) == 0
+
+        if self._compression == 'gzip':
+            self._file = gzip.open(path, mode + 't', newline='', encoding='utf-8')
+        elif self._compression == 'zstd':
+            self._file = zstandard.open(path, mode + 't', newline='', encoding='utf-8')
+        else:
+            self._file = open(path, mode=mode, newline='', encoding='utf-8-sig')
+
+        self._writer = csv.writer(self._file)
+        if needs_header:
+            self._writer.writerow(self._fieldnames)
+
+        self._opened_on = datetime.now(timezone.utc).date()
+        self._append = True  # A reopen after rotation or close must never truncate
+
+    def _rotation_due(self):
+        if self._rotate_daily and datetime.now(timezone.utc).date() != self._opened_on:
+            return True
+        return bool(self._rotate_bytes) and os.path.getsize(self.path) >= self._rotate_bytes
+
+    def _rotate(self):
+        self._file.close()
+        self._file = None
+        self._writer = None
+
+        root, extension = os.path.splitext(self._filename)
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%f')
+        rotated = f'{root}.{stamp}{extension}{self.COMPRESSION_SUFFIXES[self._compression]}'
+        os.replace(self.path, rotated)
+        logging.info(f'Rotated {self.path} to {rotated}')
@@ -0,0 +1,196 @@
+import glob
+import logging
+import os
+from datetime import date, datetime, time, timezone
+from time import monotonic
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from draft_kings_client.pricing import parse_american_price
+from draft_kings_client.sinks.base import OddsSink
+
+logging.basicConfig(level=logging.INFO)
+
+# Low-cardinality strings repeat on every row, so they are stored dictionary-encoded
+_DICTIONARY_STRING = pa.dictionary(pa.int32(), pa.string())
+
+COLUMN_TYPES = {
+    'sportsbook': _DICTIONARY_STRING,
+    'sport': _DICTIONARY_STRING,
+    'league_info': _DICTIONARY_STRING,
+    'game_date': pa.date32(),
+    'game_time': pa.time32('s'),
+    'game_participants': _DICTIONARY_STRING,
+    'market': _DICTIONARY_STRING,
+    'bet_selection_name': pa.string(),
+    'price': pa.int32(),
+    'time_retrieved': pa.timestamp('us', tz='UTC'),
+    'suspended': pa.bool_(),
+    'line': _DICTIONARY_STRING,
+    'change': _DICTIONARY_STRING,
+}
+
+
+def _parse_date(value):
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_time(value):
+    try:
+        return time.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_timestamp(value):
+    try:
+        return datetime.fromisoformat(value).astimezone(timezone.utc)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_bool(value):
+    if isinstance(value, str):
+        return value.strip().lower() == 'true'
+    return bool(value)
+
+
+_CONVERTERS = {
+    'game_date': _parse_date,
+    'game_time': _parse_time,
+    'price': parse_american_price,
+    'time_retrieved': _parse_timestamp,
+    'suspended': _parse_bool,
+}
+
+
+def rows_to_table(rows):
+    '''Convert OddsModel (or OddsChange) rows to a typed Arrow table.'''
+    fieldnames = type(rows[0]).get_fieldnames()
+    columns = zip(*(row.to_tuple() for row in rows))
+    arrays = []
+
+    for name, values in zip(fieldnames, columns):
+        converter = _CONVERTERS.get(name)
+        if converter:
+            values = [converter(value) for value in values]
+        arrays.append(pa.array(values, type=COLUMN_TYPES.get(name, pa.string())))
+
+    return pa.Table.from_arrays(arrays, names=fieldnames)
+
+
+class ParquetSink(OddsSink):
+    '''Writes each harvest cycle as one row group of a Parquet dataset directory.
+
+    Rows are buffered until flush(), which the clients call at the end of every cycle, and each flush adds
+    one row group to the session's open part file. A part is only readable once its footer is written, so
+    parts are finished on close() or when they pass rotate_bytes or rotate_interval seconds, whichever comes
+    first; the next flush then starts a new part. Restarting the harvester adds a new part rather than
+    rewriting existing ones. append=False clears the directory's parts first.
+    '''
+    DEFAULT_ROTATE_BYTES = 256 * 1024 * 1024
+    DEFAULT_ROTATE_INTERVAL = 3600.0
+
+    def __init__(self, directory, append=True, compression='zstd', rotate_bytes=DEFAULT_ROTATE_BYTES,
+                 rotate_interval=DEFAULT_ROTATE_INTERVAL, clock=monotonic):
+        self._directory = directory
+        self._append = append
+        self._compression = compression
+        self._rotate_bytes = rotate_bytes
+        self._rotate_interval = rotate_interval
+        self._clock = clock
+        self._buffer = []
+        self._writer = None
+        self._path = None
+        self._opened_at = None
+        self._rows_written = 0
+
+    @classmethod
+    def factory(cls, **options):
+        '''Build a sink_factory that writes <feed file stem>.parquet/ directories.'''
+        def build(filename, append):
+            return cls(os.path.splitext(filename)[0] + '.parquet', append=append, **options)
+        return build
+
+    @property
+    def directory(self):
+        return self._directory
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def rows_written(self):
+        return self._rows_written
+
+    @property
+    def buffered_rows(self):
+        return sum(table.num_rows for table in self._buffer)
+
+    def write(self, rows):
+        if not rows:
+            return
+        self._buffer.append(rows_to_table(rows))
+
+    def flush(self):
+        if not self._buffer:
+            return
+
+        table = pa.concat_tables(self._buffer) if len(self._buffer) > 1 else self._buffer[0]
+        self._buffer = []
+        try:
+            if self._writer is None:
+                self._open(table.schema)
+            self._writer.write_table(table, row_group_size=max(table.num_rows, 1))
+            self._rows_written += table.num_rows
+        except (IOError, pa.ArrowException) as e:
+            logging.error(f'Failed to write data to {self._directory}: {e}')
+            return
+
+        if self._rotation_due():
+            self._finish_part()
+
+    def close(self):
+        self.flush()
+        self._finish_part()
+
+    def _rotation_due(self):
+        if self._rotate_interval is not None and self._clock() - self._opened_at >= self._rotate_interval:
+            return True
+        # Row groups are written through as they are added, so the file size tracks the part's size less its footer
+        return self._rotate_bytes is not None and os.path.getsize(self._path) >= self._rotate_bytes
+
+    def _finish_part(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            logging.info(f'Closed {self._path} after {self._rows_written} rows')
+
+    def _open(self, schema):
+        os.makedirs(self._directory, exist_ok=True)
+        if not self._append:
+            for part in glob.glob(os.path.join(self._directory, 'part-*.parquet')):
+                os.remove(part)
+            # Only the first part replaces the dataset; parts rotated in later add to it
+            self._append = True
+
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%f')
+        self._path = os.path.join(self._directory, f'part-{stamp}.parquet')
+        self._writer = pq.ParquetWriter(self._path, schema, compression=self._compression)
+        self._opened_at = self._clock()
+
+
+def read_odds(directory, games=None, markets=None, columns=None):
+    '''Read a ParquetSink dataset, pushing game and market filters down to the row groups.'''
+    filters = []
+    if games:
+        filters.append(('game_participants', 'in', list(games)))
+    if markets:
+        filters.append(('market', 'in', list(markets)))
+
+    return pq.read_table(directory, columns=columns, filters=filters or None)
@@ -0,0 +1,195 @@
+import logging
+import os
+import sqlite3
+
+from draft_kings_client.models.odds_change import OddsChange
+from draft_kings_client.models.odds_model import OddsModel
+from draft_kings_client.pricing import parse_american_price
+from draft_kings_client.sinks.base import OddsSink
+
+logging.basicConfig(level=logging.INFO)
+
+# A selection is identified by its feed, game, market and name; latest holds one row per selection
+KEY_COLUMNS = ('feed', 'game_participants', 'market', 'bet_selection_name')
+VALUE_COLUMNS = ('sportsbook', 'sport', 'league_info', 'game_date', 'game_time', 'price', 'price_value',
+                 'time_retrieved', 'suspended', 'line')
+LATEST_COLUMNS = KEY_COLUMNS + VALUE_COLUMNS
+HISTORY_COLUMNS = LATEST_COLUMNS + ('change',)
+
+SCHEMA = f'''
+CREATE TABLE IF NOT EXISTS latest (
+    feed TEXT NOT NULL,
+    game_participants TEXT NOT NULL,
+    market TEXT NOT NULL,
+    bet_selection_name TEXT NOT NULL,
+    sportsbook TEXT,
+    sport TEXT,
+    league_info TEXT,
+    game_date TEXT,
+    game_time TEXT,
+    price TEXT,
+    price_value INTEGER,
+    time_retrieved TEXT,
+    suspended INTEGER,
+    line TEXT,
+    PRIMARY KEY ({', '.join(KEY_COLUMNS)})
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS latest_game_market ON latest (game_participants, market);
+
+CREATE TABLE IF NOT EXISTS history (
+    feed TEXT NOT NULL,
+    game_participants TEXT NOT NULL,
+    market TEXT NOT NULL,
+    bet_selection_name TEXT NOT NULL,
+    sportsbook TEXT,
+    sport TEXT,
+    league_info TEXT,
+    game_date TEXT,
+    game_time TEXT,
+    price TEXT,
+    price_value INTEGER,
+    time_retrieved TEXT,
+    suspended INTEGER,
+    line TEXT,
+    change TEXT
+);
+CREATE INDEX IF NOT EXISTS history_game_market_time ON history (game_participants, market, time_retrieved);
+'''
+
+_INSERT_HISTORY = f'INSERT INTO history ({", ".join(HISTORY_COLUMNS)}) VALUES ({", ".join("?" * len(HISTORY_COLUMNS))})'
+_UPSERT_LATEST = (f'INSERT INTO latest ({", ".join(LATEST_COLUMNS)}) VALUES ({", ".join("?" * len(LATEST_COLUMNS))}) '
+                  f'ON CONFLICT ({", ".join(KEY_COLUMNS)}) DO UPDATE SET '
+                  + ', '.join(f'{column} = excluded.{column}' for column in VALUE_COLUMNS))
+_DELETE_LATEST = f'DELETE FROM latest WHERE {" AND ".join(f"{column} = ?" for column in KEY_COLUMNS)}'
+
+
+def connect(path, timeout=30.0):
+    '''Open an odds database in WAL mode, creating the tables and indexes if they don't exist yet.
+
+    WAL lets queries run while a harvest cycle is being written, and synchronous=NORMAL is durable
+    across application crashes in WAL mode while skipping an fsync per transaction.
+    '''
+    connection = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+    connection.row_factory = sqlite3.Row
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.execute('PRAGMA synchronous=NORMAL')
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def _parse_bool(value):
+    if isinstance(value, str):
+        return value.strip().lower() == 'true'
+    return bool(value)
+
+
+def _to_record(feed, odds):
+    return (feed, odds.game_participants, odds.market, odds.bet_selection_name, odds.sportsbook, odds.sport,
+            odds.league_info, odds.game_date, odds.game_time, odds.price, parse_american_price(odds.price),
+            odds.time_retrieved, int(_parse_bool(odds.suspended)), odds.line)
+
+
+class SqliteSink(OddsSink):
+    '''Writes each harvest cycle to a SQLite database as one transaction.
+
+    Every row is appended to the history table and upserted into latest, keyed by feed, game, market
+    and selection name. Delta rows (OddsChange) record their change in history, and REMOVED rows drop
+    the selection from latest. append=False replaces the feed's latest rows with the cycle's rows
+    but never touches history. Several feeds can share one database file.
+    '''
+
+    def __init__(self, path, feed, append=True, timeout=30.0):
+        self._path = path
+        self._feed = feed
+        self._append = append
+        self._timeout = timeout
+        self._connection = None
+        self._rows_written = 0
+
+    @classmethod
+    def factory(cls, path='odds.db', **options):
+        '''Build a sink_factory that writes every feed to one database, named by the feed's file stem.'''
+        def build(filename, append):
+            return cls(path, os.path.splitext(os.path.basename(filename))[0], append=append, **options)
+        return build
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def feed(self):
+        return self._feed
+
+    @property
+    def rows_written(self):
+        return self._rows_written
+
+    def write(self, rows):
+        if not rows:
+            return
+
+        history = []
+        upserts = []
+        removals = []
+        for row in rows:
+            change = row.change if isinstance(row, OddsChange) else None
+            odds = row.odds if isinstance(row, OddsChange) else row
+            record = _to_record(self._feed, odds)
+            history.append(record + (change,))
+            if change == OddsChange.REMOVED:
+                removals.append(record[:len(KEY_COLUMNS)])
+            else:
+                upserts.append(record)
+
+        try:
+            if self._connection is None:
+                self._connection = connect(self._path, self._timeout)
+            with self._connection:
+                if not self._append:
+                    self._connection.execute('DELETE FROM latest WHERE feed = ?', (self._feed,))
+                self._connection.executemany(_INSERT_HISTORY, history)
+                self._connection.executemany(_UPSERT_LATEST, upserts)
+                self._connection.executemany(_DELETE_LATEST, removals)
+            # Only the first write replaces the feed's latest state; the rest of the cycle and later cycles add to it
+            self._append = True
+            self._rows_written += len(rows)
+        except sqlite3.Error as e:
+            logging.error(f'Failed to write data to {self._path}: {e}')
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def _where(filters):
+    clauses = [f'{column} = ?' for column, value in filters if value is not None]
+    values = [value for _, value in filters if value is not None]
+    return (' WHERE ' + ' AND '.join(clauses) if clauses else ''), values
+
+
+def latest_odds(connection, game=None, market=None, feed=None):
+    '''Current rows from latest, optionally narrowed to one game, market and feed.'''
+    where, values = _where([('game_participants', game), ('market', market), ('feed', feed)])
+    return connection.execute(f'SELECT * FROM latest{where} ORDER BY game_participants, market, bet_selection_name',
+                              values).fetchall()
+
+
+def price_history(connection, game, market, selection=None, since=None, until=None, feed=None):
+    '''History rows for a game and market in retrieval order, between since and until (inclusive, ISO strings).'''
+    where, values = _where([('game_participants', game), ('market', market), ('bet_selection_name', selection),
+                            ('feed', feed)])
+    if since is not None:
+        where += ' AND time_retrieved >= ?'
+        values.append(since)
+    if until is not None:
+        where += ' AND time_retrieved <= ?'
+        values.append(until)
+    return connection.execute(f'SELECT * FROM history{where} ORDER BY time_retrieved', values).fetchall()
+
+
+def to_odds_model(record):
+    '''Rebuild an OddsModel from a latest or history row.'''
+    return OddsModel(*(bool(record[name]) if name == 'suspended' else record[name]
+                       for name in OddsModel.get_fieldnames()))
@@ -0,0 +1,40 @@
+import heapq
+import itertools
+from datetime import datetime, timedelta, timezone
+
+
+class FakeClock:
+    '''Deterministic stand-in for SystemClock: waiting jumps time forward instead of sleeping.
+
+    Callbacks registered with call_at run when the clock passes their time, which lets a test act
+    in the middle of a blocking scheduler loop.
+    '''
+
+    def __init__(self, wall_start=datetime(2024, 10, 20, 12, 0, tzinfo=timezone.utc)):
+        self._time = 0.0
+        self._wall_start = wall_start
+        self._callbacks = []
+        self._sequence = itertools.count()
+
+    def monotonic(self):
+        return self._time
+
+    def now(self):
+        return self._wall_start + timedelta(seconds=self._time)
+
+    def advance(self, seconds):
+        self._time += seconds
+
+    def call_at(self, when, callback):
+        heapq.heappush(self._callbacks, (when, next(self._sequence), callback))
+
+    def wait(self, event, timeout):
+        deadline = self._time + timeout
+        while not event.is_set() and self._callbacks and self._callbacks[0][0] <= deadline:
+            when, _, callback = heapq.heappop(self._callbacks)
+            self._time = max(self._time, when)
+            callback()
+
+        if not event.is_set():
+            self._time = deadline
+        return event.is_set()
@@ -0,0 +1,227 @@
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def build_slate(events=16, markets_per_event=3, selections_per_market=2):
+    '''Build a synthetic slate of events, markets and selections linked by ID.'''
+    slate = {'events': [], 'markets': [], 'selections': []}
+    market_names = ['Spread', 'Total', 'Moneyline']
+
+    for event_index in range(events):
+        event_id = f'e{event_index}'
+        slate['events'].append({
+            'id': event_id,
+            'startDate': f'2024-10-{20 + event_index % 7:02d}T{17 + event_index % 6:02d}:00:00.000Z',
+            'betSlipLine': f'Team {event_index * 2} vs Team {event_index * 2 + 1}'
+        })
+
+        for market_index in range(markets_per_event):
+            market_id = f'{event_id}m{market_index}'
+            slate['markets'].append({
+                'id': market_id,
+                'eventId': event_id,
+                'betSlipLine': market_names[market_index % len(market_names)],
+                'isSuspended': False
+            })
+
+            for selection_index in range(selections_per_market):
+                price = -110 + 5 * ((event_index + market_index + selection_index) % 9)
+                slate['selections'].append({
+                    'id': f'{market_id}s{selection_index}',
+                    'marketId': market_id,
+                    'betSlipLine': f'Selection {selection_index} {market_names[market_index % len(market_names)]}',
+                    'displayOdds': {'american': f'{price:+d}'}
+                })
+
+    return slate
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server.mock
+        server.record_request(self.path)
+
+        if server.latency:
+            time.sleep(server.latency)
+
+        fault = server.take_fault(self.path) or server.random_fault(self.path)
+        if fault:
+            if fault.get('delay'):
+                time.sleep(fault['delay'])
+            if fault['kind'] == 'reset':
+                self.close_connection = True  # Hang up without a response, like a dropped connection
+                return
+            if fault['kind'] == 'status':
+                self.send_response(fault['status'])
+                if fault.get('retry_after') is not None:
+                    self.send_header('Retry-After', str(fault['retry_after']))
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+
+        parsed = urlparse(self.path)
+        if parsed.path.endswith('/generateAnonymousEnterpriseJWT'):
+            payload = {'token': server.token}
+        elif parsed.path.endswith('/selectioninfo'):
+            requested = parse_qs(parsed.query).get('selectionIds', [''])[0].split(',')
+            payload = server.selection_info(requested)
+        elif '/leagues/' in parsed.path:
+            payload = server.slate
+        else:
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        etag = f'"{hashlib.md5(body).hexdigest()}"' if server.etags else None
+        if etag and self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        if etag:
+            self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _StandInServer(ThreadingHTTPServer):
+    # Every response closes its connection, so a burst of concurrent requests arrives as a burst of connects;
+    # the default backlog of 5 drops the overflow and the client only retries its SYN a second later
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class MockDraftKingsServer:
+    '''Local stand-in for the DraftKings league and selectioninfo endpoints.'''
+
+    def __init__(self, events=16, markets_per_event=3, selections_per_market=2, latency=0.0, token='mock-token',
+                 etags=False, error_rate=0.0, seed=None):
+        self._slate = build_slate(events, markets_per_event, selections_per_market)
+        self._selections_by_id = {selection['id']: selection for selection in self._slate['selections']}
+        self._markets_by_id = {market['id']: market for market in self._slate['markets']}
+        self._events_by_id = {event['id']: event for event in self._slate['events']}
+        self._latency = latency
+        self._token = token
+        self._etags = etags
+        self._error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._requests = []
+        self._faults = []
+        self._server = None
+        self._thread = None
+
+    @property
+    def slate(self):
+        return self._slate
+
+    @property
+    def latency(self):
+        return self._latency
+
+    @property
+    def etags(self):
+        return self._etags
+
+    @property
+    def token(self):
+        return self._token
+
+    @property
+    def auth_endpoint(self):
+        return f'{self.url}/api/wager/v1/generateAnonymousEnterpriseJWT'
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def requests(self):
+        with self._lock:
+            return list(self._requests)
+
+    def record_request(self, path):
+        with self._lock:
+            self._requests.append(path)
+
+    def inject_fault(self, kind='status', times=1, path=None, status=503, retry_after=None, delay=None):
+        '''Make the next `times` requests whose path contains `path` fail.
+
+        kind is 'status' (answer with `status`, optionally carrying Retry-After), 'reset' (close the connection
+        without answering) or 'stall' (answer normally after `delay` seconds).
+        '''
+        with self._lock:
+            self._faults.append({'kind': kind, 'times': times, 'path': path, 'status': status,
+                                 'retry_after': retry_after, 'delay': delay})
+
+    def random_fault(self, path):
+        '''With probability error_rate, fail a league or selectioninfo request with a 503.'''
+        if not self._error_rate or 'generateAnonymousEnterpriseJWT' in path:
+            return None
+        with self._lock:
+            if self._rng.random() >= self._error_rate:
+                return None
+        return {'kind': 'status', 'status': 503}
+
+    def reprice(self, fraction=0.1):
+        '''Move the price of a random fraction of selections, as a live market would between polls.'''
+        with self._lock:
+            selections = self._slate['selections']
+            for selection in self._rng.sample(selections, int(len(selections) * fraction)):
+                price = int(selection['displayOdds']['american']) + self._rng.choice((-5, 5))
+                if -100 < price < 100:
+                    price = 100 if price > 0 else -105
+                selection['displayOdds'] = {'american': f'{price:+d}'}
+
+    def take_fault(self, path):
+        with self._lock:
+            for fault in self._faults:
+                if fault['times'] > 0 and (fault['path'] is None or fault['path'] in path):
+                    fault['times'] -= 1
+                    return fault
+        return None
+
+    def selection_info(self, selection_ids):
+        selections = [self._selections_by_id[sid] for sid in selection_ids if sid in self._selections_by_id]
+        markets = {selection['marketId']: self._markets_by_id[selection['marketId']] for selection in selections}
+        events = {market['eventId']: self._events_by_id[market['eventId']] for market in markets.values()}
+        return {'events': list(events.values()), 'markets': list(markets.values()), 'selections': selections}
+
+    def point_client(self, client):
+        '''Redirect a client's endpoints at this server.'''
+        client.BASE_URL = self.url
+        return client
+
+    def start(self):
+        self._server = _StandInServer(('127.0.0.1', 0), _Handler)
+        self._server.mock = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
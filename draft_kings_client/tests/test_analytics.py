@@ -0,0 +1,106 @@
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from draft_kings_client.models.odds_batch import OddsBatch
+from draft_kings_client.models.odds_model import OddsModel
+
+if np:
+    from draft_kings_client.analytics import american_to_decimal, decimal_to_american, parse_prices, point_line, price_harvest
+
+
+def make_row(game, market, selection, price, suspended=False, line='MAIN'):
+    return OddsModel('DraftKings', 'Football', 'NFL', '2024-10-20', '18:00:00', game, market, selection, price,
+                     '2024-10-20T17:30:00.00000Z', suspended, line)
+
+
+@unittest.skipUnless(np, 'numpy is not installed')
+class TestAnalytics(unittest.TestCase):
+
+    def setUp(self):
+        self.rows = [
+            make_row('A vs B', 'Spread', 'A -3.5', '−110'),
+            make_row('A vs B', 'Spread', 'B +3.5', '-110'),
+            make_row('A vs B', 'Moneyline', 'A', '-200'),
+            make_row('A vs B', 'Moneyline', 'B', '+170'),
+            make_row('C vs D', 'Total', 'Over', 'N/A'),
+            make_row('C vs D', 'Total', 'Under', '-110'),
+            make_row('C vs D', 'Spread', 'C -1.5', '+100', suspended=True),
+            make_row('C vs D', 'Spread', 'D +1.5', '-120'),
+        ]
+
+    def test_conversions(self):
+        np.testing.assert_allclose(american_to_decimal([-110, 150, 100]), [1.0 + 100 / 110, 2.5, 2.0])
+        np.testing.assert_allclose(decimal_to_american([2.5, 1.5]), [150.0, -200.0])
+        prices = parse_prices(['-110', '−110', 'N/A', '+150'])
+        np.testing.assert_array_equal(prices[[0, 1, 3]], [-110.0, -110.0, 150.0])
+        self.assertTrue(np.isnan(prices[2]))
+
+    def test_hold_and_no_vig(self):
+        pricing = price_harvest(self.rows)
+        markets = {(market['game_participants'], market['market']): market for market in pricing.markets()}
+
+        self.assertEqual(len(pricing.market_keys), 4)
+        self.assertAlmostEqual(markets[('A vs B', 'Spread')]['hold'], 2 * 110 / 210 - 1)
+        np.testing.assert_allclose(pricing.no_vig_probability[:2], [0.5, 0.5])
+        np.testing.assert_allclose(pricing.fair_american_odds[:2], [100.0, 100.0])
+        self.assertAlmostEqual(float(pricing.no_vig_probability[2] + pricing.no_vig_probability[3]), 1.0)
+
+    def test_malformed_and_suspended_are_excluded(self):
+        pricing = price_harvest(self.rows)
+        markets = {(market['game_participants'], market['market']): market for market in pricing.markets()}
+
+        self.assertTrue(np.isnan(markets[('C vs D', 'Total')]['hold']))
+        self.assertEqual(markets[('C vs D', 'Spread')]['priced_selections'], 1)
+        self.assertTrue(np.isnan(pricing.no_vig_probability[4:]).all())
+
+        with_suspended = price_harvest(self.rows, include_suspended=True)
+        self.assertEqual(int(with_suspended.priced_selections[3]), 2)
+
+    def test_alternate_lines_are_priced_pair_by_pair(self):
+        rows = [
+            make_row('A @ B', 'Spread', 'A -3.5', '-110', line='ALTERNATE'),
+            make_row('A @ B', 'Spread', 'B +3.5', '-110', line='ALTERNATE'),
+            make_row('A @ B', 'Spread', 'A −7.5', '+160', line='ALTERNATE'),
+            make_row('A @ B', 'Spread', 'B +7.5', '-200', line='ALTERNATE'),
+            make_row('A @ B', 'Spread', 'A +3.5', '-300', line='ALTERNATE'),
+            make_row('A @ B', 'Spread', 'B -3.5', '+240', line='ALTERNATE'),
+            make_row('A @ B', 'Total', 'Over 44.5', '-125', line='ALTERNATE'),
+            make_row('A @ B', 'Total', 'Under 44.5', '+105', line='ALTERNATE'),
+            make_row('A @ B', 'Total', 'Over 47.5', '+110', line='ALTERNATE'),
+            make_row('A @ B', 'Total', 'Under 47.5', '-130', line='ALTERNATE'),
+        ]
+        pricing = price_harvest(rows)
+        markets = {(market['market'], market['point']): market for market in pricing.markets()}
+
+        self.assertEqual(list(markets), [('Spread', -3.5), ('Spread', -7.5), ('Spread', 3.5),
+                                         ('Total', 44.5), ('Total', 47.5)])
+        self.assertTrue(all(market['priced_selections'] == 2 for market in markets.values()))
+        self.assertAlmostEqual(markets[('Spread', -7.5)]['hold'], 100 / 260 + 200 / 300 - 1)
+        self.assertAlmostEqual(markets[('Total', 47.5)]['hold'], 100 / 210 + 130 / 230 - 1)
+        for first in range(0, len(rows), 2):
+            self.assertAlmostEqual(float(pricing.no_vig_probability[first] + pricing.no_vig_probability[first + 1]),
+                                   1.0)
+
+    def test_point_line(self):
+        self.assertEqual(point_line('A vs B', 'A -3.5'), -3.5)
+        self.assertEqual(point_line('A vs B', 'B +3.5'), -3.5)
+        self.assertEqual(point_line('A @ B', 'B −3.5'), 3.5)
+        self.assertEqual(point_line('A @ B', 'Under 41'), 41.0)
+        self.assertIsNone(point_line('A @ B', 'A'))
+        self.assertIsNone(point_line('A @ B', 'Selection 0 Spread'))
+
+    def test_batch_matches_rows(self):
+        from_rows = price_harvest(self.rows[2:])
+        from_batch = price_harvest(OddsBatch.from_rows(self.rows)[2:])
+
+        self.assertEqual(from_rows.market_keys, from_batch.market_keys)
+        np.testing.assert_allclose(from_rows.hold, from_batch.hold)
+        np.testing.assert_allclose(from_rows.no_vig_probability, from_batch.no_vig_probability)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+import asyncio
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from draft_kings_client.feeds import NFL_ALTERNATE_TOTALS, FeedRegistry
+from draft_kings_client.tests.mock_server import MockDraftKingsServer
+
+if aiohttp:
+    from draft_kings_client.async_authenticator import AsyncAuthenticator
+    from draft_kings_client.async_client import AsyncDraftKingsOddsClient
+else:
+    AsyncDraftKingsOddsClient = MagicMock()
+
+
+@unittest.skipUnless(aiohttp, 'aiohttp is not installed')
+class TestAsyncDraftKingsOddsClient(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.server = MockDraftKingsServer(events=4).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    async def test_authenticator_single_flight(self):
+        authenticator = AsyncAuthenticator(auth_endpoint=self.server.auth_endpoint)
+
+        tokens = await asyncio.gather(*(authenticator.get_jwt_token() for _ in range(5)))
+        headers = await authenticator.get_headers()
+
+        self.assertEqual(tokens, ['mock-token'] * 5)
+        self.assertEqual(headers['Authorization'], 'Bearer mock-token')
+        auth_requests = [path for path in self.server.requests if 'generateAnonymousEnterpriseJWT' in path]
+        self.assertEqual(len(auth_requests), 1)
+
+    @patch.object(AsyncDraftKingsOddsClient, '_write_rows')
+    async def test_get_football_markets(self, mock_write_rows):
+        authenticator = AsyncAuthenticator(auth_endpoint=self.server.auth_endpoint)
+
+        async with self.server.point_client(AsyncDraftKingsOddsClient(authenticator=authenticator, batch_size=5,
+                                                                      max_connections=4)) as client:
+            rows = await client.get_football_markets()
+
+        self.assertEqual(len(rows), 24)
+        self.assertEqual([row.bet_selection_name for row in rows[:2]],
+                         ['Selection 0 Spread', 'Selection 1 Spread'])
+        self.assertTrue(all(row.line == 'MAIN' for row in rows))
+        selection_info_requests = [path for path in self.server.requests if 'selectioninfo' in path]
+        self.assertEqual(len(selection_info_requests), 5)
+        mock_write_rows.assert_called_once_with(rows, 'odds_dump.csv', False)
+
+    @patch.object(AsyncDraftKingsOddsClient, '_write_rows')
+    async def test_iter_football_markets_streams_in_completion_order(self, mock_write_rows):
+        self.server.inject_fault(kind='stall', path='selectionIds=e0m0s0', delay=0.5)
+        authenticator = AsyncAuthenticator(headers={'Authorization': 'Bearer static'})
+
+        async with self.server.point_client(AsyncDraftKingsOddsClient(authenticator=authenticator)) as client:
+            rows = [row async for row in client.iter_football_markets(micro_batch=10)]
+
+        self.assertEqual(len(rows), 24)
+        self.assertEqual((rows[-1].game_participants, rows[-1].bet_selection_name),
+                         ('Team 0 vs Team 1', 'Selection 0 Spread'))
+        self.assertEqual([call.args[0] for call in mock_write_rows.call_args_list], [rows[:10], rows[10:20], rows[20:]])
+        self.assertEqual([call.args[2] for call in mock_write_rows.call_args_list], [False, True, True])
+
+    async def test_non_json_body_is_logged_not_raised(self):
+        client = AsyncDraftKingsOddsClient(authenticator=AsyncAuthenticator(headers={}))
+
+        with patch.object(client, '_get_json', side_effect=ValueError('Expecting value')), \
+                self.assertLogs(level='ERROR'):
+            self.assertEqual(await client._fetch_selection_ids(), [])
+            self.assertIsNone(await client._fetch_odds_for_selection('s1'))
+            self.assertIsNone(await client._fetch_odds_for_selections(['s1', 's2']))
+        await client.close()
+
+    async def test_feeds_and_site_build_requests_like_the_sync_client(self):
+        authenticator = AsyncAuthenticator(headers={'Authorization': 'Bearer static'})
+        feeds = FeedRegistry([NFL_ALTERNATE_TOTALS])
+        async with self.server.point_client(AsyncDraftKingsOddsClient(authenticator=authenticator, batch_size=5,
+                                                                      feeds=feeds, site='dkuspa',
+                                                                      sink_factory=MagicMock())) as client:
+            rows = await client.harvest_feed('football_alternate_totals')
+
+        self.assertEqual({row.line for row in rows}, {'ALTERNATE'})
+        self.assertEqual(self.server.requests[0], NFL_ALTERNATE_TOTALS.league_path('dkuspa'))
+        self.assertTrue(all(path.startswith('/api/sdinfo/dkuspa/v1/selectioninfo?siteName=dkuspa&')
+                            for path in self.server.requests[1:]))
+
+    async def test_failed_selection_is_skipped(self):
+        authenticator = AsyncAuthenticator(headers={'Authorization': 'Bearer static'})
+        client = self.server.point_client(AsyncDraftKingsOddsClient(authenticator=authenticator))
+        self.server.inject_fault('status', times=10, path='selectioninfo', status=404)
+
+        rows = await client._build_odds_rows(['e0m0s0', 'e0m0s1'], 'MAIN')
+        await client.close()
+
+        self.assertEqual(rows, [])
+
+    async def test_stopping_early_writes_off_the_event_loop(self):
+        authenticator = AsyncAuthenticator(headers={'Authorization': 'Bearer static'})
+        client = self.server.point_client(AsyncDraftKingsOddsClient(authenticator=authenticator))
+        writer_threads = []
+
+        def write_rows(rows, filename, append):
+            writer_threads.append(threading.current_thread())
+
+        with patch.object(client, '_write_rows', side_effect=write_rows), \
+                patch.object(client.sinks, 'flush') as mock_flush:
+            stream = client.iter_football_markets(micro_batch=10)
+            taken = [await anext(stream) for _ in range(3)]
+            await stream.aclose()
+
+        self.assertEqual(len(taken), 3)
+        self.assertEqual(len(writer_threads), 1)
+        self.assertIsNot(writer_threads[0], threading.main_thread())
+        mock_flush.assert_called_once_with('odds_dump.csv')
+        await client.close()
+
+    async def test_continuous_harvest_closes_the_client(self):
+        authenticator = AsyncAuthenticator(headers={'Authorization': 'Bearer static'})
+        client = self.server.point_client(AsyncDraftKingsOddsClient(authenticator=authenticator))
+        harvested = asyncio.Event()
+
+        async def harvest(self, append=False):
+            self._get_session()
+            harvested.set()
+
+        with patch.object(AsyncDraftKingsOddsClient, 'get_football_markets', harvest):
+            task = asyncio.create_task(AsyncDraftKingsOddsClient.continuous_harvest(client.get_football_markets,
+                                                                                    seconds=60))
+            await harvested.wait()
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        self.assertIsNone(client._session)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,27 @@
+import base64
+import json
+import os
+import tempfile
+import threading
+import time
 import unittest
 from unittest.mock import patch, MagicMock
 from draft_kings_client.authenticator import Authenticator
 
+
+def make_jwt(exp):
+    def encode(part):
+        return base64.urlsafe_b64encode(json.dumps(part).encode('utf-8')).rstrip(b'=').decode('ascii')
+    return f'{encode({"alg": "HS256", "typ": "JWT"})}.{encode({"exp": exp})}.signature'
+
+
+def token_response(token):
+    response = MagicMock()
+    response.status_code = 200
+    response.text = json.dumps({'token': token}, separators=(',', ':'))
+    return response
+
+
 class TestAuthenticator(unittest.TestCase):
 
     @patch('draft_kings_client.authenticator.requests.get')
@@ -30,5 +50,127 @@ class TestAuthenticator(unittest.TestCase):
 
         self.assertIsNone(token)
 
+    def test_decode_expiry(self):
+        self.assertEqual(Authenticator._decode_expiry(make_jwt(1700000000)), 1700000000)
+        self.assertIsNone(Authenticator._decode_expiry('mocked_token'))
+        self.assertIsNone(Authenticator._decode_expiry('a.not-base64!.c'))
+
+    @patch('draft_kings_client.authenticator.requests.get')
+    def test_expired_token_is_replaced(self, mock_get):
+        now = [1000.0]
+        first, second = make_jwt(1600), make_jwt(2200)
+        mock_get.side_effect = [token_response(first), token_response(second)]
+
+        authenticator = Authenticator(clock=lambda: now[0])
+        self.assertEqual(authenticator.headers['Authorization'], f'Bearer {first}')
+        self.assertEqual(authenticator.expires_at, 1600)
+
+        now[0] = 1601.0
+        self.assertEqual(authenticator.headers['Authorization'], f'Bearer {second}')
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch('draft_kings_client.authenticator.requests.get')
+    def test_token_is_published_after_its_expiry(self, mock_get):
+        mock_get.return_value = token_response(make_jwt(1600))
+        reading = []
+
+        def clock():
+            # Stand in for a lock-free reader that runs while _set_token is half done
+            if not reading:
+                reading.append(True)
+                authenticator._ensure_fresh()
+                reading.clear()
+            return 1000.0
+
+        authenticator = Authenticator(clock=clock)
+        self.assertEqual(authenticator.headers['Authorization'], f'Bearer {make_jwt(1600)}')
+        self.assertEqual(mock_get.call_count, 1)
+
+    @patch('draft_kings_client.authenticator.requests.get')
+    def test_refreshes_in_background_before_expiry(self, mock_get):
+        now = [1000.0]
+        first, second = make_jwt(1600), make_jwt(2200)
+        release = threading.Event()
+
+        responses = iter([first, second])
+
+        def fetch_token(*args, **kwargs):
+            token = next(responses)
+            if token == second:
+                release.wait(5)
+            return token_response(token)
+
+        mock_get.side_effect = fetch_token
+        authenticator = Authenticator(refresh_margin=120, clock=lambda: now[0])
+        self.assertEqual(authenticator.jwt_token, first)
+
+        # Inside the margin the current token keeps being served while the next one is fetched
+        now[0] = 1500.0
+        self.assertEqual(authenticator.jwt_token, first)
+        self.assertEqual(authenticator.jwt_token, first)
+
+        release.set()
+        authenticator._refresh_thread.join(5)
+        self.assertEqual(authenticator.jwt_token, second)
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch('draft_kings_client.authenticator.requests.get')
+    def test_concurrent_callers_share_one_request(self, mock_get):
+        def slow_token(*args, **kwargs):
+            time.sleep(0.05)
+            return token_response('mocked_token')
+
+        mock_get.side_effect = slow_token
+        authenticator = Authenticator()
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(authenticator.headers)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertTrue(all(headers['Authorization'] == 'Bearer mocked_token' for headers in results))
+
+    @patch('draft_kings_client.authenticator.requests.get')
+    def test_refresh_skips_already_replaced_token(self, mock_get):
+        mock_get.side_effect = [token_response('first'), token_response('second')]
+        authenticator = Authenticator()
+        stale_headers = authenticator.headers
+
+        fresh_headers = authenticator.refresh(stale_headers)
+        self.assertEqual(fresh_headers['Authorization'], 'Bearer second')
+
+        # A second caller holding the same stale headers gets the new token without another request
+        self.assertEqual(authenticator.refresh(stale_headers), fresh_headers)
+        self.assertEqual(mock_get.call_count, 2)
+
+    def test_fixed_headers_are_never_refreshed(self):
+        authenticator = Authenticator(headers={'Authorization': 'Bearer fixed'})
+        self.assertEqual(authenticator.headers, {'Authorization': 'Bearer fixed'})
+        self.assertIsNone(authenticator.refresh())
+
+    @patch('draft_kings_client.authenticator.requests.get')
+    def test_token_cache_skips_auth_on_restart(self, mock_get):
+        token = make_jwt(time.time() + 3600)
+        mock_get.return_value = token_response(token)
+
+        with tempfile.TemporaryDirectory() as directory:
+            cache_path = os.path.join(directory, 'token.json')
+            self.assertEqual(Authenticator(token_cache_path=cache_path).jwt_token, token)
+            self.assertEqual(os.stat(cache_path).st_mode & 0o777, 0o600)
+
+            restarted = Authenticator(token_cache_path=cache_path)
+            self.assertEqual(restarted.headers['Authorization'], f'Bearer {token}')
+            self.assertEqual(mock_get.call_count, 1)
+
+            # A cache written for another endpoint, or holding an expired token, is ignored
+            self.assertIsNone(Authenticator(auth_endpoint='https://example.invalid/jwt',
+                                            token_cache_path=cache_path)._jwt_token)
+            with open(cache_path, 'w', encoding='utf-8') as cache_file:
+                json.dump({'auth_endpoint': restarted.auth_endpoint, 'token': make_jwt(time.time() - 10)}, cache_file)
+            self.assertIsNone(Authenticator(token_cache_path=cache_path)._jwt_token)
+
+
 if __name__ == '__main__':
     unittest.main()
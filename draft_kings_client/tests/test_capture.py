@@ -0,0 +1,140 @@
+import gzip
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+import requests
+
+from draft_kings_client.capture import (CapturedResponse, ReplayAdapter, ReplayTransport, ResponseRecorder,
+                                        iter_archive)
+from draft_kings_client.client import DraftKingsOddsClient
+from draft_kings_client.tests.mock_server import MockDraftKingsServer
+
+
+def comparable(rows):
+    return [row.to_dict() | {'time_retrieved': None} for row in rows]
+
+
+class TestCapture(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.archive = os.path.join(directory.name, 'capture.bin.gz')
+
+        self.authenticator = MagicMock()
+        self.authenticator.headers = {'Authorization': 'Bearer secret-token'}
+
+    def make_client(self, **options):
+        client = DraftKingsOddsClient(authenticator=self.authenticator, batch_size=3, sink_factory=MagicMock(),
+                                      **options)
+        self.addCleanup(client.close)
+        return client
+
+    def record_harvest(self, cycles=1):
+        with MockDraftKingsServer(events=2, markets_per_event=2, selections_per_market=2) as server:
+            with ResponseRecorder(self.archive) as recorder:
+                client = server.point_client(self.make_client(recorder=recorder))
+                harvests = [client.get_football_markets(append=True) for _ in range(cycles)]
+                urls = [f'{server.url}{path}' for path in server.requests]
+        return client, harvests, urls, recorder
+
+    def test_records_every_response_without_credentials(self):
+        _, _, urls, recorder = self.record_harvest()
+
+        records = list(iter_archive(self.archive))
+        self.assertEqual([record.url for record in records], urls)
+        self.assertEqual(recorder.recorded, len(urls))
+        self.assertTrue(all(record.status == 200 and record.body for record in records))
+        self.assertEqual(records[0].headers['Content-Type'], 'application/json')
+
+        with gzip.open(self.archive, 'rb') as archive:
+            self.assertNotIn(b'secret-token', archive.read())
+
+    def test_replay_reproduces_the_harvest_offline(self):
+        recorded_client, harvests, _, _ = self.record_harvest(cycles=2)
+
+        transport = ReplayTransport(self.archive)
+        client = self.make_client(transport=transport)
+        client.BASE_URL = recorded_client.BASE_URL
+
+        for rows in harvests:
+            self.assertEqual(comparable(client.get_football_markets()), comparable(rows))
+        self.assertEqual(transport.adapter.remaining(), 0)
+
+        # Once the capture is used up the client sees a 404, not stale data
+        self.assertEqual(client.get_football_markets(), [])
+        self.assertEqual(transport.adapter.missing, 1)
+
+    def test_sessions_append_to_one_archive(self):
+        for _ in range(2):
+            with ResponseRecorder(self.archive) as recorder:
+                response = requests.Response()
+                response.url = 'https://example.com/a'
+                response.status_code = 200
+                response._content = b'{}'
+                recorder.hook(response)
+
+        self.assertEqual(len(list(iter_archive(self.archive))), 2)
+
+    def test_truncated_archive_stops_at_last_complete_record(self):
+        records = [CapturedResponse(f'https://example.com/{index}', 100.0 + index, 200, {}, b'x' * 100)
+                   for index in range(3)]
+        encoded = b''.join(record.encode() for record in records)
+        with gzip.open(self.archive, 'wb') as archive:
+            archive.write(encoded[:-50])
+
+        with self.assertLogs(level='WARNING'):
+            replayed = list(iter_archive(self.archive))
+        self.assertEqual([record.url for record in replayed], [record.url for record in records[:2]])
+
+    def test_replay_reads_the_archive_lazily(self):
+        read = []
+
+        def records():
+            for url in ('a', 'b', 'a', 'c'):
+                read.append(url)
+                yield CapturedResponse(f'https://example.com/{url}', 100.0, 200, {}, b'{}')
+
+        adapter = ReplayAdapter(records())
+        self.assertEqual(read, ['a'])
+
+        def send(url):
+            return adapter.send(requests.Request('GET', f'https://example.com/{url}').prepare()).status_code
+
+        self.assertEqual(send('a'), 200)
+        self.assertEqual(read, ['a'])
+        # Asking for b reads just up to it; the second a is still unread
+        self.assertEqual(send('b'), 200)
+        self.assertEqual(read, ['a', 'b'])
+        self.assertEqual(send('a'), 200)
+        self.assertEqual(read, ['a', 'b', 'a'])
+
+        self.assertEqual(adapter.remaining(), 1)
+        self.assertEqual(send('c'), 200)
+        self.assertEqual(adapter.replayed, 4)
+
+    def test_recorded_pacing(self):
+        now = [0.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        records = [CapturedResponse('https://example.com/a', timestamp, 200, {}, b'{}')
+                   for timestamp in (100.0, 101.0, 104.0)]
+        adapter = ReplayAdapter(records, pacing=ReplayAdapter.RECORDED, speed=2.0, clock=lambda: now[0], sleep=sleep)
+        request = requests.Request('GET', 'https://example.com/a').prepare()
+
+        for _ in records:
+            self.assertEqual(adapter.send(request).json(), {})
+        self.assertEqual(sleeps, [0.5, 1.5])
+
+        with self.assertLogs(level='WARNING'):
+            self.assertEqual(adapter.send(request).status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,185 @@
+import csv
+import gzip
+import glob
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from draft_kings_client.client import DraftKingsOddsClient
+from draft_kings_client.models.odds_model import OddsModel
+from draft_kings_client.scheduler import HarvestScheduler
+from draft_kings_client.sinks.base import OddsSink, SinkSet
+from draft_kings_client.sinks.csv_sink import BufferedCsvSink
+from draft_kings_client.tests.mock_server import MockDraftKingsServer
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def make_rows(count, price='-110'):
+    return [OddsModel('DraftKings', 'Football', 'NFL', '2024-10-20', '18:00:00', 'Team A vs Team B', 'Spread',
+                      f'Selection {index}', price, '2024-10-20T17:30:00.00000Z', False, 'MAIN')
+            for index in range(count)]
+
+
+def read_csv(path):
+    with open(path, newline='', encoding='utf-8-sig') as file:
+        return list(csv.reader(file))
+
+
+class NullSink(OddsSink):
+    on_flush = None
+
+    def write(self, rows):
+        pass
+
+    def flush(self):
+        if self.on_flush:
+            self.on_flush()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestBufferedCsvSink(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, 'odds_dump.csv')
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_buffers_until_row_threshold(self):
+        sink = BufferedCsvSink(self.path, flush_rows=5, flush_interval=60, clock=FakeClock())
+
+        sink.write(make_rows(3))
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(sink.buffered_rows, 3)
+
+        sink.write(make_rows(3))
+        rows = read_csv(self.path)
+        sink.close()
+
+        self.assertEqual(rows[0], OddsModel.get_fieldnames())
+        self.assertEqual(len(rows), 7)
+        self.assertEqual(rows[1][7:9], ['Selection 0', '-110'])
+        self.assertEqual(rows[1][10], 'False')
+
+    def test_flushes_on_age(self):
+        clock = FakeClock()
+        sink = BufferedCsvSink(self.path, flush_rows=100, flush_interval=30, clock=clock)
+
+        sink.write(make_rows(1))
+        self.assertEqual(sink.rows_written, 0)
+        clock.now = 31
+        sink.write(make_rows(1))
+
+        self.assertEqual(sink.rows_written, 2)
+        sink.close()
+
+    def test_append_keeps_single_header(self):
+        for _ in range(2):
+            with BufferedCsvSink(self.path) as sink:
+                sink.write(make_rows(2))
+
+        rows = read_csv(self.path)
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(sum(row == OddsModel.get_fieldnames() for row in rows), 1)
+
+    def test_overwrite(self):
+        with BufferedCsvSink(self.path) as sink:
+            sink.write(make_rows(4))
+        with BufferedCsvSink(self.path, append=False) as sink:
+            sink.write(make_rows(1))
+
+        self.assertEqual(len(read_csv(self.path)), 2)
+
+    def test_rotates_by_size(self):
+        sink = BufferedCsvSink(self.path, flush_rows=1, rotate_bytes=200)
+
+        for _ in range(3):
+            sink.write(make_rows(2))
+        sink.close()
+
+        rotated = glob.glob(os.path.join(self._tmp.name, 'odds_dump.*.csv'))
+        self.assertEqual(len(rotated), 2)
+        self.assertEqual(sum(len(read_csv(path)) - 1 for path in rotated + [self.path]), 6)
+
+    def test_gzip(self):
+        with BufferedCsvSink(self.path, compression='gzip') as sink:
+            sink.write(make_rows(2))
+        with BufferedCsvSink(self.path, compression='gzip') as sink:
+            sink.write(make_rows(1))
+
+        with gzip.open(self.path + '.gz', 'rt', newline='', encoding='utf-8') as file:
+            rows = list(csv.reader(file))
+        self.assertEqual(len(rows), 4)
+
+    @unittest.skipUnless(zstandard, 'zstandard is not installed')
+    def test_zstd(self):
+        with BufferedCsvSink(self.path, compression='zstd') as sink:
+            sink.write(make_rows(2))
+
+        with zstandard.open(self.path + '.zst', 'rt', newline='', encoding='utf-8') as file:
+            rows = list(csv.reader(file))
+        self.assertEqual(len(rows), 3)
+
+    def test_sink_set_one_shot_write_flushes(self):
+        sinks = SinkSet(BufferedCsvSink)
+
+        sinks.write(self.path, make_rows(2), append=False)
+        self.assertEqual(len(read_csv(self.path)), 3)
+        sinks.write(self.path, make_rows(1), append=True)
+        sinks.close()
+
+        self.assertEqual(len(read_csv(self.path)), 4)
+
+    def test_sink_set_write_during_flush(self):
+        sinks = SinkSet(lambda name, append: NullSink())
+        sinks.write('odds_dump.csv', make_rows(1))
+        # Another feed's thread opens its output while this flush is part way through the set
+        sinks.get('odds_dump.csv').on_flush = lambda: sinks.write('odds_alternate_totals_dump.csv', make_rows(1))
+
+        sinks.flush()
+
+        self.assertIsNotNone(sinks.get('odds_alternate_totals_dump.csv'))
+
+    def test_client_flushes_every_appending_cycle(self):
+        authenticator = MagicMock()
+        authenticator.headers = {'Authorization': 'Bearer token'}
+
+        with MockDraftKingsServer(events=6) as server:
+            client = server.point_client(DraftKingsOddsClient(
+                authenticator=authenticator, sink_factory=lambda filename, append: BufferedCsvSink(self.path, append)))
+            rows = client.get_football_markets(append=True)
+            client.get_football_markets(append=True)
+
+            # Both cycles are on disk without closing the client
+            self.assertEqual(len(read_csv(self.path)), 1 + 2 * len(rows))
+            client.close()
+
+    def test_continuous_harvest_closes_the_client_sinks(self):
+        sink = MagicMock()
+        client = DraftKingsOddsClient(authenticator=MagicMock(), sink_factory=MagicMock(return_value=sink))
+        self.addCleanup(client.close)
+        client.sinks.write('odds_dump.csv', make_rows(1))
+
+        with patch.object(HarvestScheduler, 'run', side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                client.continuous_harvest(client.get_football_markets)
+
+        sink.close.assert_called_once_with()
+        self.assertIsNone(client.sinks.get('odds_dump.csv'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import io
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from draft_kings_client import decoding
+from draft_kings_client.client import DraftKingsOddsClient
+from draft_kings_client.decoding import JsonDecoder, StreamingDecoder, project_league
+from draft_kings_client.tests.mock_server import MockDraftKingsServer, build_slate
+
+
+def noisy_league():
+    '''A slate padded with the kind of fields the real league payload carries but the parsers never read.'''
+    league = build_slate(events=3, markets_per_event=2, selections_per_market=2)
+    for event in league['events']:
+        event.update({'participants': [{'name': 'Team', 'venueRole': 'Home', 'metadata': {'x': 1}}],
+                      'tags': ['SGP', 'Featured'], 'eventStatus': {'state': 'NOT_STARTED'}})
+    for market in league['markets']:
+        market.update({'marketType': {'id': 1, 'name': 'Spread'}, 'tags': ['Cashout']})
+    for index, selection in enumerate(league['selections']):
+        selection['displayOdds'].update({'decimal': '1.91', 'fractional': '10/11'})
+        selection.update({'trueOdds': 1.909, 'outcomeType': 'Home', 'participants': [{'id': 'p', 'type': 'Team'}]})
+        if index % 2:
+            selection['points'] = -3.5
+    league['leagues'] = [{'id': '88808', 'name': 'NFL'}]
+    return league
+
+
+def fake_response(payload):
+    response = MagicMock()
+    response.content = payload if isinstance(payload, bytes) else json.dumps(payload).encode('utf-8')
+    return response
+
+
+class TestDecoders(unittest.TestCase):
+
+    def test_backends_agree(self):
+        league = noisy_league()
+        for backend in JsonDecoder.BACKENDS:
+            if JsonDecoder.available(backend):
+                with self.subTest(backend=backend):
+                    decoder = JsonDecoder(backend)
+                    self.assertEqual(decoder.backend, backend)
+                    self.assertEqual(decoder.decode(fake_response(league)), league)
+
+        with self.assertRaises(ImportError):
+            JsonDecoder('simdjson')
+
+    def test_full_decode_is_not_projected(self):
+        league = noisy_league()
+        self.assertEqual(JsonDecoder().decode_league(fake_response(league)), league)
+
+    def test_default_prefers_a_fast_backend(self):
+        expected = 'orjson' if decoding.orjson else 'ujson' if decoding.ujson else 'json'
+        self.assertEqual(JsonDecoder().backend, expected)
+
+    def test_project_league_keeps_only_parsed_fields(self):
+        projected = project_league(noisy_league())
+
+        self.assertEqual(set(projected), {'events', 'markets', 'selections'})
+        self.assertEqual(set(projected['events'][0]), {'id', 'startDate', 'betSlipLine'})
+        self.assertEqual(projected['selections'][1]['displayOdds'], {'american': projected['selections'][1]
+                                                                     ['displayOdds']['american']})
+        self.assertEqual(projected['selections'][1]['points'], -3.5)
+
+    @unittest.skipUnless(decoding.ijson, 'ijson is not installed')
+    def test_streaming_matches_full_decode(self):
+        league = noisy_league()
+        decoder = StreamingDecoder()
+
+        self.assertTrue(decoder.streaming)
+        self.assertEqual(decoder.decode_league(fake_response(league)), project_league(league))
+        self.assertEqual(decoder.selection_ids(fake_response(league)),
+                         [selection['id'] for selection in league['selections']])
+
+    @unittest.skipUnless(decoding.ijson, 'ijson is not installed')
+    def test_streaming_reads_from_the_connection(self):
+        league = noisy_league()
+        response = requests.Response()
+        response.raw = io.BytesIO(json.dumps(league).encode('utf-8'))
+
+        self.assertEqual(StreamingDecoder().decode_league(response), project_league(league))
+        # The body was never buffered in full
+        self.assertIs(response._content, False)
+
+    @unittest.skipUnless(decoding.ijson, 'ijson is not installed')
+    def test_streaming_reads_the_document_once(self):
+        league = noisy_league()
+        with patch.object(decoding.ijson, 'parse', wraps=decoding.ijson.parse) as parse:
+            StreamingDecoder().decode_league(fake_response(league))
+
+        parse.assert_called_once()
+
+    @unittest.skipUnless(decoding.ijson, 'ijson is not installed')
+    def test_streaming_rejects_malformed_documents(self):
+        with self.assertRaises(ValueError):
+            StreamingDecoder().selection_ids(fake_response(b'{"selections": [{"id": "a"},'))
+        with self.assertRaises(ValueError):
+            StreamingDecoder().decode_league(fake_response(b'{"events": [], "selections": [{"id": "a"},'))
+
+    def test_streaming_falls_back_without_ijson(self):
+        league = noisy_league()
+        with patch.object(decoding, 'ijson', None), self.assertLogs(level='WARNING'):
+            decoder = StreamingDecoder()
+
+            self.assertFalse(decoder.streaming)
+            self.assertEqual(decoder.decode_league(fake_response(league)), league)
+            self.assertEqual(decoder.selection_ids(fake_response(league)),
+                             [selection['id'] for selection in league['selections']])
+
+
+class TestClientDecoding(unittest.TestCase):
+
+    def test_decoders_produce_the_same_rows(self):
+        authenticator = MagicMock()
+        authenticator.headers = {'Authorization': 'Bearer token'}
+
+        with MockDraftKingsServer(events=3) as server:
+            for use_league_snapshot in (False, True):
+                harvests = []
+                league_streams = []
+                for decoder in (None, JsonDecoder(), StreamingDecoder()):
+                    client = server.point_client(DraftKingsOddsClient(
+                        authenticator=authenticator, batch_size=5, use_league_snapshot=use_league_snapshot,
+                        decoder=decoder, sink_factory=MagicMock()))
+                    with client, patch.object(client._session, 'get', wraps=client._session.get) as get:
+                        rows = client.get_football_markets()
+                    league_streams.append(get.call_args_list[0].kwargs.get('stream', False))
+                    harvests.append([row.to_tuple()[:9] for row in rows])
+
+                with self.subTest(use_league_snapshot=use_league_snapshot):
+                    self.assertEqual(len(harvests[0]), 18)
+                    self.assertEqual(league_streams, [False, False, decoding.ijson is not None])
+                    self.assertEqual(harvests[1], harvests[0])
+                    self.assertEqual(harvests[2], harvests[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
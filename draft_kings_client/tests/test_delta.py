@@ -0,0 +1,59 @@
+import unittest
+from draft_kings_client.delta import DeltaTracker
+from draft_kings_client.models.odds_change import OddsChange
+from draft_kings_client.models.odds_model import OddsModel
+
+
+def make_row(selection, price, suspended=False):
+    return OddsModel('DraftKings', 'Football', 'NFL', '2024-10-20', '18:00:00', 'Team A vs Team B', 'Spread',
+                     selection, price, '2024-10-20T17:30:00.00000Z', suspended, 'MAIN')
+
+
+class TestDeltaTracker(unittest.TestCase):
+
+    def test_first_cycle_is_a_snapshot(self):
+        tracker = DeltaTracker(snapshot_every=10)
+
+        changes = tracker.update([make_row('Team A -3.5', '-110'), make_row('Team B +3.5', '-110')])
+
+        self.assertEqual([change.change for change in changes], [OddsChange.SNAPSHOT] * 2)
+
+    def test_reports_new_changed_and_removed(self):
+        tracker = DeltaTracker(snapshot_every=10)
+        tracker.update([make_row('Team A -3.5', '-110'), make_row('Team B +3.5', '-110'), make_row('Over', '-105')])
+
+        changes = tracker.update([
+            make_row('Team A -3.5', '-115'),
+            make_row('Team B +3.5', '-110'),
+            make_row('Under', '-115')
+        ])
+        unchanged = tracker.update([
+            make_row('Team A -3.5', '-115'),
+            make_row('Team B +3.5', '-110', suspended=True),
+            make_row('Under', '-115')
+        ])
+
+        self.assertEqual([(change.change, change.odds.bet_selection_name) for change in changes],
+                         [(OddsChange.CHANGED, 'Team A -3.5'), (OddsChange.NEW, 'Under'),
+                          (OddsChange.REMOVED, 'Over')])
+        self.assertEqual([(change.change, change.odds.bet_selection_name) for change in unchanged],
+                         [(OddsChange.CHANGED, 'Team B +3.5')])
+
+    def test_periodic_snapshot(self):
+        tracker = DeltaTracker(snapshot_every=3)
+        rows = [make_row('Team A -3.5', '-110')]
+
+        emitted = [len(tracker.update(rows)) for _ in range(7)]
+
+        self.assertEqual(emitted, [1, 0, 0, 1, 0, 0, 1])
+
+    def test_change_row_fields(self):
+        change = OddsChange(OddsChange.NEW, make_row('Team A -3.5', '-110'))
+
+        self.assertEqual(OddsChange.get_fieldnames()[-1], 'change')
+        self.assertEqual(change.to_dict()['change'], 'NEW')
+        self.assertEqual(change.to_dict()['price'], '-110')
+
+
+if __name__ == '__main__':
+    unittest.main()
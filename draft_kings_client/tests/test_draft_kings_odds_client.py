@@ -1,7 +1,21 @@
+import os
+import tempfile
+import threading
 import unittest
 from unittest.mock import patch, MagicMock
 from draft_kings_client.client import DraftKingsOddsClient
 from draft_kings_client.models.odds_model import OddsModel
+from draft_kings_client.response_cache import ResponseCache
+from draft_kings_client.sinks.sqlite_sink import SqliteSink, connect, latest_odds
+from draft_kings_client.tests.mock_server import MockDraftKingsServer
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+if pyarrow:
+    from draft_kings_client.sinks.parquet_sink import ParquetSink, read_odds
 
 
 class TestDraftKingsOddsClient(unittest.TestCase):
@@ -61,10 +75,10 @@ class TestDraftKingsOddsClient(unittest.TestCase):
         self.assertIn('markets', odds_data)
         self.assertIn('selections', odds_data)
 
-    @patch.object(DraftKingsOddsClient, '_write_to_file')
+    @patch.object(DraftKingsOddsClient, '_write_rows')
     @patch.object(DraftKingsOddsClient, '_fetch_odds_for_selection')
     @patch.object(DraftKingsOddsClient, '_fetch_selection_ids')
-    def test_get_football_markets(self, mock_fetch_selection_ids, mock_fetch_odds_for_selection, mock_write_to_file):
+    def test_get_football_markets(self, mock_fetch_selection_ids, mock_fetch_odds_for_selection, mock_write_rows):
         # Mock the selection IDs
         mock_fetch_selection_ids.return_value = ['12345', '67890']
 
@@ -109,7 +123,435 @@ class TestDraftKingsOddsClient(unittest.TestCase):
         self.assertEqual(mock_fetch_odds_for_selection.call_count, 2)
         mock_fetch_odds_for_selection.assert_any_call('12345')
         mock_fetch_odds_for_selection.assert_any_call('67890')
-        mock_write_to_file.assert_called_once_with(football_odds_rows)
+        mock_write_rows.assert_called_once_with(football_odds_rows, 'odds_dump.csv', False)
+
+    @patch('draft_kings_client.client.requests.Session.get')
+    def test_batched_selection_info(self, mock_get):
+        # Two events, two markets and three selections returned from one request
+        batch_response = MagicMock()
+        batch_response.status_code = 200
+        batch_response.json.return_value = {
+            'events': [
+                {'id': 'e1', 'startDate': '2024-10-20T18:00:00.000Z', 'betSlipLine': 'Team A vs Team B'},
+                {'id': 'e2', 'startDate': '2024-10-21T00:15:00.000Z', 'betSlipLine': 'Team C vs Team D'}
+            ],
+            'markets': [
+                {'id': 'm1', 'eventId': 'e1', 'betSlipLine': 'Spread', 'isSuspended': False},
+                {'id': 'm2', 'eventId': 'e2', 'betSlipLine': 'Total', 'isSuspended': True}
+            ],
+            'selections': [
+                {'id': '1', 'marketId': 'm1', 'betSlipLine': 'Team A -3.5', 'displayOdds': {'american': '-110'}},
+                {'id': '2', 'marketId': 'm1', 'betSlipLine': 'Team B +3.5', 'displayOdds': {'american': '-105'}},
+                {'id': '3', 'marketId': 'm2', 'betSlipLine': 'Over 44.5', 'displayOdds': {'american': '+100'}}
+            ]
+        }
+        single_response = MagicMock()
+        single_response.status_code = 200
+        single_response.json.return_value = {
+            'events': [{'id': 'e2', 'startDate': '2024-10-21T00:15:00.000Z', 'betSlipLine': 'Team C vs Team D'}],
+            'markets': [{'id': 'm2', 'eventId': 'e2', 'betSlipLine': 'Total', 'isSuspended': True}],
+            'selections': [{'id': '4', 'marketId': 'm2', 'betSlipLine': 'Under 44.5', 'displayOdds': {'american': '-120'}}]
+        }
+        mock_get.side_effect = [batch_response, single_response]
+
+        authenticator = MagicMock()
+        authenticator.headers = {'Authorization': 'Bearer token'}
+        client = DraftKingsOddsClient(authenticator=authenticator, batch_size=3)
+
+        rows = client._build_odds_rows(['1', '2', '3', '4'], 'MAIN')
+
+        self.assertEqual(mock_get.call_count, 2)
+        mock_get.assert_any_call(
+            f"{client.SELECTION_INFO_URL}?siteName=dkusnj&selectionIds=1,2,3",
+            headers=authenticator.headers
+        )
+        mock_get.assert_any_call(
+            f"{client.SELECTION_INFO_URL}?siteName=dkusnj&selectionIds=4",
+            headers=authenticator.headers
+        )
+        self.assertEqual([row.bet_selection_name for row in rows],
+                         ['Team A -3.5', 'Team B +3.5', 'Over 44.5', 'Under 44.5'])
+        self.assertEqual([row.price for row in rows], ['-110', '-105', '+100', '-120'])
+        self.assertEqual(rows[1].game_participants, 'Team A vs Team B')
+        self.assertEqual(rows[2].game_participants, 'Team C vs Team D')
+        self.assertEqual(rows[2].market, 'Total')
+        self.assertEqual(rows[2].game_time, '00:15:00')
+        self.assertTrue(rows[3].suspended)
+
+    def test_invalid_batch_size(self):
+        with self.assertRaises(ValueError):
+            DraftKingsOddsClient(authenticator=MagicMock(), batch_size=0)
+
+    def test_concurrent_matches_serial_order(self):
+        authenticator = MagicMock()
+        authenticator.headers = {'Authorization': 'Bearer token'}
+
+        with MockDraftKingsServer(events=6, latency=0.01) as server:
+            serial_client = server.point_client(DraftKingsOddsClient(authenticator=authenticator))
+            concurrent_client = server.point_client(DraftKingsOddsClient(authenticator=authenticator, max_workers=8))
+            selection_ids = serial_client._fetch_selection_ids()
+
+            serial_rows = serial_client._build_odds_rows(selection_ids, 'MAIN')
+            concurrent_rows = concurrent_client._build_odds_rows(selection_ids, 'MAIN')
+            concurrent_client.close()
+
+        self.assertEqual(len(serial_rows), 36)
+        self.assertEqual([(row.game_participants, row.market, row.bet_selection_name, row.price) for row in serial_rows],
+                         [(row.game_participants, row.market, row.bet_selection_name, row.price)
+                          for row in concurrent_rows])
+
+    @patch.object(DraftKingsOddsClient, '_fetch_odds_for_selection')
+    def test_concurrent_error_isolation(self, mock_fetch_odds_for_selection):
+        odds_response = {
+            'events': [{'startDate': '2024-10-20T18:00:00.000Z', 'betSlipLine': 'Team A vs Team B'}],
+            'markets': [{'betSlipLine': 'Spread'}],
+            'selections': [{'betSlipLine': 'Team A -3.5', 'displayOdds': {'american': '-110'}}]
+        }
+
+        def fetch(selection_id):
+            if selection_id == '2':
+                raise ValueError('malformed payload')
+            return odds_response
+
+        mock_fetch_odds_for_selection.side_effect = fetch
+        client = DraftKingsOddsClient(authenticator=MagicMock(), max_workers=4)
+
+        rows = client._build_odds_rows(['1', '2', '3'], 'MAIN')
+        client.close()
+
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(mock_fetch_odds_for_selection.call_count, 3)
+
+    def test_concurrent_feeds_share_sinks_and_trackers(self):
+        authenticator = MagicMock()
+        authenticator.headers = {'Authorization': 'Bearer token'}
+        errors = []
+
+        with MockDraftKingsServer(events=2, markets_per_event=2, selections_per_market=2) as server:
+            client = server.point_client(DraftKingsOddsClient(authenticator=authenticator, batch_size=8,
+                                                              delta_tracking=True, sink_factory=MagicMock()))
+            feeds = (client.get_football_markets, client.get_football_alternate_spreads,
+                     client.get_football_alternate_totals)
+            barrier = threading.Barrier(len(feeds) + 1)
+
+            def run(func):
+                try:
+                    barrier.wait()
+                    for _ in range(5):
+                        func(append=True)
+                except Exception as e:
+                    errors.append(e)
+
+            def flush():
+                barrier.wait()
+                for _ in range(500):
+                    client.sinks.flush()
+
+            threads = [threading.Thread(target=run, args=(func,)) for func in feeds]
+            threads.append(threading.Thread(target=flush))
+            with client:
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(client._delta_trackers), 3)
+
+    def test_concurrent_feeds_share_one_pool(self):
+        client = DraftKingsOddsClient(authenticator=MagicMock(), max_workers=4)
+        self.addCleanup(client.close)
+        barrier = threading.Barrier(8)
+        executors = []
+
+        def get_executor():
+            barrier.wait()
+            executors.append(client._get_executor())
+
+        threads = [threading.Thread(target=get_executor) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(executors), 8)
+        self.assertEqual(len({id(executor) for executor in executors}), 1)
+
+    @patch.object(DraftKingsOddsClient, '_write_rows')
+    def test_league_snapshot_skips_selection_info(self, mock_write_rows):
+        authenticator = MagicMock()
+        authenticator.headers = {'Authorization': 'Bearer token'}
+
+        with MockDraftKingsServer(events=3) as server:
+            client = server.point_client(DraftKingsOddsClient(authenticator=authenticator, use_league_snapshot=True))
+            rows = client.get_football_markets()
+            requests_made = server.requests
+
+        self.assertEqual(len(rows), 18)
+        self.assertEqual(len(requests_made), 1)
+        self.assertEqual(rows[0].bet_selection_name, 'Selection 0 Spread')
+        mock_write_rows.assert_called_once_with(rows, 'odds_dump.csv', False)
+
+    @patch.object(DraftKingsOddsClient, '_fetch_odds_for_selection')
+    def test_league_snapshot_falls_back_in_payload_order(self, mock_fetch_odds_for_selection):
+        league_json = {
+            'events': [{'id': 'e1', 'name': 'Team A @ Team B', 'startEventDate': '2024-10-20T17:00:00Z'}],
+            'markets': [{'id': 'm1', 'eventId': 'e1', 'name': 'Spread'}],
+            'selections': [
+                {'id': 's1', 'marketId': 'm1', 'label': 'Team A', 'points': -3.5, 'displayOdds': {'american': '-110'}},
+                {'id': 's2', 'marketId': 'm1', 'betSlipLine': 'Team B +3.5', 'displayOdds': {'american': '-110'}}
+            ]
+        }
+        mock_fetch_odds_for_selection.return_value = {
+            'events': [{'id': 'e1', 'startDate': '2024-10-20T17:00:00.000Z', 'betSlipLine': 'Team A @ Team B'}],
+            'markets': [{'id': 'm1', 'eventId': 'e1', 'betSlipLine': 'Spread'}],
+            'selections': [{'id': 's1', 'marketId': 'm1', 'betSlipLine': 'Team A -3.5',
+                            'displayOdds': {'american': '-110'}}]
+        }
+        authenticator = MagicMock()
+        authenticator.headers = {'Authorization': 'Bearer token'}
+
+        with MockDraftKingsServer() as server:
+            server.slate.clear()
+            server.slate.update(league_json)
+            client = server.point_client(DraftKingsOddsClient(authenticator=authenticator, use_league_snapshot=True))
+            snapshot = client._fetch_league(
+                None, 'snapshot:MAIN',
+                lambda payload: client._resolve_snapshot(client._build_snapshot(payload, 'MAIN'), 'MAIN'))
+
+        mock_fetch_odds_for_selection.assert_called_once_with('s1')
+        self.assertEqual([(selection_id, row.bet_selection_name) for selection_id, row in snapshot],
+                         [('s1', 'Team A -3.5'), ('s2', 'Team B +3.5')])
+
+    @patch.object(DraftKingsOddsClient, '_write_rows')
+    def test_delta_tracking_writes_only_changes(self, mock_write_rows):
+        authenticator = MagicMock()
+        authenticator.headers = {'Authorization': 'Bearer token'}
+
+        with MockDraftKingsServer(events=2) as server:
+            client = server.point_client(DraftKingsOddsClient(authenticator=authenticator, use_league_snapshot=True,
+                                                              delta_tracking=True))
+            client.get_football_markets(append=True)
+            server.slate['selections'][0]['displayOdds']['american'] = '+125'
+            rows = client.get_football_markets(append=True)
+
+        self.assertEqual(len(rows), 12)
+        self.assertEqual(mock_write_rows.call_count, 2)
+        snapshot, delta = [call.args[0] for call in mock_write_rows.call_args_list]
+        self.assertEqual(len(snapshot), 12)
+        self.assertEqual([(change.change, change.odds.price) for change in delta], [('CHANGED', '+125')])
+        self.assertEqual(mock_write_rows.call_args.args[1:], ('odds_dump_delta.csv', True))
+
+    @patch.object(DraftKingsOddsClient, '_write_rows')
+    @patch.object(DraftKingsOddsClient, '_build_snapshot', autospec=True,
+                  side_effect=DraftKingsOddsClient._build_snapshot)
+    def test_unchanged_league_payload_is_reused(self, mock_build_snapshot, mock_write_rows):
+        authenticator = MagicMock()
+        authenticator.headers = {'Authorization': 'Bearer token'}
+
+        for etags in (True, False):
+            with self.subTest(etags=etags), MockDraftKingsServer(events=2, etags=etags) as server:
+                mock_build_snapshot.reset_mock()
+                cache = ResponseCache()
+                client = server.point_client(DraftKingsOddsClient(authenticator=authenticator,
+                                                                  use_league_snapshot=True, response_cache=cache))
+
+                first = client.get_football_markets()
+                second = client.get_football_markets()
+
+                self.assertEqual(mock_build_snapshot.call_count, 1)
+                self.assertEqual(cache.stats(), {'hits': 1, 'misses': 1, 'not_modified': 1 if etags else 0})
+                self.assertEqual([row.price for row in first], [row.price for row in second])
+                self.assertIsNot(first[0], second[0])
+
+    @patch('draft_kings_client.client.requests.Session.get')
+    def test_rejected_token_is_refreshed_once(self, mock_get):
+        rejected = MagicMock()
+        rejected.status_code = 401
+        accepted = MagicMock()
+        accepted.status_code = 200
+        accepted.json.return_value = {'selections': [{'id': '12345'}]}
+        mock_get.side_effect = [rejected, accepted]
+
+        authenticator = MagicMock()
+        authenticator.headers = {'Authorization': 'Bearer stale'}
+        authenticator.refresh.return_value = {'Authorization': 'Bearer fresh'}
+
+        client = DraftKingsOddsClient(authenticator=authenticator)
+        self.assertEqual(client._fetch_selection_ids(), ['12345'])
+        authenticator.refresh.assert_called_once_with({'Authorization': 'Bearer stale'})
+        self.assertEqual(mock_get.call_args.kwargs['headers'], {'Authorization': 'Bearer fresh'})
+
+        # A token that is still rejected after re-auth is not retried again
+        mock_get.reset_mock()
+        mock_get.side_effect = [rejected, rejected]
+        self.assertEqual(client._fetch_selection_ids(), [])
+        self.assertEqual(mock_get.call_count, 2)
+
+
+class TestStreamingHarvest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockDraftKingsServer(events=3).start()
+        self.addCleanup(self.server.stop)
+        self.sinks = []
+        self.authenticator = MagicMock()
+        self.authenticator.headers = {'Authorization': 'Bearer token'}
+
+    def make_sink(self, filename, append):
+        sink = MagicMock()
+        self.sinks.append((filename, append, sink))
+        return sink
+
+    def make_client(self, **options):
+        client = DraftKingsOddsClient(authenticator=self.authenticator, sink_factory=self.make_sink, **options)
+        self.addCleanup(client.close)
+        return self.server.point_client(client)
+
+    def written_batches(self):
+        return [len(call.args[0]) for _, _, sink in self.sinks for call in sink.write.call_args_list]
+
+    def test_slow_selection_does_not_hold_up_the_rest(self):
+        self.server.inject_fault(kind='stall', path='selectionIds=e0m0s0', delay=0.5)
+        client = self.make_client(max_workers=4)
+
+        rows = list(client.iter_football_markets())
+
+        self.assertEqual(len(rows), 18)
+        self.assertEqual(rows[-1].bet_selection_name, 'Selection 0 Spread')
+        self.assertEqual(rows[-1].game_participants, 'Team 0 vs Team 1')
+
+    def test_streams_into_sinks_in_micro_batches(self):
+        client = self.make_client(batch_size=4, max_workers=2)
+
+        rows = list(client.iter_football_markets(micro_batch=5))
+
+        self.assertEqual(self.written_batches(), [5, 5, 5, 3])
+        # Only the first micro-batch starts the output afresh; the cycle ends flushed like a one-shot write
+        self.assertEqual([(filename, append) for filename, append, _ in self.sinks], [('odds_dump.csv', False)])
+        self.sinks[0][2].flush.assert_called()
+        ordered = client.get_football_markets()
+        self.assertEqual(sorted(row.bet_selection_name + row.game_participants for row in rows),
+                         sorted(row.bet_selection_name + row.game_participants for row in ordered))
+
+    def test_rows_yielded_before_stopping_are_written(self):
+        client = self.make_client(batch_size=2)
+
+        stream = client.iter_football_markets(micro_batch=5)
+        taken = [next(stream) for _ in range(7)]
+        flushes = self.sinks[0][2].flush.call_count
+        stream.close()
+
+        self.assertEqual(self.written_batches(), [5, 2])
+        self.assertEqual([call.args[0] for call in self.sinks[0][2].write.call_args_list],
+                         [taken[:5], taken[5:]])
+        self.assertEqual(len([path for path in self.server.requests if 'selectioninfo' in path]), 4)
+        # The cycle still ends, so buffered sinks don't sit on the partial rows
+        self.assertEqual(self.sinks[0][2].flush.call_count, flushes + 1)
+
+    def test_stopping_early_skips_the_delta(self):
+        client = self.make_client(delta_tracking=True)
+
+        stream = client.iter_football_markets(micro_batch=5)
+        next(stream)
+        stream.close()
+
+        self.assertEqual(self.sinks, [])
+        self.assertEqual(len(client.get_football_markets()), 18)
+        # The abandoned cycle left no baseline, so the full one reports every row as new
+        self.assertEqual(self.written_batches(), [18])
+
+    def test_league_snapshot_stream(self):
+        client = self.make_client(use_league_snapshot=True)
+
+        streamed = list(client.iter_football_alternate_totals(micro_batch=None))
+
+        self.assertEqual(self.written_batches(), [18])
+        self.assertEqual({row.line for row in streamed}, {'ALTERNATE'})
+        self.assertEqual([row.bet_selection_name for row in streamed],
+                         [row.bet_selection_name for row in client.get_football_alternate_totals()])
+
+    def stream_twice(self, sink_factory):
+        '''Stream a fresh cycle then an appending one in micro-batches through real sinks; returns the first's rows.'''
+        with MockDraftKingsServer(events=6) as server:
+            client = server.point_client(DraftKingsOddsClient(authenticator=self.authenticator,
+                                                              sink_factory=sink_factory))
+            with client:
+                rows = list(client.iter_football_markets(micro_batch=10))
+                list(client.iter_football_markets(append=True, micro_batch=10))
+        return rows
+
+    def test_micro_batches_into_sqlite(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'odds.db')
+
+        rows = self.stream_twice(SqliteSink.factory(path))
+
+        connection = connect(path)
+        self.addCleanup(connection.close)
+        self.assertEqual(len(rows), 36)
+        self.assertEqual(len(latest_odds(connection, feed='odds_dump')), 36)
+        self.assertEqual(connection.execute('SELECT COUNT(*) FROM history').fetchone()[0], 72)
+
+    @unittest.skipUnless(pyarrow, 'pyarrow is not installed')
+    def test_micro_batches_into_parquet(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        dataset = os.path.join(directory.name, 'odds_dump.parquet')
+
+        rows = self.stream_twice(lambda filename, append: ParquetSink(dataset, append))
+
+        self.assertEqual(len(rows), 36)
+        self.assertEqual(read_odds(dataset).num_rows, 72)
+
+    @patch.object(DraftKingsOddsClient, '_fetch_odds_for_selection')
+    def test_snapshot_fallbacks_stream_last(self, mock_fetch_odds_for_selection):
+        league_json = {
+            'events': [{'id': 'e1', 'name': 'Team A @ Team B', 'startEventDate': '2024-10-20T17:00:00Z'}],
+            'markets': [{'id': 'm1', 'eventId': 'e1', 'name': 'Spread'}],
+            'selections': [
+                {'id': 's1', 'marketId': 'm1', 'label': 'Team A', 'points': -3.5, 'displayOdds': {'american': '-110'}},
+                {'id': 's2', 'marketId': 'm1', 'betSlipLine': 'Team B +3.5', 'displayOdds': {'american': '-110'}}
+            ]
+        }
+        mock_fetch_odds_for_selection.return_value = {
+            'events': [{'id': 'e1', 'startDate': '2024-10-20T17:00:00.000Z', 'betSlipLine': 'Team A @ Team B'}],
+            'markets': [{'id': 'm1', 'eventId': 'e1', 'betSlipLine': 'Spread'}],
+            'selections': [{'id': 's1', 'marketId': 'm1', 'betSlipLine': 'Team A -3.5',
+                            'displayOdds': {'american': '-110'}}]
+        }
+        self.server.slate.clear()
+        self.server.slate.update(league_json)
+        client = self.make_client(use_league_snapshot=True, response_cache=ResponseCache())
+
+        streamed = [row.bet_selection_name for row in client.iter_football_markets()]
+        ordered = [row.bet_selection_name for row in client.get_football_markets()]
+
+        self.assertEqual(streamed, ['Team B +3.5', 'Team A -3.5'])
+        self.assertEqual(ordered, ['Team A -3.5', 'Team B +3.5'])
+        # The cached snapshot kept the streamed fallback, so the second cycle needed no lookup
+        mock_fetch_odds_for_selection.assert_called_once_with('s1')
+
+    @patch.object(DraftKingsOddsClient, '_fetch_odds_for_selection', return_value=None)
+    def test_reused_snapshot_is_only_restamped(self, mock_fetch_odds_for_selection):
+        self.server.slate.clear()
+        self.server.slate.update({
+            'events': [{'id': 'e1', 'name': 'Team A @ Team B', 'startEventDate': '2024-10-20T17:00:00Z'}],
+            'markets': [{'id': 'm1', 'eventId': 'e1', 'name': 'Spread'}],
+            'selections': [
+                {'id': 's1', 'marketId': 'm1', 'label': 'Team A', 'points': -3.5, 'displayOdds': {'american': '-110'}},
+                {'id': 's2', 'marketId': 'm1', 'betSlipLine': 'Team B +3.5', 'displayOdds': {'american': '-110'}}
+            ]
+        })
+        client = self.make_client(use_league_snapshot=True, response_cache=ResponseCache())
+
+        for _ in range(3):
+            rows = client.get_football_markets()
+            self.assertEqual([row.bet_selection_name for row in rows], ['Team B +3.5'])
+        # The failed fallback was tried when the snapshot was stored, not again on every reuse
+        mock_fetch_odds_for_selection.assert_called_once_with('s1')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+from unittest.mock import MagicMock
+
+from draft_kings_client.client import DraftKingsOddsClient
+from draft_kings_client.feeds import (NFL_ALTERNATE_SPREADS, NFL_ALTERNATE_TOTALS, NFL_MAIN, FeedConfig, FeedRegistry,
+                                      default_feeds)
+from draft_kings_client.tests.mock_server import MockDraftKingsServer
+
+
+class TestFeedConfig(unittest.TestCase):
+
+    def test_urls_match_the_legacy_constants(self):
+        client = DraftKingsOddsClient(authenticator=MagicMock())
+        self.addCleanup(client.close)
+        self.assertEqual(NFL_MAIN.league_url(), client.SELECTIONS_URL)
+        self.assertEqual(NFL_ALTERNATE_SPREADS.league_url(), client.ALTERNATE_SPREAD_SELECTION_URL)
+        self.assertEqual(NFL_ALTERNATE_TOTALS.league_url(), client.ALTERNATE_TOTAL_SELECTION_URL)
+        self.assertEqual(NFL_MAIN.league_path('dkuspa'), '/api/sportscontent/dkuspa/v1/leagues/88808')
+
+    def test_subcategory_needs_category(self):
+        with self.assertRaises(ValueError):
+            FeedConfig('props', 88808, 'props.csv', subcategory_id=1)
+
+    def test_registry(self):
+        registry = default_feeds()
+        self.assertEqual(registry.names, ['football_markets', 'football_alternate_spreads', 'football_alternate_totals'])
+        self.assertIn('football_markets', registry)
+
+        with self.assertRaises(ValueError):
+            registry.register(NFL_MAIN)
+        with self.assertRaises(KeyError):
+            registry.get('ncaaf')
+
+
+class TestFeedPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockDraftKingsServer(events=2, markets_per_event=2, selections_per_market=2).start()
+        self.addCleanup(self.server.stop)
+
+        self.sinks = {}
+        self.authenticator = MagicMock()
+        self.authenticator.headers = {'Authorization': 'Bearer token'}
+
+    def make_sink(self, filename, append):
+        return self.sinks.setdefault(filename, MagicMock())
+
+    def make_client(self, feeds, **options):
+        client = DraftKingsOddsClient(authenticator=self.authenticator, feeds=feeds, sink_factory=self.make_sink,
+                                      **options)
+        self.addCleanup(client.close)
+        return self.server.point_client(client)
+
+    def selection_ids_requested(self):
+        return [selection_id for path in self.server.requests if 'selectioninfo' in path
+                for selection_id in path.split('selectionIds=')[1].split(',')]
+
+    def test_shared_selections_are_fetched_once(self):
+        # The stand-in serves the same slate for every league path, so all three feeds share every selection
+        client = self.make_client(default_feeds(), batch_size=3)
+
+        results = client.harvest(append=True)
+
+        requested = self.selection_ids_requested()
+        self.assertEqual(len(requested), 8)
+        self.assertEqual(len(set(requested)), 8)
+        self.assertEqual(set(results), {'football_markets', 'football_alternate_spreads', 'football_alternate_totals'})
+        self.assertEqual([row.line for row in results['football_markets']], ['MAIN'] * 8)
+        self.assertEqual([row.line for row in results['football_alternate_totals']], ['ALTERNATE'] * 8)
+        self.assertEqual([row.bet_selection_name for row in results['football_markets']],
+                         [row.bet_selection_name for row in results['football_alternate_spreads']])
+
+        for feed in default_feeds():
+            self.sinks[feed.filename].write.assert_called_once_with(results[feed.name])
+
+    def test_new_league_is_configuration_only(self):
+        ncaaf = FeedConfig('ncaaf', 87637, 'ncaaf_odds.csv', league_info='NCAAF')
+        client = self.make_client(FeedRegistry([ncaaf]), use_league_snapshot=True)
+
+        rows = client.harvest_feed('ncaaf')
+
+        self.assertEqual(len(rows), 8)
+        self.assertEqual({row.league_info for row in rows}, {'NCAAF'})
+        self.assertEqual(self.server.requests, ['/api/sportscontent/dkusnj/v1/leagues/87637'])
+        self.sinks['ncaaf_odds.csv'].write.assert_called_once_with(rows)
+
+    def test_site_selects_league_and_selection_info(self):
+        client = self.make_client(default_feeds(), site='dkuspa', batch_size=8)
+
+        rows = client.get_football_markets()
+
+        self.assertEqual(len(rows), 8)
+        self.assertEqual(self.server.requests[0], '/api/sportscontent/dkuspa/v1/leagues/88808')
+        self.assertTrue(self.server.requests[1].startswith('/api/sdinfo/dkuspa/v1/selectioninfo?siteName=dkuspa&'))
+
+
+if __name__ == '__main__':
+    unittest.main()
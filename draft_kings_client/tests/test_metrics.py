@@ -0,0 +1,106 @@
+import unittest
+import urllib.request
+from unittest.mock import MagicMock, patch
+
+from draft_kings_client.authenticator import Authenticator
+from draft_kings_client.client import DraftKingsOddsClient
+from draft_kings_client.metrics import HarvestMetrics, Histogram, MetricsServer, NullMetrics
+from draft_kings_client.tests.mock_server import MockDraftKingsServer
+
+
+class TestHistogram(unittest.TestCase):
+
+    def test_buckets_and_quantiles(self):
+        histogram = Histogram((0.1, 0.5, 1.0))
+        for value in (0.05, 0.05, 0.3, 0.7, 2.0):
+            histogram.observe(value)
+
+        self.assertEqual(list(histogram.cumulative()), [(0.1, 2), (0.5, 3), (1.0, 4), (float('inf'), 5)])
+        self.assertEqual(histogram.count, 5)
+        self.assertAlmostEqual(histogram.sum, 3.1)
+        self.assertAlmostEqual(histogram.quantile(0.5), 0.3)
+        self.assertEqual(histogram.quantile(1.0), 1.0)  # Beyond the last bucket only the bound is known
+        self.assertIsNone(Histogram((1.0,)).quantile(0.5))
+
+
+class TestHarvestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockDraftKingsServer(events=2, markets_per_event=2, selections_per_market=2).start()
+        self.addCleanup(self.server.stop)
+
+        authenticator = MagicMock()
+        authenticator.headers = {'Authorization': 'Bearer token'}
+        self.metrics = HarvestMetrics(log_cycles=False)
+        self.sinks = {}
+        self.client = DraftKingsOddsClient(authenticator=authenticator, batch_size=2, metrics=self.metrics,
+                                           sink_factory=self.make_sink)
+        self.addCleanup(self.client.close)
+        self.server.point_client(self.client)
+
+    def make_sink(self, filename, append):
+        return self.sinks.setdefault(filename, MagicMock())
+
+    def test_default_is_no_op(self):
+        client = DraftKingsOddsClient(authenticator=MagicMock())
+        self.addCleanup(client.close)
+        self.assertIsInstance(client.metrics, NullMetrics)
+        self.assertFalse(client.metrics.enabled)
+
+    def test_cycle_counts_requests_stages_and_rows(self):
+        rows = self.client.get_football_markets()
+
+        self.assertEqual(len(rows), 8)
+        self.assertEqual(self.metrics.counter('requests'), 5)  # One league fetch plus four batches of two
+        self.assertEqual(self.metrics.endpoint('league').count, 1)
+        self.assertEqual(self.metrics.endpoint('selectioninfo').count, 4)
+        self.sinks['odds_dump.csv'].write.assert_called_once_with(rows)
+        for stage in ('league', 'selections', 'parse', 'write'):
+            self.assertEqual(self.metrics.stage(stage).count, 1, stage)
+
+        summary = self.metrics.last_cycle('football_markets')
+        self.assertEqual(summary['requests'], 5)
+        self.assertEqual(summary['errors'], 0)
+        self.assertEqual(summary['rows_written'], 8)
+        self.assertGreater(summary['seconds'], 0)
+
+    def test_errors_and_skipped_selections_are_counted(self):
+        self.server.inject_fault('status', times=1, path='selectioninfo', status=404)
+
+        rows = self.client.get_football_markets()
+
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(self.metrics.counter('errors'), 1)
+        self.assertEqual(self.metrics.counter('skipped_selections'), 2)
+
+    def test_prometheus_exposition(self):
+        self.metrics.observe_request('league', 0.02, 200)
+        self.metrics.observe_request('selectioninfo', 0.3, None)
+        self.metrics.observe_stage('write', 0.004)
+        self.metrics.increment('rows_written', 12)
+
+        with MetricsServer(self.metrics, port=0) as metrics_server:
+            with urllib.request.urlopen(metrics_server.url) as response:
+                body = response.read().decode('utf-8')
+
+        self.assertIn('draft_kings_request_seconds_bucket{endpoint="league",le="0.025"} 1', body)
+        self.assertIn('draft_kings_request_seconds_count{endpoint="selectioninfo"} 1', body)
+        self.assertIn('draft_kings_request_errors_total{endpoint="selectioninfo"} 1', body)
+        self.assertIn('draft_kings_stage_seconds_bucket{stage="write",le="+Inf"} 1', body)
+        self.assertIn('draft_kings_rows_written_total 12', body)
+
+    @patch('draft_kings_client.authenticator.requests.get')
+    def test_auth_is_timed_and_token_is_masked(self, mock_get):
+        token = 'eyJhbGciOiJIUzI1NiJ9.secret-claims.signature'
+        mock_get.return_value = MagicMock(status_code=200, text=f'{{"token":"{token}"}}')
+
+        with self.assertLogs(level='INFO') as logs:
+            Authenticator(metrics=self.metrics).headers
+
+        self.assertEqual(self.metrics.stage('auth').count, 1)
+        self.assertEqual(self.metrics.endpoint('auth').count, 1)
+        self.assertFalse(any('secret-claims' in line for line in logs.output))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import math
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+from draft_kings_client.models.odds_batch import OddsBatch
+from draft_kings_client.models.odds_model import OddsModel
+
+
+def make_rows():
+    return [
+        OddsModel('DraftKings', 'Football', 'NFL', '2024-10-20', '18:00:00', 'Team A vs Team B', 'Spread',
+                  'Team A -3.5', '−110', '2024-10-20T17:30:00.00000Z', False, 'MAIN'),
+        OddsModel('DraftKings', 'Football', 'NFL', '2024-10-20', '18:00:00', 'Team A vs Team B', 'Spread',
+                  'Team B +3.5', '-110', '2024-10-20T17:30:00.00000Z', True, 'MAIN'),
+        OddsModel('DraftKings', 'Football', 'NFL', '2024-10-20', '21:25:00', 'Team C vs Team D', 'Total',
+                  'Over 44.5', 'N/A', '2024-10-20T17:30:10.00000Z', False, 'MAIN'),
+    ]
+
+
+class TestOddsModel(unittest.TestCase):
+
+    def test_slotted(self):
+        row = make_rows()[0]
+
+        self.assertFalse(hasattr(row, '__dict__'))
+        self.assertEqual(row.replace(price='+100').price, '+100')
+        self.assertEqual(row.to_tuple(), tuple(row.to_dict().values()))
+
+
+class TestOddsBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.rows = make_rows()
+        self.batch = OddsBatch.from_rows(self.rows)
+
+    def test_round_trip(self):
+        self.assertEqual(len(self.batch), 3)
+        self.assertEqual([row.to_dict() for row in self.batch.to_rows()], [row.to_dict() for row in self.rows])
+
+    def test_numeric_columns(self):
+        self.assertEqual(list(self.batch.price_values[:2]), [-110.0, -110.0])
+        self.assertTrue(math.isnan(self.batch[2].price_value))
+        self.assertEqual(self.batch[0].timestamp, 1729445400.0)
+        self.assertTrue(self.batch[1].suspended)
+
+    def test_strings_are_dictionary_encoded(self):
+        participants = self.batch.column('game_participants')
+
+        self.assertIs(participants[0], participants[1])
+        self.assertEqual(list(self.batch.codes('game_participants')), [0, 0, 1])
+        self.assertEqual(self.batch.categories('sportsbook'), ['DraftKings'])
+
+    def test_slices_are_views(self):
+        tail = self.batch[1:]
+
+        self.assertEqual(len(tail), 2)
+        self.assertIs(tail.codes('market'), self.batch.codes('market'))
+        self.assertEqual(tail.column('market'), ['Spread', 'Total'])
+        self.assertEqual([row.bet_selection_name for row in tail], ['Team B +3.5', 'Over 44.5'])
+        self.assertEqual(tail[-1].market, 'Total')
+        self.assertEqual(len(tail[5:]), 0)
+        with self.assertRaises(IndexError):
+            tail[2]
+
+    @unittest.skipUnless(np, 'numpy is not installed')
+    def test_to_numpy_shares_numeric_memory(self):
+        arrays = self.batch[1:].to_numpy()
+
+        self.assertTrue(np.shares_memory(arrays['price_value'], np.frombuffer(self.batch.price_values)))
+        self.assertEqual(list(arrays['suspended']), [True, False])
+
+    @unittest.skipUnless(pd, 'pandas is not installed')
+    def test_to_pandas(self):
+        frame = self.batch.to_pandas()
+
+        self.assertEqual(len(frame), 3)
+        self.assertEqual(str(frame['market'].dtype), 'category')
+        self.assertEqual(frame['timestamp'].iloc[0].isoformat(), '2024-10-20T17:30:00+00:00')
+
+
+if __name__ == '__main__':
+    unittest.main()
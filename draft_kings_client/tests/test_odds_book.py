@@ -0,0 +1,152 @@
+import threading
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+from draft_kings_client.client import DraftKingsOddsClient
+from draft_kings_client.models.odds_batch import OddsBatch
+from draft_kings_client.models.odds_model import OddsModel
+from draft_kings_client.odds_book import OddsBook
+from draft_kings_client.tests.mock_server import MockDraftKingsServer
+
+START = datetime(2024, 10, 20, 17, 0, tzinfo=timezone.utc).timestamp()
+
+
+def stamp(seconds):
+    return datetime.fromtimestamp(START + seconds, timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-1] + 'Z'
+
+
+def make_row(selection, price, seconds, game='A vs B', market='Spread', suspended=False):
+    return OddsModel('DraftKings', 'Football', 'NFL', '2024-10-20', '18:00:00', game, market, selection, price,
+                     stamp(seconds), suspended, 'MAIN')
+
+
+class TestOddsBook(unittest.TestCase):
+
+    def test_indexes_latest_rows(self):
+        book = OddsBook()
+        self.assertEqual(book.update([make_row('A -3.5', '-110', 0), make_row('B +3.5', '-110', 0),
+                                      make_row('Over 44.5', '-105', 0, market='Total')]), 3)
+        self.assertEqual(book.update([make_row('A -3.5', '−115', 10), make_row('B +3.5', '-110', 10)]), 1)
+
+        self.assertEqual(len(book), 3)
+        self.assertIn(('A vs B', 'Total', 'Over 44.5', 'MAIN'), book)
+        self.assertEqual(book.latest('A vs B', 'Spread', 'A -3.5').price, '−115')
+        self.assertEqual(book.latest('A vs B', 'Spread', 'B +3.5').time_retrieved, stamp(10))
+        self.assertIsNone(book.latest('C vs D', 'Spread', 'A -3.5'))
+        self.assertEqual(book.games(), ['A vs B'])
+        self.assertEqual(set(book.markets('A vs B')), {'Spread', 'Total'})
+        self.assertEqual(set(book.selections('A vs B', 'Spread')), {('A -3.5', 'MAIN'), ('B +3.5', 'MAIN')})
+
+        self.assertEqual([point.price for point in book.history('A vs B', 'Spread', 'A -3.5')], [-110, -115])
+        self.assertEqual([point.price for point in book.history('A vs B', 'Spread', 'B +3.5')], [-110])
+
+    def test_main_and_alternate_lines_are_kept_apart(self):
+        book = OddsBook()
+        book.update([make_row('A -3.5', '-110', 0), make_row('A -3.5', '+140', 0).replace(line='ALTERNATE')])
+
+        self.assertEqual(len(book), 2)
+        self.assertEqual(book.latest('A vs B', 'Spread', 'A -3.5').price, '-110')
+        self.assertEqual(book.latest('A vs B', 'Spread', 'A -3.5', 'ALTERNATE').price, '+140')
+        self.assertEqual(OddsBook.selection_key(book.latest('A vs B', 'Spread', 'A -3.5', 'ALTERNATE')),
+                         ('A vs B', 'Spread', 'A -3.5', 'ALTERNATE'))
+
+    def test_history_is_a_bounded_ring_buffer(self):
+        book = OddsBook(history=3)
+        for index, price in enumerate(('-110', '-115', '-120', '-125', '-130')):
+            book.update([make_row('A -3.5', price, index * 10)])
+
+        points = book.history('A vs B', 'Spread', 'A -3.5')
+        self.assertEqual([point.price for point in points], [-120, -125, -130])
+        self.assertEqual(points[0].timestamp, START + 20)
+
+        with self.assertRaises(ValueError):
+            OddsBook(history=0)
+
+    def test_biggest_moves(self):
+        book = OddsBook()
+        book.update([make_row('A -3.5', '-110', 0), make_row('B +3.5', '-110', 0), make_row('C', '+150', 0)])
+        book.update([make_row('A -3.5', '-150', 100), make_row('B +3.5', '+120', 100), make_row('C', '+140', 100)])
+        book.update([make_row('C', '+130', 400), make_row('B +3.5', '+130', 450, suspended=True)])
+
+        moves = book.biggest_moves(minutes=10, now=START + 500)
+        self.assertEqual([move.selection for move in moves], ['A -3.5', 'B +3.5', 'C'])
+        self.assertEqual((moves[0].start_price, moves[0].current_price), (-110, -150))
+        self.assertAlmostEqual(moves[0].move, 150 / 250 - 110 / 210)
+        self.assertLess(moves[1].move, 0)
+        self.assertEqual(moves[2].odds.price, '+130')
+
+        # Over the last five minutes only C moved, from its price as of the window start
+        recent = book.biggest_moves(minutes=5, now=START + 500, limit=1)
+        self.assertEqual([(move.selection, move.start_price, move.current_price) for move in recent],
+                         [('C', 140, 130)])
+
+    def test_prune_drops_selections_no_longer_listed(self):
+        clock = MagicMock(return_value=START + 1000)
+        book = OddsBook(clock=clock)
+        book.update([make_row('A -3.5', '-110', 0), make_row('Over', '-110', 0, game='C vs D')])
+        book.update([make_row('A -3.5', '-110', 900)])
+
+        self.assertEqual(book.prune(max_age=300), 1)
+        self.assertEqual(book.games(), ['A vs B'])
+        self.assertEqual(book.updated_at, START + 1000)
+
+    def test_accepts_an_odds_batch(self):
+        book = OddsBook()
+        book.update(OddsBatch.from_rows([make_row('A -3.5', '-110', 0), make_row('B +3.5', '+100', 0)]))
+
+        self.assertEqual(book.latest('A vs B', 'Spread', 'B +3.5').price, '+100')
+
+    def test_reads_while_writing(self):
+        book = OddsBook(history=8)
+        errors = []
+        done = threading.Event()
+
+        def read():
+            try:
+                while not done.is_set():
+                    for market in book.markets('Game 0').values():
+                        self.assertEqual(len(market), 2)
+                    book.biggest_moves(minutes=60, now=START + 3600)
+            except Exception as e:
+                errors.append(e)
+
+        reader = threading.Thread(target=read)
+        reader.start()
+        try:
+            for cycle in range(100):
+                book.update([make_row(f'S{side}', f'{-110 - cycle % 7 - side:+d}', cycle, game=f'Game {game}',
+                                      market=f'M{market}')
+                             for game in range(5) for market in range(4) for side in range(2)])
+        finally:
+            done.set()
+            reader.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(book), 40)
+
+
+class TestClientOddsBook(unittest.TestCase):
+
+    def test_each_harvest_updates_the_book(self):
+        authenticator = MagicMock()
+        authenticator.headers = {'Authorization': 'Bearer token'}
+        book = OddsBook()
+
+        with MockDraftKingsServer(events=2, markets_per_event=2, selections_per_market=2, seed=7) as server:
+            client = server.point_client(DraftKingsOddsClient(authenticator=authenticator, batch_size=8,
+                                                              odds_book=book, sink_factory=MagicMock()))
+            with client:
+                rows = client.get_football_markets()
+                server.reprice(0.5)
+                client.get_football_markets()
+
+        self.assertIs(client.odds_book, book)
+        self.assertEqual(len(book), len(rows))
+        row = rows[0]
+        self.assertEqual(book.history(*OddsBook.selection_key(row))[0].price, int(row.price))
+        self.assertEqual(sum(len(book.history(*OddsBook.selection_key(row))) == 2 for row in rows), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
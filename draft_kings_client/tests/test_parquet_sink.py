@@ -0,0 +1,131 @@
+import os
+import tempfile
+import unittest
+from datetime import date, time
+from unittest.mock import MagicMock
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+from draft_kings_client.client import DraftKingsOddsClient
+from draft_kings_client.models.odds_model import OddsModel
+from draft_kings_client.tests.mock_server import MockDraftKingsServer
+
+if pa:
+    from draft_kings_client.sinks.parquet_sink import ParquetSink, read_odds
+
+
+def make_row(game, market, price, suspended=False):
+    return OddsModel('DraftKings', 'Football', 'NFL', '2024-10-20', '18:00:00', game, market, 'Team A -3.5', price,
+                     '2024-10-20T17:30:00.12345Z', suspended, 'MAIN')
+
+
+@unittest.skipUnless(pa, 'pyarrow is not installed')
+class TestParquetSink(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self._tmp.name, 'odds_dump.parquet')
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_writes_typed_columns(self):
+        with ParquetSink(self.directory) as sink:
+            sink.write([make_row('A vs B', 'Spread', '−110'), make_row('A vs B', 'Total', 'N/A', True)])
+
+        table = read_odds(self.directory)
+
+        self.assertEqual(table.schema.field('price').type, pa.int32())
+        self.assertTrue(pa.types.is_dictionary(table.schema.field('market').type))
+        self.assertTrue(pa.types.is_timestamp(table.schema.field('time_retrieved').type))
+        self.assertEqual(table.column('price').to_pylist(), [-110, None])
+        self.assertEqual(table.column('suspended').to_pylist(), [False, True])
+        self.assertEqual(table.column('game_date').to_pylist()[0], date(2024, 10, 20))
+        self.assertEqual(table.column('game_time').to_pylist()[0], time(18, 0))
+
+    def test_row_group_per_cycle_and_filtering(self):
+        sink = ParquetSink(self.directory)
+        sink.write([make_row('A vs B', 'Spread', '-110')])
+        sink.write([make_row('C vs D', 'Spread', '-105')])
+        sink.flush()
+        sink.write([make_row('A vs B', 'Total', '+100')])
+        sink.close()
+
+        parts = os.listdir(self.directory)
+        self.assertEqual(len(parts), 1)
+        self.assertEqual(pq.ParquetFile(os.path.join(self.directory, parts[0])).num_row_groups, 2)
+
+        table = read_odds(self.directory, games=['A vs B'], markets=['Spread'])
+        self.assertEqual(table.column('price').to_pylist(), [-110])
+
+    def test_factory_and_restart(self):
+        factory = ParquetSink.factory()
+        feed = os.path.join(self._tmp.name, 'odds_dump.csv')
+
+        for _ in range(2):
+            with factory(feed, True) as sink:
+                sink.write([make_row('A vs B', 'Spread', '-110')])
+        self.assertEqual(read_odds(self.directory).num_rows, 2)
+
+        with factory(feed, False) as sink:
+            sink.write([make_row('A vs B', 'Spread', '-110')])
+        self.assertEqual(read_odds(self.directory).num_rows, 1)
+
+    def test_rotates_parts_by_age_and_size(self):
+        now = [0.0]
+        with ParquetSink(self.directory, append=False, rotate_interval=60, clock=lambda: now[0]) as sink:
+            sink.write([make_row('A vs B', 'Spread', '-110')])
+            sink.flush()
+            self.assertEqual(len(os.listdir(self.directory)), 1)
+            now[0] = 60.0
+            sink.write([make_row('A vs B', 'Spread', '-115')])
+            sink.flush()
+            sink.write([make_row('A vs B', 'Spread', '-120')])
+
+        # Only the first part replaced the dataset; the part rotated in after it adds to it
+        self.assertEqual(len(os.listdir(self.directory)), 2)
+        self.assertEqual(sorted(read_odds(self.directory).column('price').to_pylist()), [-120, -115, -110])
+
+        with ParquetSink(self.directory, append=False, rotate_bytes=1) as sink:
+            for price in ('-110', '-115', '-120'):
+                sink.write([make_row('A vs B', 'Spread', price)])
+                sink.flush()
+        self.assertEqual(len(os.listdir(self.directory)), 3)
+
+    def test_client_cycles_share_one_part(self):
+        authenticator = MagicMock()
+        authenticator.headers = {'Authorization': 'Bearer token'}
+
+        with MockDraftKingsServer(events=2, markets_per_event=2, selections_per_market=2) as server:
+            client = server.point_client(DraftKingsOddsClient(
+                authenticator=authenticator, batch_size=8,
+                sink_factory=lambda filename, append: ParquetSink(self.directory, append)))
+            with client:
+                for _ in range(5):
+                    client.get_football_markets(append=True)
+
+        parts = os.listdir(self.directory)
+        self.assertEqual(len(parts), 1)
+        self.assertEqual(pq.ParquetFile(os.path.join(self.directory, parts[0])).num_row_groups, 5)
+
+    def test_client_replace_then_append(self):
+        authenticator = MagicMock()
+        authenticator.headers = {'Authorization': 'Bearer token'}
+
+        with MockDraftKingsServer(events=2, markets_per_event=2, selections_per_market=2) as server:
+            client = server.point_client(DraftKingsOddsClient(
+                authenticator=authenticator, batch_size=8,
+                sink_factory=lambda filename, append: ParquetSink(self.directory, append)))
+            with client:
+                rows = client.get_football_markets()
+                client.get_football_markets(append=True)
+
+        self.assertEqual(read_odds(self.directory).num_rows, 2 * len(rows))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+from draft_kings_client.parser import LeagueSnapshotParser, SelectionInfoParser
+
+
+class TestSelectionInfoParser(unittest.TestCase):
+
+    def setUp(self):
+        self.parser = SelectionInfoParser()
+
+    def test_joins_selections_to_markets_and_events(self):
+        odds_json = {
+            'events': [
+                {'id': 'e1', 'startDate': '2024-10-20T18:00:00.000Z', 'betSlipLine': 'Team A vs Team B'},
+                {'id': 'e2', 'startDate': '2024-10-20T21:25:00.000Z', 'betSlipLine': 'Team C vs Team D'}
+            ],
+            'markets': [
+                {'id': 'm2', 'eventId': 'e2', 'betSlipLine': 'Moneyline'},
+                {'id': 'm1', 'eventId': 'e1', 'betSlipLine': 'Spread', 'isSuspended': True}
+            ],
+            'selections': [
+                {'id': 's1', 'marketId': 'm1', 'betSlipLine': 'Team A -3.5', 'displayOdds': {'american': '-110'}},
+                {'id': 's2', 'marketId': 'm2', 'betSlipLine': 'Team D', 'displayOdds': {'american': '+150'}}
+            ]
+        }
+
+        pairs = list(self.parser.iter_rows(odds_json, 'ALTERNATE'))
+
+        self.assertEqual([selection_id for selection_id, _ in pairs], ['s1', 's2'])
+        first, second = pairs[0][1], pairs[1][1]
+        self.assertEqual(first.game_participants, 'Team A vs Team B')
+        self.assertEqual(first.market, 'Spread')
+        self.assertTrue(first.suspended)
+        self.assertEqual(second.game_participants, 'Team C vs Team D')
+        self.assertEqual(second.game_time, '21:25:00')
+        self.assertEqual(second.price, '+150')
+        self.assertFalse(second.suspended)
+        self.assertEqual(second.line, 'ALTERNATE')
+
+    def test_skips_selection_with_unknown_market(self):
+        odds_json = {
+            'events': [{'id': 'e1', 'startDate': '2024-10-20T18:00:00.000Z'}],
+            'markets': [{'id': 'm1', 'eventId': 'e1'}, {'id': 'm2', 'eventId': 'e1'}],
+            'selections': [
+                {'id': 's1', 'marketId': 'm9', 'displayOdds': {'american': '-110'}},
+                {'id': 's2', 'marketId': 'm1', 'displayOdds': {'american': '+100'}}
+            ]
+        }
+
+        rows = self.parser.parse(odds_json, 'MAIN')
+
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0].price, '+100')
+        self.assertEqual(rows[0].game_participants, 'Unknown Participants')
+
+    def test_is_complete(self):
+        self.assertFalse(self.parser.is_complete(None))
+        self.assertFalse(self.parser.is_complete({'events': [], 'markets': []}))
+        self.assertTrue(self.parser.is_complete({'events': [], 'markets': [], 'selections': []}))
+
+
+class TestLeagueSnapshotParser(unittest.TestCase):
+
+    def test_builds_rows_and_reports_fallbacks(self):
+        league_json = {
+            'events': [{'id': 'e1', 'name': 'Team A @ Team B', 'startEventDate': '2024-10-20T17:00:00Z'}],
+            'markets': [
+                {'id': 'm1', 'eventId': 'e1', 'name': 'Moneyline'},
+                {'id': 'm2', 'eventId': 'e1', 'name': 'Spread', 'isSuspended': True},
+                {'id': 'm3', 'eventId': 'e404', 'name': 'Total'}
+            ],
+            'selections': [
+                {'id': 's1', 'marketId': 'm1', 'label': 'Team A', 'displayOdds': {'american': '+140'}},
+                {'id': 's2', 'marketId': 'm2', 'label': 'Team A', 'points': 3.5, 'displayOdds': {'american': '-110'}},
+                {'id': 's3', 'marketId': 'm2', 'betSlipLine': 'Team B -3.5', 'displayOdds': {'american': '-110'}},
+                {'id': 's4', 'marketId': 'm3', 'label': 'Over', 'displayOdds': {'american': '-105'}}
+            ]
+        }
+
+        snapshot = list(LeagueSnapshotParser().iter_snapshot(league_json, 'MAIN'))
+        fallback_ids = [selection_id for selection_id, row in snapshot if row is None]
+        rows = [row for _, row in snapshot if row is not None]
+
+        self.assertEqual(fallback_ids, ['s2', 's4'])
+        self.assertEqual([row.bet_selection_name for row in rows], ['Team A', 'Team B -3.5'])
+        self.assertEqual(rows[0].game_participants, 'Team A @ Team B')
+        self.assertEqual(rows[0].game_date, '2024-10-20')
+        self.assertEqual(rows[0].game_time, '17:00:00')
+        self.assertEqual(rows[0].market, 'Moneyline')
+        self.assertTrue(rows[1].suspended)
+
+
+if __name__ == '__main__':
+    unittest.main()
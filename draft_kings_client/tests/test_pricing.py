@@ -0,0 +1,37 @@
+import unittest
+from draft_kings_client.pricing import (american_implied_probability, normalize_american_price, parse_american_price,
+                                        parse_point_line)
+
+
+class TestPricing(unittest.TestCase):
+
+    def test_parse_american_price(self):
+        self.assertEqual(parse_american_price('-110'), -110)
+        self.assertEqual(parse_american_price('+150'), 150)
+        self.assertEqual(parse_american_price('−110'), -110)
+        self.assertEqual(parse_american_price('EVEN'), 100)
+        self.assertEqual(parse_american_price(-120), -120)
+
+    def test_malformed_prices(self):
+        for price in ('N/A', '', None, '+50', 'abc', True):
+            with self.subTest(price=price):
+                self.assertIsNone(parse_american_price(price))
+
+    def test_normalize_american_price(self):
+        self.assertEqual(normalize_american_price(' −115 '), '-115')
+
+    def test_american_implied_probability(self):
+        self.assertAlmostEqual(american_implied_probability(-110), 110 / 210)
+        self.assertAlmostEqual(american_implied_probability(150), 0.4)
+        self.assertEqual(american_implied_probability(100), 0.5)
+
+    def test_parse_point_line(self):
+        self.assertEqual(parse_point_line('Team A −3.5'), ('Team A', -3.5))
+        self.assertEqual(parse_point_line('Over 47.5'), ('Over', 47.5))
+        for name in ('Team A', 'San Francisco 49ers', 'Team nan', '-3.5'):
+            with self.subTest(name=name):
+                self.assertEqual(parse_point_line(name), (name, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
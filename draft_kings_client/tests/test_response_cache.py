@@ -0,0 +1,45 @@
+import unittest
+from unittest.mock import MagicMock
+from draft_kings_client.response_cache import ResponseCache
+
+
+def make_response(status_code=200, content=b'{}', headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.content = content
+    response.headers = headers or {}
+    return response
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def test_identical_body_is_a_hit(self):
+        cache = ResponseCache()
+        first = make_response(content=b'{"selections":[]}')
+
+        self.assertIs(cache.lookup('league', first), ResponseCache.MISS)
+        cache.store('league', first, ['cached'])
+
+        self.assertEqual(cache.lookup('league', make_response(content=b'{"selections":[]}')), ['cached'])
+        self.assertIs(cache.lookup('league', make_response(content=b'{"selections":[1]}')), ResponseCache.MISS)
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 2, 'not_modified': 0})
+
+    def test_not_modified_uses_validators(self):
+        cache = ResponseCache()
+        self.assertEqual(cache.conditional_headers('league'), {})
+
+        cache.store('league', make_response(headers={'ETag': '"abc"', 'Last-Modified': 'Sun, 20 Oct 2024'}), 42)
+
+        self.assertEqual(cache.conditional_headers('league'),
+                         {'If-None-Match': '"abc"', 'If-Modified-Since': 'Sun, 20 Oct 2024'})
+        self.assertEqual(cache.lookup('league', make_response(status_code=304, content=b'')), 42)
+        self.assertEqual(cache.not_modified, 1)
+
+    def test_not_modified_without_entry_is_a_miss(self):
+        cache = ResponseCache()
+
+        self.assertIs(cache.lookup('league', make_response(status_code=304, content=b'')), ResponseCache.MISS)
+
+
+if __name__ == '__main__':
+    unittest.main()
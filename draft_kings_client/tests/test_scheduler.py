@@ -0,0 +1,170 @@
+import random
+import threading
+import unittest
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from draft_kings_client.models.odds_model import OddsModel
+from draft_kings_client.scheduler import HarvestScheduler, InlineExecutor, kickoff_interval
+from draft_kings_client.tests.fake_clock import FakeClock
+
+
+class ManualExecutor:
+    '''Holds submitted harvests until the test completes them.'''
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        self.submitted.append(future)
+        return future
+
+    def shutdown(self, wait=True):
+        pass
+
+
+def make_row(game_date, game_time):
+    return OddsModel('DraftKings', 'Football', 'NFL', game_date, game_time, 'Team A vs Team B', 'Spread',
+                     'Team A -3.5', '-110', '2024-10-20T12:00:00.00000Z', False, 'MAIN')
+
+
+class TestHarvestScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.scheduler = HarvestScheduler(clock=self.clock, executor=InlineExecutor())
+
+    def recording_feed(self, starts, duration=0.0, runs=4):
+        def harvest(append):
+            self.assertTrue(append)
+            starts.append(self.clock.monotonic())
+            self.clock.advance(duration)
+            if len(starts) >= runs:
+                self.scheduler.stop()
+            return []
+        return harvest
+
+    def test_fixed_rate_does_not_drift(self):
+        starts = []
+        self.scheduler.add_feed('main', self.recording_feed(starts, duration=3), interval=10)
+
+        self.scheduler.run()
+
+        self.assertEqual(starts, [0, 10, 20, 30])
+
+    def test_long_runs_skip_missed_ticks(self):
+        starts = []
+        self.scheduler.add_feed('main', self.recording_feed(starts, duration=25, runs=3), interval=10)
+
+        self.scheduler.run()
+
+        # The latest overdue tick runs late; the ones before it (10, 30 and 40) are dropped
+        self.assertEqual(starts, [0, 25, 50])
+        self.assertEqual(self.scheduler.stats()['main']['skipped'], 3)
+
+    def test_feeds_run_side_by_side(self):
+        main_starts, totals_starts = [], []
+        self.scheduler.add_feed('main', self.recording_feed(main_starts, runs=4), interval=10)
+        self.scheduler.add_feed('totals', lambda append: totals_starts.append(self.clock.monotonic()) or [],
+                                interval=15)
+
+        self.scheduler.run()
+
+        self.assertEqual(main_starts, [0, 10, 20, 30])
+        self.assertEqual(totals_starts, [0, 15])
+
+    def test_overlap_skip_and_coalesce(self):
+        for overlap, expected in ((HarvestScheduler.SKIP, 1), (HarvestScheduler.COALESCE, 2)):
+            with self.subTest(overlap=overlap):
+                clock = FakeClock()
+                executor = ManualExecutor()
+                scheduler = HarvestScheduler(clock=clock, executor=executor)
+                scheduler.add_feed('main', lambda append: [], interval=10, overlap=overlap)
+
+                # The first harvest is still running through the ticks at 10 and 20, then finishes at 25
+                clock.call_at(25, lambda: executor.submitted[0].set_result([]))
+                clock.call_at(29, scheduler.stop)
+                scheduler.run()
+
+                stats = scheduler.stats()['main']
+                self.assertEqual(len(executor.submitted), expected)
+                self.assertEqual(stats['skipped' if overlap == HarvestScheduler.SKIP else 'coalesced'], 2)
+
+    def test_jitter_stays_on_grid(self):
+        starts = []
+        scheduler = HarvestScheduler(clock=self.clock, executor=InlineExecutor(), rng=random.Random(7))
+        self.scheduler = scheduler
+        scheduler.add_feed('main', self.recording_feed(starts, runs=5), interval=10, jitter=2)
+
+        scheduler.run()
+
+        for tick, start in enumerate(starts):
+            self.assertGreaterEqual(start - 10 * tick, 0)
+            self.assertLessEqual(start - 10 * tick, 2)
+
+    def test_adaptive_interval(self):
+        starts = []
+        self.scheduler.add_feed('main', self.recording_feed(starts, runs=3), interval=60,
+                                interval_fn=lambda rows, now: 5)
+
+        self.scheduler.run()
+
+        self.assertEqual(starts, [0, 5, 10])
+        self.assertEqual(self.scheduler.stats()['main']['interval'], 5)
+
+    def test_errors_are_counted_and_loop_continues(self):
+        calls = []
+
+        def harvest(append):
+            calls.append(self.clock.monotonic())
+            if len(calls) == 2:
+                self.scheduler.stop()
+            raise RuntimeError('boom')
+
+        self.scheduler.add_feed('main', harvest, interval=10)
+        self.scheduler.run()
+
+        self.assertEqual(calls, [0, 10])
+        self.assertEqual(self.scheduler.stats()['main']['errors'], 2)
+
+    def test_clean_shutdown_waits_for_running_harvest(self):
+        finished = threading.Event()
+        started = threading.Event()
+
+        def harvest(append):
+            started.set()
+            finished.wait(5)
+            return []
+
+        scheduler = HarvestScheduler(executor=None)
+        scheduler.add_feed('main', harvest, interval=60)
+        runner = threading.Thread(target=scheduler.run)
+        runner.start()
+        started.wait(5)
+        scheduler.stop()
+        runner.join(0.2)
+        self.assertTrue(runner.is_alive())
+
+        finished.set()
+        runner.join(5)
+        self.assertFalse(runner.is_alive())
+        self.assertEqual(scheduler.stats()['main']['runs'], 1)
+
+
+class TestKickoffInterval(unittest.TestCase):
+
+    def test_polls_faster_near_kickoff(self):
+        interval_fn = kickoff_interval()
+        now = datetime(2024, 10, 20, 12, 0, tzinfo=timezone.utc)
+
+        self.assertEqual(interval_fn([make_row('2024-10-20', '12:30:00')], now), 5)
+        self.assertEqual(interval_fn([make_row('2024-10-20', '17:00:00')], now), 15)
+        self.assertEqual(interval_fn([make_row('2024-10-21', '00:15:00')], now), 60)
+        self.assertEqual(interval_fn([make_row('2024-10-24', '00:15:00')], now), 300)
+        self.assertEqual(interval_fn([make_row('2024-10-20', '10:00:00')], now), 5)
+        self.assertEqual(interval_fn([make_row('2024-10-19', '10:00:00'), make_row('bad', 'date')], now), 300)
+        self.assertEqual(interval_fn([], now), 300)
+
+
+if __name__ == '__main__':
+    unittest.main()
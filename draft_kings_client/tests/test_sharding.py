@@ -0,0 +1,99 @@
+import unittest
+from unittest.mock import MagicMock
+
+from draft_kings_client.authenticator import DEFAULT_AUTH_ENDPOINT, auth_endpoint_for_site
+from draft_kings_client.feeds import NFL_ALTERNATE_TOTALS, NFL_MAIN, FeedRegistry, site_state
+from draft_kings_client.sharding import ShardedHarvester, ShardHealth
+from draft_kings_client.tests.mock_server import MockDraftKingsServer
+
+
+class TestSites(unittest.TestCase):
+
+    def test_auth_endpoint_per_state(self):
+        self.assertEqual(site_state('dkuspa'), 'pa')
+        self.assertEqual(auth_endpoint_for_site('dkusnj'), DEFAULT_AUTH_ENDPOINT)
+        self.assertEqual(auth_endpoint_for_site('dkusco'),
+                         'https://gaming-us-co.draftkings.com/api/wager/v1/generateAnonymousEnterpriseJWT')
+
+        with self.assertRaises(ValueError):
+            site_state('nj')
+        with self.assertRaises(ValueError):
+            ShardedHarvester(['dkusnj', 'sportsbook'])
+
+    def test_shard_health(self):
+        health = ShardHealth('dkusnj', 'football_markets', max_failures=2)
+        health.record(100, 0.5)
+        health.record(0, 0.5)
+        self.assertTrue(health.healthy)
+        self.assertEqual(health.last_error, 'no rows returned')
+
+        health.record(0, 1.0, error='ConnectionError: reset')
+        self.assertFalse(health.healthy)
+        self.assertEqual((health.cycles, health.failures, health.rows), (3, 2, 100))
+        self.assertEqual(health.rows_per_second, 50.0)
+
+        health.record(10, 0.0)
+        self.assertTrue(health.healthy)
+        self.assertIsNotNone(health.last_success)
+        self.assertEqual(health.to_dict()['consecutive_failures'], 0)
+
+
+class TestShardedHarvester(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockDraftKingsServer(events=2, markets_per_event=2, selections_per_market=2).start()
+        self.addCleanup(self.server.stop)
+        self.sinks = {}
+
+    def make_sink(self, filename, append):
+        return self.sinks.setdefault(filename, MagicMock())
+
+    def make_harvester(self, sites, **options):
+        harvester = ShardedHarvester(sites, feeds=FeedRegistry([NFL_MAIN, NFL_ALTERNATE_TOTALS]), processes=2,
+                                     client_options={'batch_size': 8}, sink_factory=self.make_sink,
+                                     auth_endpoint=self.server.auth_endpoint, base_url=self.server.url, **options)
+        self.addCleanup(harvester.close)
+        return harvester
+
+    def test_harvests_every_site_and_feed(self):
+        harvester = self.make_harvester(['dkusnj', 'dkuspa'])
+
+        results = harvester.harvest()
+
+        self.assertEqual(set(results), set(harvester.shards))
+        self.assertEqual(len(harvester.shards), 4)
+        for (site, feed), rows in results.items():
+            self.assertEqual(len(rows), 8)
+            self.assertEqual({row.sportsbook for row in rows}, {f'DraftKings {site_state(site).upper()}'})
+
+        # Each site's worker client authenticated and harvested against its own site
+        self.assertIn('/api/wager/v1/generateAnonymousEnterpriseJWT', self.server.requests)
+        for site in ('dkusnj', 'dkuspa'):
+            self.assertIn(f'/api/sportscontent/{site}/v1/leagues/88808', self.server.requests)
+            # Both feeds list the same selections and are collected together, so one batch covers them
+            self.assertEqual(len([path for path in self.server.requests
+                                  if path.startswith(f'/api/sdinfo/{site}/v1/selectioninfo?siteName={site}&')]), 1)
+
+        # Both sites' rows land in the one sink per feed
+        self.assertEqual(self.sinks['odds_dump.csv'].write.call_count, 2)
+        self.assertEqual(self.sinks['odds_alternate_totals_dump.csv'].write.call_count, 2)
+        self.assertTrue(all(health.healthy and health.rows == 8 for health in harvester.health().values()))
+
+    def test_failing_site_is_reported_unhealthy(self):
+        self.server.inject_fault(times=100, path='/dkuspa/', status=404)
+        harvester = self.make_harvester(['dkusnj', 'dkuspa'], max_failures=2)
+
+        harvester.run(seconds=0, cycles=2)
+
+        health = harvester.health()
+        self.assertTrue(health[('dkusnj', 'football_markets')].healthy)
+        self.assertEqual(health[('dkusnj', 'football_markets')].rows, 16)
+        self.assertFalse(health[('dkuspa', 'football_markets')].healthy)
+        self.assertEqual(health[('dkuspa', 'football_markets')].last_error, 'no rows returned')
+        with self.assertLogs(level='INFO') as logs:
+            harvester.report()
+        self.assertIn('UNHEALTHY', '\n'.join(logs.output))
+
+
+if __name__ == '__main__':
+    unittest.main()
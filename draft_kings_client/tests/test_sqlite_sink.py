@@ -0,0 +1,127 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from draft_kings_client.client import DraftKingsOddsClient
+from draft_kings_client.models.odds_change import OddsChange
+from draft_kings_client.models.odds_model import OddsModel
+from draft_kings_client.sinks.sqlite_sink import SqliteSink, connect, latest_odds, price_history, to_odds_model
+from draft_kings_client.tests.mock_server import MockDraftKingsServer
+
+
+def make_row(selection, price, time_retrieved, game='A vs B', market='Spread', suspended=False):
+    return OddsModel('DraftKings', 'Football', 'NFL', '2024-10-20', '18:00:00', game, market, selection, price,
+                     time_retrieved, suspended, 'MAIN')
+
+
+class TestSqliteSink(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'odds.db')
+
+    def query(self):
+        connection = connect(self.path)
+        self.addCleanup(connection.close)
+        return connection
+
+    def test_latest_is_upserted_and_history_appended(self):
+        with SqliteSink(self.path, 'odds_dump') as sink:
+            sink.write([make_row('A -3.5', '−110', '2024-10-20T17:00:00.00000Z'),
+                        make_row('B +3.5', '-110', '2024-10-20T17:00:00.00000Z')])
+            sink.write([make_row('A -3.5', '+105', '2024-10-20T17:00:10.00000Z', suspended='True')])
+
+        connection = self.query()
+        self.assertEqual(connection.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+
+        latest = {row['bet_selection_name']: row for row in latest_odds(connection, game='A vs B')}
+        self.assertEqual(len(latest), 2)
+        self.assertEqual(latest['A -3.5']['price'], '+105')
+        self.assertEqual(latest['A -3.5']['price_value'], 105)
+        self.assertEqual(latest['A -3.5']['suspended'], 1)
+        self.assertEqual(latest['B +3.5']['price_value'], -110)
+
+        history = price_history(connection, 'A vs B', 'Spread', selection='A -3.5')
+        self.assertEqual([row['price_value'] for row in history], [-110, 105])
+        self.assertEqual(to_odds_model(history[1]).to_tuple(),
+                         make_row('A -3.5', '+105', '2024-10-20T17:00:10.00000Z', suspended=True).to_tuple())
+
+        window = price_history(connection, 'A vs B', 'Spread', since='2024-10-20T17:00:05', until='2024-10-20T18')
+        self.assertEqual([row['price'] for row in window], ['+105'])
+
+    def test_replacing_keeps_history(self):
+        with SqliteSink(self.path, 'odds_dump') as sink:
+            sink.write([make_row('A -3.5', '-110', '2024-10-20T17:00:00.00000Z'),
+                        make_row('B +3.5', '-110', '2024-10-20T17:00:00.00000Z')])
+        with SqliteSink(self.path, 'odds_dump', append=False) as sink:
+            sink.write([make_row('A -3.5', '-115', '2024-10-20T17:00:10.00000Z')])
+
+        connection = self.query()
+        self.assertEqual([row['bet_selection_name'] for row in latest_odds(connection)], ['A -3.5'])
+        self.assertEqual(len(price_history(connection, 'A vs B', 'Spread')), 3)
+
+    def test_delta_rows(self):
+        first = make_row('A -3.5', '-110', '2024-10-20T17:00:00.00000Z')
+        with SqliteSink(self.path, 'odds_dump_delta') as sink:
+            sink.write([OddsChange(OddsChange.NEW, first)])
+            sink.write([OddsChange(OddsChange.REMOVED, first.replace(time_retrieved='2024-10-20T17:00:10.00000Z'))])
+
+        connection = self.query()
+        self.assertEqual(latest_odds(connection), [])
+        self.assertEqual([row['change'] for row in price_history(connection, 'A vs B', 'Spread')],
+                         [OddsChange.NEW, OddsChange.REMOVED])
+
+    def test_feeds_share_one_database(self):
+        factory = SqliteSink.factory(self.path)
+        for filename, market in (('odds_dump.csv', 'Spread'), ('out/odds_alternate_totals_dump.csv', 'Total')):
+            with factory(filename, True) as sink:
+                sink.write([make_row('A -3.5', '-110', '2024-10-20T17:00:00.00000Z', market=market)])
+
+        connection = self.query()
+        self.assertEqual([row['feed'] for row in latest_odds(connection, game='A vs B')],
+                         ['odds_dump', 'odds_alternate_totals_dump'])
+        self.assertEqual(len(latest_odds(connection, feed='odds_dump')), 1)
+
+    def test_history_queries_use_the_index(self):
+        plan = self.query().execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM history WHERE game_participants = ? AND market = ? "
+            "AND time_retrieved >= ? ORDER BY time_retrieved", ('A vs B', 'Spread', '2024')).fetchall()
+        self.assertIn('history_game_market_time', ' '.join(row['detail'] for row in plan))
+
+    def test_client_harvest(self):
+        authenticator = MagicMock()
+        authenticator.headers = {'Authorization': 'Bearer token'}
+
+        with MockDraftKingsServer(events=2, markets_per_event=2, selections_per_market=2) as server:
+            client = server.point_client(DraftKingsOddsClient(authenticator=authenticator, batch_size=8,
+                                                              sink_factory=SqliteSink.factory(self.path)))
+            with client:
+                rows = client.get_football_markets(append=True)
+                client.get_football_markets(append=True)
+
+        connection = self.query()
+        self.assertEqual(len(latest_odds(connection, feed='odds_dump')), len(rows))
+        self.assertEqual(connection.execute('SELECT COUNT(*) FROM history').fetchone()[0], 2 * len(rows))
+
+    def test_replacing_cycle_then_delta_cycle(self):
+        authenticator = MagicMock()
+        authenticator.headers = {'Authorization': 'Bearer token'}
+
+        with MockDraftKingsServer(events=6) as server:
+            client = server.point_client(DraftKingsOddsClient(authenticator=authenticator, delta_tracking=True,
+                                                              sink_factory=SqliteSink.factory(self.path)))
+            with client:
+                rows = client.get_football_markets()
+                server.reprice(0.2)
+                client.get_football_markets(append=True)
+
+        connection = self.query()
+        latest = latest_odds(connection, feed='odds_dump_delta')
+        self.assertEqual(len(latest), len(rows))
+        self.assertGreater(connection.execute('SELECT COUNT(*) FROM history').fetchone()[0], len(rows))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from draft_kings_client.client import DraftKingsOddsClient
+from draft_kings_client.tests.mock_server import MockDraftKingsServer
+from draft_kings_client.transport import HttpTransport, TokenBucket, TransportAdapter
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_burst_then_steady_rate(self):
+        fake = FakeTime()
+        bucket = TokenBucket(rate=10, burst=5, clock=fake.clock, sleep=fake.sleep)
+
+        for _ in range(5):
+            self.assertEqual(bucket.acquire(), 0.0)
+        self.assertFalse(bucket.try_acquire())
+
+        self.assertAlmostEqual(bucket.acquire(), 0.1)
+        self.assertAlmostEqual(bucket.waited, 0.1)
+
+        fake.now += 10  # Idle time refills the bucket only up to the burst size
+        self.assertTrue(all(bucket.try_acquire() for _ in range(5)))
+        self.assertFalse(bucket.try_acquire())
+
+    def test_invalid_settings(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=1, burst=2).acquire(3)
+
+
+class TestHttpTransport(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockDraftKingsServer(events=2, markets_per_event=1, selections_per_market=2).start()
+        self.addCleanup(self.server.stop)
+
+    def make_client(self, **transport_options):
+        transport_options.setdefault('backoff_factor', 0.01)
+        transport_options.setdefault('backoff_jitter', 0.0)
+        authenticator = MagicMock()
+        authenticator.headers = {'Authorization': 'Bearer token'}
+        client = DraftKingsOddsClient(authenticator=authenticator, transport=HttpTransport(**transport_options))
+        self.addCleanup(client.close)
+        return self.server.point_client(client)
+
+    def selection_requests(self):
+        return [path for path in self.server.requests if 'selectioninfo' in path]
+
+    def test_pool_sized_to_workers_with_default_timeout(self):
+        client = DraftKingsOddsClient(authenticator=MagicMock(), max_workers=12)
+        self.addCleanup(client.close)
+
+        adapter = client._session.get_adapter('https://example.com')
+        self.assertIsInstance(adapter, TransportAdapter)
+        self.assertEqual(adapter.poolmanager.connection_pool_kw['maxsize'], 12)
+        self.assertEqual(adapter.timeout, HttpTransport.DEFAULT_TIMEOUT)
+
+    def test_retries_server_errors_and_resets(self):
+        client = self.make_client()
+        self.server.inject_fault('status', times=2, path='selectioninfo', status=503)
+        self.server.inject_fault('reset', times=1, path='selectioninfo')
+
+        odds_json = client._fetch_odds_for_selection('e0m0s0')
+
+        self.assertEqual([selection['id'] for selection in odds_json['selections']], ['e0m0s0'])
+        self.assertEqual(len(self.selection_requests()), 4)
+
+    def test_honours_retry_after_on_429(self):
+        client = self.make_client()
+        self.server.inject_fault('status', times=1, path='selectioninfo', status=429, retry_after=1)
+
+        started = time.monotonic()
+        self.assertIsNotNone(client._fetch_odds_for_selection('e0m0s0'))
+        self.assertGreaterEqual(time.monotonic() - started, 0.9)
+
+    def test_read_timeout_is_retried(self):
+        client = self.make_client(timeout=(1, 0.2))
+        self.server.inject_fault('stall', times=1, path='selectioninfo', delay=0.5)
+
+        self.assertIsNotNone(client._fetch_odds_for_selection('e0m0s0'))
+        self.assertEqual(len(self.selection_requests()), 2)
+
+    def test_gives_up_after_retries(self):
+        client = self.make_client(retries=2)
+        self.server.inject_fault('status', times=10, path='selectioninfo', status=502)
+
+        self.assertIsNone(client._fetch_odds_for_selection('e0m0s0'))
+        self.assertEqual(len(self.selection_requests()), 3)
+
+    def test_client_errors_are_not_retried(self):
+        client = self.make_client()
+        self.server.inject_fault('status', times=1, path='selectioninfo', status=404)
+
+        self.assertIsNone(client._fetch_odds_for_selection('e0m0s0'))
+        self.assertEqual(len(self.selection_requests()), 1)
+
+    @patch.object(DraftKingsOddsClient, '_write_rows')
+    def test_rate_limiter_meters_every_request(self, mock_write_rows):
+        limiter = MagicMock()
+        client = self.make_client(rate_limiter=limiter)
+
+        rows = client.get_football_markets()
+
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(limiter.acquire.call_count, len(self.server.requests))
+
+    def test_rate_limiter_meters_retries(self):
+        limiter = MagicMock()
+        client = self.make_client(rate_limiter=limiter)
+        self.server.inject_fault('status', times=2, path='selectioninfo', status=503)
+        self.server.inject_fault('reset', times=1, path='selectioninfo')
+
+        self.assertIsNotNone(client._fetch_odds_for_selection('e0m0s0'))
+        self.assertEqual(len(self.selection_requests()), 4)
+        self.assertEqual(limiter.acquire.call_count, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
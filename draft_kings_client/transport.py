@@ -0,0 +1,192 @@
+import threading
+import time
+
+import requests
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class TokenBucket:
+    '''Thread-safe token bucket shared by every request a client sends.
+
+    Tokens refill continuously at `rate` per second up to `burst`; acquire() blocks until one is available.
+    '''
+
+    def __init__(self, rate, burst=None, clock=time.monotonic, sleep=time.sleep):
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+
+        self._rate = float(rate)
+        self._burst = float(burst if burst is not None else max(1.0, rate))
+        if self._burst < 1:
+            raise ValueError('burst must be at least 1')
+
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self._burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+        self._waited = 0.0
+
+    @property
+    def rate(self):
+        return self._rate
+
+    @property
+    def burst(self):
+        return self._burst
+
+    @property
+    def waited(self):
+        '''Total seconds callers have spent blocked on the bucket.'''
+        return self._waited
+
+    def _refill(self, now):
+        self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def try_acquire(self, tokens=1):
+        with self._lock:
+            self._refill(self._clock())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens=1):
+        '''Take `tokens`, sleeping until the bucket has refilled enough; returns the seconds waited.'''
+        if tokens > self._burst:
+            raise ValueError('Cannot acquire more tokens than the bucket holds')
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill(self._clock())
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    self._waited += waited
+                    return waited
+                delay = (tokens - self._tokens) / self._rate
+
+            self._sleep(delay)
+            waited += delay
+
+
+class MeteredRetry(Retry):
+    '''Retry that takes a token from rate_limiter after each backoff, so urllib3's own retries are metered too.'''
+
+    def __init__(self, *args, rate_limiter=None, **kwargs):
+        self.rate_limiter = rate_limiter
+        super().__init__(*args, **kwargs)
+
+    def new(self, **kw):
+        # urllib3 builds a fresh Retry for every attempt from a fixed list of settings
+        kw.setdefault('rate_limiter', self.rate_limiter)
+        return super().new(**kw)
+
+    def sleep(self, response=None):
+        super().sleep(response)
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
+
+class TransportAdapter(HTTPAdapter):
+    '''HTTPAdapter that applies a default timeout and waits on a shared rate limiter before each request.'''
+
+    def __init__(self, timeout=None, rate_limiter=None, **kwargs):
+        self._timeout = timeout
+        self._rate_limiter = rate_limiter
+        super().__init__(**kwargs)
+
+    @property
+    def timeout(self):
+        return self._timeout
+
+    @property
+    def rate_limiter(self):
+        return self._rate_limiter
+
+    def send(self, request, timeout=None, **kwargs):
+        if timeout is None:
+            timeout = self._timeout
+        if self._rate_limiter is not None:
+            self._rate_limiter.acquire()
+        return super().send(request, timeout=timeout, **kwargs)
+
+
+class HttpTransport:
+    '''Connection settings for the client's requests.Session.
+
+    timeout is a (connect, read) pair in seconds. Idempotent GETs are retried with exponential backoff plus
+    jitter on connection errors, resets and the statuses in retry_statuses; a 429 or 503 carrying Retry-After
+    waits as long as the server asks. Once retries run out the last response is returned as-is, so callers
+    see the error status rather than an exception. rate_limiter (e.g. a TokenBucket) meters every request
+    on the wire, retries included.
+    '''
+    DEFAULT_TIMEOUT = (3.05, 10)
+    DEFAULT_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, pool_size=None, retries=3, backoff_factor=0.5, backoff_jitter=0.5,
+                 backoff_max=30, retry_statuses=DEFAULT_RETRY_STATUSES, rate_limiter=None):
+        if retries < 0:
+            raise ValueError('retries must not be negative')
+
+        self._timeout = timeout
+        self._pool_size = pool_size
+        self._retries = retries
+        self._backoff_factor = backoff_factor
+        self._backoff_jitter = backoff_jitter
+        self._backoff_max = backoff_max
+        self._retry_statuses = tuple(retry_statuses)
+        self._rate_limiter = rate_limiter
+
+    @property
+    def timeout(self):
+        return self._timeout
+
+    @property
+    def pool_size(self):
+        return self._pool_size
+
+    @property
+    def retries(self):
+        return self._retries
+
+    @property
+    def rate_limiter(self):
+        return self._rate_limiter
+
+    def build_retry(self):
+        options = dict(
+            total=self._retries,
+            connect=self._retries,
+            read=self._retries,
+            status=self._retries,
+            other=0,
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            status_forcelist=self._retry_statuses,
+            backoff_factor=self._backoff_factor,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+            rate_limiter=self._rate_limiter,
+        )
+        try:
+            return MeteredRetry(backoff_jitter=self._backoff_jitter, backoff_max=self._backoff_max, **options)
+        except TypeError:
+            # urllib3 < 2 has neither jitter nor a configurable backoff cap
+            return MeteredRetry(**options)
+
+    def build_adapter(self, pool_size=None):
+        pool_size = self._pool_size or pool_size or DEFAULT_POOLSIZE
+        return TransportAdapter(timeout=self._timeout, rate_limiter=self._rate_limiter, pool_connections=pool_size,
+                                pool_maxsize=pool_size, max_retries=self.build_retry())
+
+    def mount(self, session, pool_size=None):
+        '''Mount one shared adapter for http and https on the session and return the session.'''
+        adapter = self.build_adapter(pool_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def session(self, pool_size=None):
+        return self.mount(requests.Session(), pool_size)
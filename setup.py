@@ -4,4 +4,11 @@ setup(
     name='draft_kings_client',
     version='0.1.0',
     packages=find_packages(),
+    extras_require={
+        'async': ['aiohttp'],
+        'zstd': ['zstandard'],
+        'parquet': ['pyarrow'],
+        'analytics': ['numpy', 'pandas'],
+        'fast-json': ['orjson', 'ijson'],
+    },
 )